@@ -1,17 +1,19 @@
-import os
 from logging.config import fileConfig
 from sqlalchemy import engine_from_config, pool
 from alembic import context
 
-from dotenv import load_dotenv
-load_dotenv()
+from app.core.config import settings
 from app.core.database import Base
+import app.models.organization
 import app.models.user
 import app.models.item
+import app.models.job
+import app.models.connector
+import app.models.outbox
 
 config = context.config
 
-config.set_main_option('sqlalchemy.url', os.getenv('DATABASE_URL'))
+config.set_main_option('sqlalchemy.url', settings.database_url)
 fileConfig(config.config_file_name)
 
 target_metadata = Base.metadata
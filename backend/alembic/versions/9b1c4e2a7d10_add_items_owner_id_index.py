@@ -0,0 +1,32 @@
+"""Add composite (owner_id, id) index on items
+
+Revision ID: 9b1c4e2a7d10
+Revises: 5f3267e37418
+Create Date: 2025-10-06 10:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '9b1c4e2a7d10'
+down_revision = '5f3267e37418'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction and does not block writes.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_items_owner_id_id', 'items', ['owner_id', 'id'],
+            unique=False, postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_items_owner_id_id', table_name='items',
+            postgresql_concurrently=True, if_exists=True
+        )
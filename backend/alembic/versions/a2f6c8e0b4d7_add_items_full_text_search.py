@@ -0,0 +1,37 @@
+"""Add full-text search vector and GIN index on items
+
+Revision ID: a2f6c8e0b4d7
+Revises: e7a9b3c5d1f0
+Create Date: 2025-10-14 11:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'a2f6c8e0b4d7'
+down_revision = 'e7a9b3c5d1f0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Adding a STORED generated column rewrites items once; the index build afterwards does not block writes.
+    op.execute(
+        "ALTER TABLE items ADD COLUMN search_vector tsvector GENERATED ALWAYS AS "
+        "(to_tsvector('english', coalesce(title, '') || ' ' || coalesce(description, ''))) STORED"
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_items_search_vector', 'items', ['search_vector'],
+            unique=False, postgresql_using='gin', postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_items_search_vector', table_name='items',
+            postgresql_concurrently=True, if_exists=True
+        )
+    op.drop_column('items', 'search_vector')
@@ -0,0 +1,40 @@
+"""Add embedding vector and HNSW index on items
+
+Revision ID: b8d2f4a6c0e1
+Revises: a2f6c8e0b4d7
+Create Date: 2025-10-16 10:00:00.000000
+
+"""
+from alembic import op
+from app.core.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8d2f4a6c0e1'
+down_revision = 'a2f6c8e0b4d7'
+branch_labels = None
+depends_on = None
+
+# Must match the embedder the service runs with; see EMBEDDING_DIM.
+EMBEDDING_DIM = settings.embedding_dim
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS vector")
+    # A nullable column without a default is metadata only; rows are embedded by the worker.
+    op.execute(f"ALTER TABLE items ADD COLUMN embedding vector({EMBEDDING_DIM})")
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_items_embedding_hnsw', 'items', ['embedding'],
+            unique=False, postgresql_using='hnsw', postgresql_concurrently=True,
+            postgresql_ops={'embedding': 'vector_cosine_ops'}, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_items_embedding_hnsw', table_name='items',
+            postgresql_concurrently=True, if_exists=True
+        )
+    op.drop_column('items', 'embedding')
@@ -0,0 +1,27 @@
+"""Add row version columns to users and items
+
+Revision ID: c4d8e1f2a3b5
+Revises: 9b1c4e2a7d10
+Create Date: 2025-10-09 14:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4d8e1f2a3b5'
+down_revision = '9b1c4e2a7d10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # A constant server default is a metadata-only change on Postgres 11+, so no table rewrite.
+    op.add_column('users', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('items', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('items', 'version')
+    op.drop_column('users', 'version')
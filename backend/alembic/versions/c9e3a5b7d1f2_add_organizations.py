@@ -0,0 +1,75 @@
+"""Add organizations and org_id tenancy columns
+
+Revision ID: c9e3a5b7d1f2
+Revises: b8d2f4a6c0e1
+Create Date: 2025-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c9e3a5b7d1f2'
+down_revision = 'b8d2f4a6c0e1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('organizations',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_organizations_id'), 'organizations', ['id'], unique=False)
+    op.add_column('users', sa.Column('org_id', sa.Integer(), nullable=True))
+    op.add_column('items', sa.Column('org_id', sa.Integer(), nullable=True))
+
+    # Every existing user becomes the sole member of a personal organization, as new sign-ups do.
+    op.execute("INSERT INTO organizations (name) SELECT username FROM users ORDER BY id")
+    op.execute("UPDATE users SET org_id = organizations.id FROM organizations WHERE organizations.name = users.username")
+    op.execute("UPDATE items SET org_id = users.org_id FROM users WHERE items.owner_id = users.id")
+
+    op.alter_column('users', 'org_id', nullable=False)
+    op.alter_column('items', 'org_id', nullable=False)
+    op.create_foreign_key('fk_users_org_id', 'users', 'organizations', ['org_id'], ['id'], ondelete='CASCADE')
+    op.create_foreign_key('fk_items_org_id', 'items', 'organizations', ['org_id'], ['id'], ondelete='CASCADE')
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_users_org_id_id', 'users', ['org_id', 'id'],
+            unique=False, postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            'ix_items_org_id_owner_id_id', 'items', ['org_id', 'owner_id', 'id'],
+            unique=False, postgresql_concurrently=True, if_not_exists=True
+        )
+        # Tenant-scoped lists lead with org_id, so the owner-only index is redundant.
+        op.drop_index(
+            'ix_items_owner_id_id', table_name='items',
+            postgresql_concurrently=True, if_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_items_owner_id_id', 'items', ['owner_id', 'id'],
+            unique=False, postgresql_concurrently=True, if_not_exists=True
+        )
+        op.drop_index(
+            'ix_items_org_id_owner_id_id', table_name='items',
+            postgresql_concurrently=True, if_exists=True
+        )
+        op.drop_index(
+            'ix_users_org_id_id', table_name='users',
+            postgresql_concurrently=True, if_exists=True
+        )
+    op.drop_constraint('fk_items_org_id', 'items', type_='foreignkey')
+    op.drop_constraint('fk_users_org_id', 'users', type_='foreignkey')
+    op.drop_column('items', 'org_id')
+    op.drop_column('users', 'org_id')
+    op.drop_index(op.f('ix_organizations_id'), table_name='organizations')
+    op.drop_table('organizations')
@@ -0,0 +1,26 @@
+"""Add user roles
+
+Revision ID: d2e4f6a8b0c3
+Revises: a7c9e1f3b5d8
+Create Date: 2025-11-03 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2e4f6a8b0c3'
+down_revision = 'a7c9e1f3b5d8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('role', sa.String(), server_default='member', nullable=False))
+    # The founding (first) user of each organization administers it.
+    op.execute("UPDATE users SET role = 'admin' WHERE id IN (SELECT min(id) FROM users GROUP BY org_id)")
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'role')
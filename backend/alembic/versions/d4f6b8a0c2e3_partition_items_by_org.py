@@ -0,0 +1,74 @@
+"""Optionally hash-partition items by org_id
+
+Revision ID: d4f6b8a0c2e3
+Revises: c9e3a5b7d1f2
+Create Date: 2025-10-17 09:30:00.000000
+
+Runs only when ITEMS_PARTITIONS is set to the number of hash partitions
+(e.g. ITEMS_PARTITIONS=16); otherwise it is a no-op. The rebuild copies
+every row under an exclusive lock, so schedule it in a maintenance window.
+Postgres requires the partition key in the primary key, so the partitioned
+table's key becomes (id, org_id); the ORM still identifies items by id.
+
+"""
+from alembic import op
+from app.core.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4f6b8a0c2e3'
+down_revision = 'c9e3a5b7d1f2'
+branch_labels = None
+depends_on = None
+
+ITEMS_PARTITIONS = settings.items_partitions
+
+COLUMNS = "id, title, description, owner_id, version, embedding, org_id"
+
+INDEXES = [
+    "CREATE INDEX ix_items_id ON items (id)",
+    "CREATE INDEX ix_items_title ON items (title)",
+    "CREATE INDEX ix_items_org_id_owner_id_id ON items (org_id, owner_id, id)",
+    "CREATE INDEX ix_items_search_vector ON items USING gin (search_vector)",
+    "CREATE INDEX ix_items_embedding_hnsw ON items USING hnsw (embedding vector_cosine_ops)",
+]
+
+
+def _is_partitioned() -> bool:
+    return bool(op.get_bind().exec_driver_sql(
+        "SELECT 1 FROM pg_partitioned_table WHERE partrelid = 'items'::regclass"
+    ).scalar())
+
+
+def _rebuild(partitions: int) -> None:
+    op.execute("LOCK TABLE items IN ACCESS EXCLUSIVE MODE")
+    op.execute("ALTER TABLE items RENAME TO items_old")
+    partition_clause = " PARTITION BY HASH (org_id)" if partitions else ""
+    op.execute(
+        "CREATE TABLE items (LIKE items_old INCLUDING DEFAULTS INCLUDING GENERATED INCLUDING STORAGE)"
+        + partition_clause
+    )
+    for remainder in range(partitions):
+        op.execute(
+            f"CREATE TABLE items_p{remainder} PARTITION OF items "
+            f"FOR VALUES WITH (MODULUS {partitions}, REMAINDER {remainder})"
+        )
+    op.execute(f"INSERT INTO items ({COLUMNS}) SELECT {COLUMNS} FROM items_old")
+    op.execute("ALTER SEQUENCE items_id_seq OWNED BY items.id")
+    op.execute("DROP TABLE items_old")
+    op.execute("ALTER TABLE items ADD PRIMARY KEY " + ("(id, org_id)" if partitions else "(id)"))
+    op.execute("ALTER TABLE items ADD CONSTRAINT items_owner_id_fkey FOREIGN KEY (owner_id) REFERENCES users (id) ON DELETE CASCADE")
+    op.execute("ALTER TABLE items ADD CONSTRAINT fk_items_org_id FOREIGN KEY (org_id) REFERENCES organizations (id) ON DELETE CASCADE")
+    for statement in INDEXES:
+        op.execute(statement)
+    op.execute("ANALYZE items")
+
+
+def upgrade() -> None:
+    if ITEMS_PARTITIONS > 0 and not _is_partitioned():
+        _rebuild(ITEMS_PARTITIONS)
+
+
+def downgrade() -> None:
+    if _is_partitioned():
+        _rebuild(0)
@@ -0,0 +1,67 @@
+"""Create connector source and record tables
+
+Revision ID: f1b3d5e7a9c2
+Revises: d4f6b8a0c2e3
+Create Date: 2025-10-24 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1b3d5e7a9c2'
+down_revision = 'd4f6b8a0c2e3'
+branch_labels = None
+depends_on = None
+
+
+def _items_is_partitioned() -> bool:
+    return bool(op.get_bind().exec_driver_sql(
+        "SELECT 1 FROM pg_partitioned_table WHERE partrelid = 'items'::regclass"
+    ).scalar())
+
+
+def upgrade() -> None:
+    op.create_table('connector_sources',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('org_id', sa.Integer(), nullable=False),
+    sa.Column('owner_id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(), nullable=False),
+    sa.Column('base_url', sa.String(), nullable=False),
+    sa.Column('config', sa.JSON(), nullable=True),
+    sa.Column('cursor', sa.String(), nullable=True),
+    sa.Column('last_synced_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['org_id'], ['organizations.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_connector_sources_id'), 'connector_sources', ['id'], unique=False)
+    op.create_index(op.f('ix_connector_sources_owner_id'), 'connector_sources', ['owner_id'], unique=False)
+    op.create_table('source_records',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('source_id', sa.Integer(), nullable=False),
+    sa.Column('external_id', sa.String(), nullable=False),
+    sa.Column('item_id', sa.Integer(), nullable=False),
+    sa.Column('content_hash', sa.String(length=64), nullable=False),
+    sa.Column('synced_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['source_id'], ['connector_sources.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('source_id', 'external_id', name='uq_source_records_source_id_external_id')
+    )
+    op.create_index(op.f('ix_source_records_item_id'), 'source_records', ['item_id'], unique=False)
+    # A partitioned items table is keyed by (id, org_id), so item_id cannot reference it;
+    # the sync engine then treats records whose item has gone as new.
+    if not _items_is_partitioned():
+        op.create_foreign_key(
+            'source_records_item_id_fkey', 'source_records', 'items', ['item_id'], ['id'], ondelete='CASCADE'
+        )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_source_records_item_id'), table_name='source_records')
+    op.drop_table('source_records')
+    op.drop_index(op.f('ix_connector_sources_owner_id'), table_name='connector_sources')
+    op.drop_index(op.f('ix_connector_sources_id'), table_name='connector_sources')
+    op.drop_table('connector_sources')
@@ -1,25 +1,84 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import uuid
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.schemas import token as token_schema
+from app.schemas.user import UserRead
 from app.services import user_service
-from app.core.database import get_db
-from app.core import security
+from app.core.database import get_async_db
+from app.core import auth_cache, security, rate_limit, revocation
+from app.core.config import settings
 
-auth_router = APIRouter(tags=["Authentication"])
+auth_router = APIRouter(tags=["Authentication"], dependencies=[Depends(rate_limit.RateLimit(settings.rate_limit_auth_ip))])
+LOGIN_USERNAME_RATE = rate_limit.parse_rate(settings.rate_limit_login_username)
+
+def _refresh_ttl_seconds() -> float:
+    return security.REFRESH_TOKEN_EXPIRE_DAYS * 86400
+
+def _issue_tokens(username: str, session_id: str, generation: int) -> dict:
+    return {
+        "access_token": security.create_access_token({"sub": username, "sid": session_id}),
+        "refresh_token": security.create_refresh_token(username, session_id, generation),
+        "token_type": "bearer",
+    }
+
+def _invalid_refresh_token() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid refresh token",
+        headers={"WWW-Authenticate": "Bearer"}
+    )
 
 @auth_router.post("/token", response_model=token_schema.Token)
-def login_for_access_token(
+async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    user = user_service.authenticate_user(db, form_data.username, form_data.password)
+    # Per-username buckets stop spraying one account from many addresses before bcrypt runs.
+    await rate_limit.hit("login:user", form_data.username.lower(), LOGIN_USERNAME_RATE)
+    user = await user_service.authenticate_user_async(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"}
         )
-    
-    access_token = security.create_access_token({"sub": user.username})
-    return {"access_token": access_token, "token_type": "bearer"} 
\ No newline at end of file
+
+    session_id = uuid.uuid4().hex
+    await revocation.start_session(session_id, _refresh_ttl_seconds())
+    return _issue_tokens(user.username, session_id, 0)
+
+@auth_router.post("/token/refresh", response_model=token_schema.Token)
+async def refresh_access_token(body: token_schema.RefreshRequest, db: AsyncSession = Depends(get_async_db)):
+    payload = security.decode_refresh_token(body.refresh_token)
+    if payload is None or await revocation.is_revoked(payload["sid"]):
+        raise _invalid_refresh_token()
+
+    session_id, generation = payload["sid"], payload["gen"]
+    if not await revocation.rotate(session_id, generation, _refresh_ttl_seconds()):
+        # An already-rotated token came back, so one of its holders is not the user:
+        # end the whole session, including the access token issued alongside the newest one.
+        await revocation.revoke(session_id, _refresh_ttl_seconds())
+        raise _invalid_refresh_token()
+
+    username = payload["sub"]
+    principal = await auth_cache.get_principal_async(username)
+    if principal is None:
+        user = await user_service.get_user_by_username_async(db, username)
+        if user is None:
+            await revocation.revoke(session_id, _refresh_ttl_seconds())
+            raise _invalid_refresh_token()
+        principal = UserRead.model_validate(user)
+        await auth_cache.set_principal_async(principal)
+    if not principal.is_active:
+        await revocation.revoke(session_id, _refresh_ttl_seconds())
+        raise _invalid_refresh_token()
+    return _issue_tokens(username, session_id, generation + 1)
+
+@auth_router.post("/token/revoke", status_code=status.HTTP_204_NO_CONTENT)
+async def revoke_refresh_token(body: token_schema.RefreshRequest):
+    """Log out: the refresh token and every access token from its session stop working."""
+    payload = security.decode_refresh_token(body.refresh_token)
+    if payload is not None:
+        await revocation.revoke(payload["sid"], _refresh_ttl_seconds())
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
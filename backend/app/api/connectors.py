@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core import rate_limit
+from app.core.database import get_async_db
+from app.core.deps import get_current_user
+from app.schemas import connector as connector_schema
+from app.schemas.user import UserRead
+from app.services import connector_service
+from app.workers import connectors
+
+router = APIRouter(prefix="/connectors", tags=["Connectors"])
+
+@router.post("/", response_model=connector_schema.ConnectorSourceRead, status_code=201)
+async def create_source(
+    source_in: connector_schema.ConnectorSourceCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserRead = Depends(get_current_user)
+):
+    """Register an external source; sync it with a sync_connector job (related_id = source id) or beat."""
+    if source_in.kind not in connectors.CONNECTORS:
+        raise HTTPException(status_code=400, detail=f"Unknown connector kind: {source_in.kind}")
+    source_rate = (source_in.config or {}).get("rate_limit")
+    if source_rate is not None:
+        try:
+            rate_limit.parse_rate(source_rate)
+        except (TypeError, ValueError) as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+    return await connector_service.create_source_async(db, source_in, owner_id=current_user.id, org_id=current_user.org_id)
+
+@router.get("/", response_model=list[connector_schema.ConnectorSourceRead])
+async def list_sources(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserRead = Depends(get_current_user)
+):
+    return await connector_service.get_sources_by_owner_async(db, current_user.id)
@@ -1,39 +1,215 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+import csv
+import io
+import json
+from typing import Literal
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.schemas import item as item_schema
-from app.services import item_service
-from app.core.database import get_db
+from app.services import item_service, item_cache, embedding_service
+from app.core import etag, embeddings
+from app.core.database import get_async_db
+from app.core.pagination import encode_cursor, decode_cursor, InvalidCursorError
 from app.core.deps import get_current_user
-from app.models.user import User
+from app.schemas.user import UserRead
 
 router = APIRouter(prefix="/items", tags=["Items"])
 
 @router.post("/", response_model=item_schema.ItemRead, status_code=201)
-def create_item(
+async def create_item(
     item_in: item_schema.ItemCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserRead = Depends(get_current_user)
 ):
-    new_item = item_service.create_item(db, item_in, owner_id=current_user.id)
+    new_item = await item_service.create_item_async(db, item_in, owner_id=current_user.id, org_id=current_user.org_id)
     return new_item
 
-@router.get("/", response_model=list[item_schema.ItemRead])
-def list_my_items(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+BULK_MAX_ITEMS = 10000
+
+def _parse_bulk_body(body: bytes, content_type: str) -> list:
+    if content_type.startswith("application/x-ndjson"):
+        return [json.loads(line) for line in body.splitlines() if line.strip()]
+    payload = json.loads(body)
+    if not isinstance(payload, list):
+        raise ValueError("Expected a JSON array")
+    return payload
+
+@router.post("/bulk", response_model=item_schema.ItemBulkResult)
+async def create_items_bulk(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserRead = Depends(get_current_user)
+):
+    try:
+        raw_items = _parse_bulk_body(await request.body(), request.headers.get("content-type", ""))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON")
+    if len(raw_items) > BULK_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {BULK_MAX_ITEMS} items per request")
+
+    errors = []
+    valid_indexes = []
+    valid_items = []
+    for index, raw in enumerate(raw_items):
+        try:
+            valid_items.append(item_schema.ItemCreate.model_validate(raw))
+            valid_indexes.append(index)
+        except ValidationError as exc:
+            errors.append({"index": index, "detail": exc.errors(include_url=False, include_context=False)})
+
+    ids, insert_errors = await item_service.create_items_bulk_async(db, valid_items, owner_id=current_user.id, org_id=current_user.org_id)
+    for position, detail in insert_errors.items():
+        errors.append({"index": valid_indexes[position], "detail": detail})
+    errors.sort(key=lambda error: error["index"])
+    # Positional: created_ids[i] is the id for input row i, or null if that row failed.
+    created_ids = [None] * len(raw_items)
+    for index, item_id in zip(valid_indexes, ids):
+        created_ids[index] = item_id
+    return {"created_ids": created_ids, "errors": errors}
+
+@router.get("/", response_model=item_schema.ItemPage, response_class=ORJSONResponse)
+async def list_my_items(
+    request: Request,
+    limit: int = Query(50, ge=1, le=500),
+    after: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserRead = Depends(get_current_user)
+):
+    after_id = None
+    if after is not None:
+        try:
+            position = decode_cursor(after)
+            if position.get("owner_id") != current_user.id:
+                raise InvalidCursorError("Cursor belongs to another owner")
+            after_id = int(position["id"])
+        except (KeyError, TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    # Every item write bumps the owner version, so it identifies the page contents.
+    page_etag = etag.make_hashed_etag("items", current_user.id, await item_cache.owner_version(current_user.id), limit, after_id)
+    if etag.matches(request, page_etag):
+        return etag.not_modified(page_etag)
+
+    items, last_id = await item_service.get_items_page_cached_async(db, owner_id=current_user.id, limit=limit, after_id=after_id)
+    next_cursor = encode_cursor(owner_id=current_user.id, id=last_id) if last_id is not None else None
+    # Rows already have exactly the ItemPage shape; returning a response skips response_model validation.
+    page = ORJSONResponse({"items": items, "next_cursor": next_cursor})
+    etag.set_etag(page, page_etag)
+    return page
+
+@router.get("/search", response_model=item_schema.ItemSearchPage)
+async def search_my_items(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    after: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserRead = Depends(get_current_user)
+):
+    position = None
+    if after is not None:
+        try:
+            cursor = decode_cursor(after)
+            if cursor.get("owner_id") != current_user.id or cursor.get("q") != q:
+                raise InvalidCursorError("Cursor belongs to another search")
+            position = (float(cursor["rank"]), int(cursor["id"]))
+        except (KeyError, TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    try:
+        hits, last = await item_service.search_items_async(db, owner_id=current_user.id, org_id=current_user.org_id, q=q, limit=limit, after=position)
+    except item_service.SearchUnavailableError:
+        raise HTTPException(status_code=501, detail="Search is not available")
+    next_cursor = None
+    if last is not None:
+        next_cursor = encode_cursor(owner_id=current_user.id, q=q, rank=last[0], id=last[1])
+    return {"items": hits, "next_cursor": next_cursor}
+
+@router.get("/similar", response_model=item_schema.ItemSimilarResult)
+async def similar_items(
+    q: str | None = Query(None, min_length=1, max_length=2000),
+    item_id: int | None = None,
+    k: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserRead = Depends(get_current_user)
+):
+    if (q is None) == (item_id is None):
+        raise HTTPException(status_code=400, detail="Provide exactly one of q or item_id")
+    query_vector = None
+    if q is not None:
+        query_vector = (await run_in_threadpool(embeddings.embed_in_batches, [q]))[0]
+    else:
+        item = await item_service.get_item_cached_async(db, item_id=item_id)
+        # Other tenants' items do not exist as far as this user is concerned.
+        if not item or item.org_id != current_user.org_id:
+            raise HTTPException(status_code=404, detail="Item not found")
+        if item.owner_id != current_user.id:
+            raise HTTPException(status_code=403, detail="Not authorized to access this item")
+    hits = await embedding_service.similar_items_async(
+        db, owner_id=current_user.id, org_id=current_user.org_id, k=k, query_vector=query_vector, item_id=item_id
+    )
+    return {"items": hits}
+
+EXPORT_BATCH_SIZE = 1000
+
+async def _ndjson_chunks(rows):
+    lines = []
+    async for row in rows:
+        lines.append(json.dumps(dict(row._mapping)) + "\n")
+        if len(lines) >= EXPORT_BATCH_SIZE:
+            yield "".join(lines)
+            lines = []
+    if lines:
+        yield "".join(lines)
+
+async def _csv_chunks(rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(item_service.EXPORT_COLUMNS)
+    count = 0
+    async for row in rows:
+        writer.writerow(row)
+        count += 1
+        if count >= EXPORT_BATCH_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            count = 0
+    yield buffer.getvalue()
+
+@router.get("/export")
+async def export_my_items(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserRead = Depends(get_current_user)
 ):
-    items = item_service.get_items_by_owner(db, owner_id=current_user.id)
-    return items
+    rows = item_service.iter_items_for_export_async(db, owner_id=current_user.id, batch_size=EXPORT_BATCH_SIZE)
+    if format == "csv":
+        chunks, media_type = _csv_chunks(rows), "text/csv"
+    else:
+        chunks, media_type = _ndjson_chunks(rows), "application/x-ndjson"
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="items.{format}"'}
+    )
 
 @router.get("/{item_id}", response_model=item_schema.ItemRead)
-def read_item(
+async def read_item(
     item_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserRead = Depends(get_current_user)
 ):
-    item = item_service.get_item(db, item_id=item_id)
-    if not item:
+    item = await item_service.get_item_cached_async(db, item_id=item_id)
+    if not item or item.org_id != current_user.org_id:
         raise HTTPException(status_code=404, detail="Item not found")
     if item.owner_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to access this item")
+    item_etag = etag.make_etag("item", item.id, item.version)
+    if etag.matches(request, item_etag):
+        return etag.not_modified(item_etag)
+    etag.set_etag(response, item_etag)
     return item 
\ No newline at end of file
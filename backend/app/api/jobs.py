@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.schemas import job as job_schema
+from app.schemas.user import UserRead
+from app.services import job_service
+from app.core.database import get_async_db
+from app.core.deps import get_current_user
+from app.workers import tasks, registry
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+@router.post("/", response_model=job_schema.JobRead, status_code=201)
+async def create_job(
+    job_in: job_schema.JobCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserRead = Depends(get_current_user)
+):
+    if not registry.is_registered(job_in.job_type):
+        raise HTTPException(status_code=400, detail=f"Unknown job type: {job_in.job_type}")
+    job = await job_service.create_job_async(db, job_in, user_id=current_user.id)
+    try:
+        await run_in_threadpool(tasks.enqueue_job, job)
+    except Exception as exc:
+        await job_service.mark_failed_async(db, job, f"Could not enqueue job: {exc}")
+        raise HTTPException(status_code=503, detail="Job queue unavailable", headers={"Retry-After": "5"})
+    # In eager mode the job has already run in another session.
+    await db.refresh(job)
+    return job
+
+@router.get("/{job_id}", response_model=job_schema.JobRead)
+async def read_job(
+    job_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserRead = Depends(get_current_user)
+):
+    job = await job_service.get_job_async(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.user_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized to access this job")
+    return job
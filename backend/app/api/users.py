@@ -1,22 +1,60 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.schemas import user as user_schema
-from app.services import user_service
-from app.core.database import get_db
-from app.core.deps import get_current_user
+from app.services import user_service, provisioning_service
+from app.core import etag, rate_limit
+from app.core.config import settings
+from app.core.database import get_async_db
+from app.core.deps import get_current_admin, get_current_user
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
-@router.post("/", response_model=user_schema.UserRead, status_code=201)
-def register_user(
+@router.post(
+    "/", response_model=user_schema.UserRead, status_code=201,
+    dependencies=[Depends(rate_limit.RateLimit(settings.rate_limit_register_ip))]
+)
+async def register_user(
     user_in: user_schema.UserCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    new_user = user_service.create_user(db, user_in)
+    new_user = await user_service.create_user_async(db, user_in)
     if new_user is None:
         raise HTTPException(status_code=400, detail="Username or email already registered")
     return new_user
 
+@router.post(
+    "/bulk", response_model=user_schema.UserBulkResult,
+    dependencies=[Depends(rate_limit.RateLimit(settings.rate_limit_provision_ip))]
+)
+async def provision_users(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: user_schema.UserRead = Depends(get_current_admin)
+):
+    """Create users in the caller's organization from a streamed text/csv or application/x-ndjson body.
+
+    Admins only. At most PROVISION_MAX_ROWS rows are read; a 503 from a busy hashing pool
+    can be retried with the same body, since rows already created come back as conflicts.
+    """
+    fmt = provisioning_service.format_for(request.headers.get("content-type", ""))
+    if fmt is None:
+        raise HTTPException(status_code=415, detail="Body must be text/csv or application/x-ndjson")
+    lines = provisioning_service.iter_lines(request.stream())
+    try:
+        return await provisioning_service.provision_users(
+            db, current_user.org_id, lines, fmt, max_rows=provisioning_service.PROVISION_MAX_ROWS
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
 @router.get("/me", response_model=user_schema.UserRead)
-def read_current_user(current_user: user_schema.UserRead = Depends(get_current_user)):
+async def read_current_user(
+    request: Request,
+    response: Response,
+    current_user: user_schema.UserRead = Depends(get_current_user)
+):
+    user_etag = etag.make_etag("user", current_user.id, current_user.version)
+    if etag.matches(request, user_etag):
+        return etag.not_modified(user_etag)
+    etag.set_etag(response, user_etag)
     return current_user 
\ No newline at end of file
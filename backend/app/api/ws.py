@@ -0,0 +1,48 @@
+import asyncio
+from fastapi import APIRouter, Depends, WebSocket, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core import events
+from app.core.database import get_async_db
+from app.core.deps import resolve_principal, InvalidCredentials, UnknownUser
+
+router = APIRouter(tags=["Realtime"])
+
+async def _drain_client(websocket: WebSocket):
+    while True:
+        await websocket.receive_text()
+
+@router.websocket("/ws")
+async def event_stream(
+    websocket: WebSocket,
+    token: str | None = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    principal = None
+    if token:
+        try:
+            principal = await resolve_principal(db, token)
+        except (InvalidCredentials, UnknownUser):
+            pass
+    # Give the connection back to the pool; the socket may stay open for hours.
+    await db.close()
+    if principal is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    channel = events.user_channel(principal.id)
+    async with events.bus.subscribe(channel) as stream:
+        await websocket.send_json({"event": "subscribed", "channel": channel})
+
+        async def forward():
+            async for event in stream:
+                await websocket.send_json(event)
+
+        forwarder = asyncio.create_task(forward())
+        listener = asyncio.create_task(_drain_client(websocket))
+        try:
+            await asyncio.wait({forwarder, listener}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in (forwarder, listener):
+                task.cancel()
+            await asyncio.gather(forwarder, listener, return_exceptions=True)
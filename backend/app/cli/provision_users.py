@@ -0,0 +1,75 @@
+"""Provision users into an organization from a CSV or NDJSON file.
+
+    python -m app.cli.provision_users users.csv --org-id 3
+    python -m app.cli.provision_users users.ndjson --new-org "Acme" --workers 8 --report report.json
+
+Rows are streamed, hashed in parallel across a process pool and inserted
+in chunks; existing usernames and emails are reported as conflicts.
+"""
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+from sqlalchemy import insert
+from app.core import database, hashing
+from app.models.organization import Organization
+from app.services import provisioning_service
+
+async def _read_lines(path: str):
+    handle = sys.stdin if path == "-" else open(path, encoding="utf-8-sig", newline="")
+    try:
+        for line in handle:
+            yield line
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+
+async def run(path: str, fmt: str, org_id: int | None, new_org: str | None, chunk_size: int) -> dict:
+    try:
+        async with database.AsyncSessionLocal() as db:
+            if new_org is not None:
+                org_id = (await db.execute(insert(Organization).values(name=new_org).returning(Organization.id))).scalar_one()
+                await db.commit()
+            report = await provisioning_service.provision_users(db, org_id, _read_lines(path), fmt, chunk_size)
+            report["org_id"] = org_id
+            return report
+    finally:
+        await database.dispose_engines()
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", help="CSV (username,email,password header) or NDJSON file; - for stdin")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--org-id", type=int)
+    target.add_argument("--new-org", help="create an organization with this name first")
+    parser.add_argument("--format", choices=provisioning_service.FORMATS, help="default: from the file extension")
+    parser.add_argument("--workers", type=int, help="bcrypt processes (default PASSWORD_HASH_WORKERS)")
+    parser.add_argument("--chunk-size", type=int, default=provisioning_service.PROVISION_CHUNK_SIZE)
+    parser.add_argument("--report", help="write the full JSON report here")
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ("ndjson" if Path(args.path).suffix.lower() in (".ndjson", ".jsonl") else "csv")
+    if args.workers is not None:
+        hashing.PASSWORD_HASH_WORKERS = args.workers
+    try:
+        report = asyncio.run(run(args.path, fmt, args.org_id, args.new_org, args.chunk_size))
+    except ValueError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    finally:
+        hashing.shutdown()
+
+    print(f"org {report['org_id']}: {len(report['created'])} created, "
+          f"{len(report['conflicts'])} conflicts, {len(report['errors'])} errors")
+    for entry in report["conflicts"][:20]:
+        print(f"  row {entry['row']}: conflict {entry['username']} / {entry['email']}")
+    for entry in report["errors"][:20]:
+        print(f"  row {entry['row']}: {entry['detail']}")
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+    return 1 if report["errors"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,205 @@
+import asyncio
+import logging
+import threading
+import time
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from app.core import security
+from app.core.cache import LRUCache
+from app.models.user import User
+from app.schemas.user import UserRead
+from app.core.config import settings
+
+AUTH_CACHE_BACKEND = settings.auth_cache_backend
+AUTH_CACHE_TTL_SECONDS = settings.auth_cache_ttl_seconds
+AUTH_CACHE_MAX_ENTRIES = settings.auth_cache_max_entries
+REDIS_URL = settings.redis_url
+
+logger = logging.getLogger(__name__)
+
+class MemoryPrincipalBackend:
+    def __init__(self, max_entries: int = AUTH_CACHE_MAX_ENTRIES, ttl_seconds: int = AUTH_CACHE_TTL_SECONDS):
+        self._cache = LRUCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+
+    def get(self, username: str) -> UserRead | None:
+        return self._cache.get(username)
+
+    def set(self, principal: UserRead):
+        self._cache.set(principal.username, principal)
+
+    def delete(self, username: str):
+        self._cache.delete(username)
+
+    def clear(self):
+        self._cache.clear()
+
+    # Same calls for async callers; an in-process dict never blocks the loop.
+    async def aget(self, username: str) -> UserRead | None:
+        return self.get(username)
+
+    async def aset(self, principal: UserRead):
+        self.set(principal)
+
+    async def adelete(self, username: str):
+        self.delete(username)
+
+class RedisPrincipalBackend:
+    """Sync calls for sync sessions and tests; request handlers use the a* methods,
+    which go through redis.asyncio so an authenticated request never blocks the loop."""
+
+    prefix = "auth:principal:"
+
+    def __init__(self, url: str | None = None, ttl_seconds: int = AUTH_CACHE_TTL_SECONDS, client=None, async_client=None):
+        if client is None:
+            import redis
+            client = redis.Redis.from_url(url)
+        if async_client is None and url is not None:
+            import redis.asyncio
+            async_client = redis.asyncio.Redis.from_url(url)
+        self._client = client
+        self._async_client = async_client
+        self.ttl_seconds = ttl_seconds
+
+    def get(self, username: str) -> UserRead | None:
+        raw = self._client.get(self.prefix + username)
+        if raw is None:
+            return None
+        return UserRead.model_validate_json(raw)
+
+    def set(self, principal: UserRead):
+        self._client.set(self.prefix + principal.username, principal.model_dump_json(), ex=self.ttl_seconds)
+
+    def delete(self, username: str):
+        self._client.delete(self.prefix + username)
+
+    def clear(self):
+        for key in self._client.scan_iter(match=self.prefix + "*"):
+            self._client.delete(key)
+
+    async def aget(self, username: str) -> UserRead | None:
+        raw = await self._async_client.get(self.prefix + username)
+        if raw is None:
+            return None
+        return UserRead.model_validate_json(raw)
+
+    async def aset(self, principal: UserRead):
+        await self._async_client.set(self.prefix + principal.username, principal.model_dump_json(), ex=self.ttl_seconds)
+
+    async def adelete(self, username: str):
+        await self._async_client.delete(self.prefix + username)
+
+def _build_backend():
+    if AUTH_CACHE_BACKEND == "redis":
+        if not REDIS_URL:
+            raise RuntimeError("AUTH_CACHE_BACKEND=redis requires REDIS_URL")
+        return RedisPrincipalBackend(REDIS_URL)
+    return MemoryPrincipalBackend()
+
+backend = _build_backend()
+
+# Decoded claims stay per-process: they are cheap to rebuild and tokens never change.
+_claims = LRUCache(max_entries=AUTH_CACHE_MAX_ENTRIES, ttl_seconds=AUTH_CACHE_TTL_SECONDS)
+
+_stats_lock = threading.Lock()
+_stats = {"claims_hits": 0, "claims_misses": 0, "principal_hits": 0, "principal_misses": 0}
+
+def _count(name: str):
+    with _stats_lock:
+        _stats[name] += 1
+
+def decode_token(token: str) -> dict | None:
+    payload = _claims.get(token)
+    if payload is not None:
+        _count("claims_hits")
+        return payload
+    _count("claims_misses")
+    payload = security.decode_access_token(token)
+    if payload is None:
+        return None
+    ttl = AUTH_CACHE_TTL_SECONDS
+    exp = payload.get("exp")
+    if exp is not None:
+        ttl = min(ttl, exp - time.time())
+    if ttl > 0:
+        _claims.set(token, payload, ttl_seconds=ttl)
+    return payload
+
+def _count_lookup(principal: UserRead | None) -> UserRead | None:
+    _count("principal_misses" if principal is None else "principal_hits")
+    return principal
+
+def get_principal(username: str) -> UserRead | None:
+    return _count_lookup(backend.get(username))
+
+async def get_principal_async(username: str) -> UserRead | None:
+    return _count_lookup(await backend.aget(username))
+
+def set_principal(principal: UserRead):
+    backend.set(principal)
+
+async def set_principal_async(principal: UserRead):
+    await backend.aset(principal)
+
+def invalidate_user(username: str):
+    backend.delete(username)
+
+# Invalidations from AsyncSession commits run as tasks on the loop; kept here until done.
+_pending_invalidations: set[asyncio.Task] = set()
+
+async def _invalidate_user_async(username: str):
+    try:
+        await backend.adelete(username)
+    except Exception:
+        # The entry still expires after AUTH_CACHE_TTL_SECONDS.
+        logger.exception("Could not invalidate cached principal %s", username)
+
+def reset():
+    backend.clear()
+    _claims.clear()
+    with _stats_lock:
+        for name in _stats:
+            _stats[name] = 0
+
+def stats() -> dict:
+    with _stats_lock:
+        snapshot = dict(_stats)
+    lookups = snapshot["principal_hits"] + snapshot["principal_misses"]
+    snapshot["principal_hit_ratio"] = snapshot["principal_hits"] / lookups if lookups else 0.0
+    decodes = snapshot["claims_hits"] + snapshot["claims_misses"]
+    snapshot["claims_hit_ratio"] = snapshot["claims_hits"] / decodes if decodes else 0.0
+    return snapshot
+
+# Invalidate only once the change is committed, so a concurrent request
+# cannot re-cache the old row between flush and commit.
+@event.listens_for(Session, "after_flush")
+def _collect_changed_users(session, flush_context):
+    changed = session.info.setdefault("auth_cache_invalidate", set())
+    for obj in list(session.dirty) + list(session.deleted):
+        if not isinstance(obj, User):
+            continue
+        if obj.username:
+            changed.add(obj.username)
+        history = inspect(obj).attrs.username.history
+        changed.update(name for name in history.deleted if name)
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_users(session):
+    usernames = session.info.pop("auth_cache_invalidate", set())
+    if not usernames:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    for username in usernames:
+        if loop is None:
+            invalidate_user(username)
+            continue
+        # An AsyncSession commits on the event loop, so the delete must not block it.
+        task = loop.create_task(_invalidate_user_async(username))
+        _pending_invalidations.add(task)
+        task.add_done_callback(_pending_invalidations.discard)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_invalidations(session):
+    session.info.pop("auth_cache_invalidate", None)
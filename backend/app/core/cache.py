@@ -0,0 +1,148 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+
+class LRUCache:
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float | None = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl_seconds: float | None = None):
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+class MemoryCacheBackend:
+    def __init__(self, max_entries: int = 10000):
+        self._cache = LRUCache(max_entries=max_entries)
+
+    def get(self, key: str) -> str | None:
+        return self._cache.get(key)
+
+    def set(self, key: str, value: str, ttl_seconds: float | None = None):
+        self._cache.set(key, value, ttl_seconds=ttl_seconds)
+
+    def delete(self, *keys: str):
+        for key in keys:
+            self._cache.delete(key)
+
+    def clear(self):
+        self._cache.clear()
+
+    # Same calls for async callers; an in-process dict never blocks the loop.
+    async def aget(self, key: str) -> str | None:
+        return self.get(key)
+
+    async def aset(self, key: str, value: str, ttl_seconds: float | None = None):
+        self.set(key, value, ttl_seconds=ttl_seconds)
+
+    async def adelete(self, *keys: str):
+        self.delete(*keys)
+
+def _decode(raw) -> str | None:
+    return raw.decode() if isinstance(raw, bytes) else raw
+
+class RedisCacheBackend:
+    """Sync calls for sync callers (workers, commit hooks); the a* methods go through
+    redis.asyncio so request handlers never block the event loop on Redis."""
+
+    def __init__(self, url: str | None = None, client=None, async_client=None, prefix: str = "cache:"):
+        if client is None:
+            import redis
+            client = redis.Redis.from_url(url)
+        if async_client is None and url is not None:
+            import redis.asyncio
+            async_client = redis.asyncio.Redis.from_url(url)
+        self._client = client
+        self._async_client = async_client
+        self.prefix = prefix
+
+    def get(self, key: str) -> str | None:
+        return _decode(self._client.get(self.prefix + key))
+
+    def set(self, key: str, value: str, ttl_seconds: float | None = None):
+        self._client.set(self.prefix + key, value, px=int(ttl_seconds * 1000) if ttl_seconds else None)
+
+    def delete(self, *keys: str):
+        if keys:
+            self._client.delete(*(self.prefix + key for key in keys))
+
+    def clear(self):
+        for key in self._client.scan_iter(match=self.prefix + "*"):
+            self._client.delete(key)
+
+    async def aget(self, key: str) -> str | None:
+        return _decode(await self._async_client.get(self.prefix + key))
+
+    async def aset(self, key: str, value: str, ttl_seconds: float | None = None):
+        await self._async_client.set(self.prefix + key, value, px=int(ttl_seconds * 1000) if ttl_seconds else None)
+
+    async def adelete(self, *keys: str):
+        if keys:
+            await self._async_client.delete(*(self.prefix + key for key in keys))
+
+def build_backend(kind: str, redis_url: str | None = None, max_entries: int = 10000):
+    if kind == "redis":
+        if not redis_url:
+            raise RuntimeError("Redis cache backend requires REDIS_URL")
+        return RedisCacheBackend(redis_url)
+    if kind == "memory":
+        return MemoryCacheBackend(max_entries=max_entries)
+    raise RuntimeError(f"Unknown cache backend {kind!r}")
+
+class SingleFlight:
+    def __init__(self):
+        self._pending: dict[str, asyncio.Future] = {}
+
+    async def run(self, key: str, loader):
+        pending = self._pending.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            result = await loader()
+        except Exception as exc:
+            future.set_exception(exc)
+            # Retrieve it so an unawaited failure does not warn.
+            future.exception()
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._pending.pop(key, None)
@@ -0,0 +1,100 @@
+import os
+from pathlib import Path
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+# backend/.env, wherever the process was started from; real environment variables win.
+ENV_FILE = Path(__file__).resolve().parents[2] / ".env"
+
+class Settings(BaseSettings):
+    model_config = SettingsConfigDict(env_file=ENV_FILE, env_file_encoding="utf-8", extra="ignore")
+
+    # Database
+    database_url: str | None = None
+    async_database_url: str | None = None
+    database_replica_urls: str = ""
+    database_pool_size: int = 5
+    database_prewarm: bool = False
+    replica_sticky_seconds: float = 5
+    replica_sticky_backend: str = "memory"
+    items_partitions: int = 0
+
+    # Auth
+    secret_key: str = "change-this-in-prod"
+    algorithm: str = "HS256"
+    access_token_expire_minutes: int = 30
+    refresh_token_expire_days: int = 14
+    revocation_backend: str = "memory"
+    revocation_capacity: int = 100000
+    revocation_error_rate: float = 0.001
+    revocation_sync_seconds: float = 5
+    bcrypt_rounds: int = 12
+    password_hash_workers: int = os.cpu_count() or 1
+    password_hash_queue_size: int = 64
+    password_hash_retry_after_seconds: int = 1
+    password_hash_prewarm: bool = False
+    provision_chunk_size: int = 500
+    provision_max_rows: int = 10000
+    rate_limit_enabled: bool = True
+    rate_limit_backend: str = "memory"
+    rate_limit_auth_ip: str = "30/minute"
+    rate_limit_login_username: str = "5/minute"
+    rate_limit_register_ip: str = "10/hour"
+    rate_limit_provision_ip: str = "10/hour"
+    auth_cache_backend: str = "memory"
+    auth_cache_ttl_seconds: int = 60
+    auth_cache_max_entries: int = 10000
+
+    # Caches, events and workers
+    redis_url: str | None = None
+    item_cache_backend: str = "memory"
+    item_cache_ttl_seconds: int = 300
+    item_cache_max_entries: int = 10000
+    event_bus_backend: str = "memory"
+    event_bus_queue_size: int = 100
+    celery_broker_url: str | None = None
+    celery_task_always_eager: bool = False
+
+    # Connectors
+    connector_rate_limit: str = "10/second"
+    connector_concurrency: int = 8
+    connector_max_connections: int = 50
+    connector_max_retries: int = 4
+    connector_backoff_seconds: float = 0.5
+    connector_timeout_seconds: float = 30
+    connector_sync_interval_seconds: int = 0
+
+    # Transactional outbox
+    outbox_batch_size: int = 100
+    outbox_relay_interval_seconds: float = 1.0
+    outbox_backoff_seconds: float = 1.0
+    outbox_retention_hours: int = 24
+    outbox_relay_eager: bool = False
+
+    # Observability
+    sql_profiling_enabled: bool = True
+    sql_n_plus_one_threshold: int = 5
+
+    # Embeddings and LLM
+    embedder: str = "hashing"
+    embedding_dim: int = 384
+    embedding_batch_size: int = 64
+    embedding_api_url: str = "https://api.openai.com/v1/embeddings"
+    embedding_api_key: str | None = None
+    embedding_model: str = "text-embedding-3-small"
+    llm_client: str = "stub"
+    llm_api_url: str = "https://api.openai.com/v1/chat/completions"
+    llm_api_key: str | None = None
+    llm_model: str = "gpt-4o-mini"
+    llm_timeout_seconds: float = 60
+    summary_chunk_tokens: int = 1500
+    summary_concurrency: int = 4
+    summary_cache_backend: str = "memory"
+    summary_cache_ttl_seconds: int = 7 * 24 * 3600
+    summary_cache_max_entries: int = 10000
+
+    # HTTP
+    # Worker processes serving the API; uvicorn and gunicorn read the same variable.
+    web_concurrency: int = 1
+    allowed_hosts: list[str] = ["http://localhost:3000", "http://localhost:8000"]
+
+settings = Settings()
@@ -1,22 +1,95 @@
-import os
-from sqlalchemy import create_engine
+import asyncio
+import threading
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker, declarative_base
-from dotenv import load_dotenv
+from app.core.config import settings
+from app.core.routing import DATABASE_REPLICA_URLS, RoutingSession
 
-load_dotenv()
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
 
-DATABASE_URL = os.getenv("DATABASE_URL")
-if not DATABASE_URL:
-    raise RuntimeError("DATABASE_URL is not set in environment")
-
-engine = create_engine(
-    DATABASE_URL, 
-    pool_pre_ping=True
-)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def to_async_url(url: str) -> str:
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise RuntimeError(f"No async driver configured for {backend!r} databases")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
 
 Base = declarative_base()
 
+# Engines are built on first use rather than at import, so importing models,
+# Celery tasks or Alembic env does not need a database or DATABASE_URL.
+_engines: dict = {}
+_engines_lock = threading.Lock()
+
+def init_engines() -> dict:
+    if _engines:
+        return _engines
+    with _engines_lock:
+        if _engines:
+            return _engines
+        if not settings.database_url:
+            raise RuntimeError("DATABASE_URL is not set in environment")
+        engine = create_engine(settings.database_url, pool_pre_ping=True)
+        replicas = [create_engine(url, pool_pre_ping=True) for url in DATABASE_REPLICA_URLS]
+        async_engine = create_async_engine(
+            settings.async_database_url or to_async_url(settings.database_url),
+            pool_pre_ping=True
+        )
+        async_replicas = [create_async_engine(to_async_url(url), pool_pre_ping=True) for url in DATABASE_REPLICA_URLS]
+        SessionLocal.configure(bind=engine, primary=engine, replicas=replicas)
+        AsyncSessionLocal.configure(
+            bind=async_engine,
+            primary=async_engine.sync_engine,
+            replicas=[replica.sync_engine for replica in async_replicas]
+        )
+        _engines.update(engine=engine, replicas=replicas, async_engine=async_engine, async_replicas=async_replicas)
+    return _engines
+
+async def dispose_engines():
+    with _engines_lock:
+        engines = dict(_engines)
+        _engines.clear()
+    for engine in [engines.get("engine"), *engines.get("replicas", [])]:
+        if engine is not None:
+            engine.dispose()
+    for engine in [engines.get("async_engine"), *engines.get("async_replicas", [])]:
+        if engine is not None:
+            await engine.dispose()
+
+async def prewarm_pool(connections: int = settings.database_pool_size):
+    """Open pool connections up front so the first requests do not pay for connecting."""
+    async_engine = init_engines()["async_engine"]
+
+    async def touch():
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(touch() for _ in range(connections)))
+
+class _LazySessionmaker(sessionmaker):
+    def __call__(self, **local_kw):
+        init_engines()
+        return super().__call__(**local_kw)
+
+class _LazyAsyncSessionmaker(async_sessionmaker):
+    def __call__(self, **local_kw):
+        init_engines()
+        return super().__call__(**local_kw)
+
+SessionLocal = _LazySessionmaker(autocommit=False, autoflush=False, class_=RoutingSession)
+AsyncSessionLocal = _LazyAsyncSessionmaker(autoflush=False, expire_on_commit=False, sync_session_class=RoutingSession)
+
+def __getattr__(name: str):
+    # Keeps `database.engine` / `database.async_engine` working without building them at import.
+    if name in ("engine", "async_engine"):
+        return init_engines()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 def get_db():
     db = SessionLocal()
     try:
@@ -24,4 +97,6 @@ def get_db():
     finally:
         db.close()
 
- 
\ No newline at end of file
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
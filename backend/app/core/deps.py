@@ -1,27 +1,62 @@
+from typing import AsyncIterator
 from fastapi import Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.core.database import get_db
-from app.core.security import oauth2_scheme, decode_access_token
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_async_db
+from app.core.security import oauth2_scheme
+from app.core import auth_cache, revocation, tenancy
+from app.models.user import ROLE_ADMIN
+from app.schemas.user import UserRead
 from app.services import user_service
 
-def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)):
-    payload = decode_access_token(token)
-    if payload is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
-            headers={"WWW-Authenticate": "Bearer"}
-        )
-    
+class InvalidCredentials(Exception):
+    pass
+
+class UnknownUser(Exception):
+    pass
+
+async def resolve_principal(db: AsyncSession, token: str) -> UserRead:
+    payload = auth_cache.decode_token(token)
+    if payload is None or payload.get("type") == "refresh":
+        raise InvalidCredentials()
+    # A Bloom filter lookup for almost every token; only possible hits reach the store.
+    if await revocation.is_revoked(payload.get("sid")):
+        raise InvalidCredentials()
+
     username: str = payload.get("sub")
     if username is None:
+        raise InvalidCredentials()
+
+    principal = await auth_cache.get_principal_async(username)
+    if principal is not None:
+        return principal
+
+    user = await user_service.get_user_by_username_async(db, username)
+    if user is None:
+        raise UnknownUser()
+    principal = UserRead.model_validate(user)
+    await auth_cache.set_principal_async(principal)
+    return principal
+
+async def get_current_user(db: AsyncSession = Depends(get_async_db), token: str = Depends(oauth2_scheme)) -> AsyncIterator[UserRead]:
+    try:
+        principal = await resolve_principal(db, token)
+    except InvalidCredentials:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"}
         )
-    
-    user = user_service.get_user_by_username(db, username)
-    if user is None:
+    except UnknownUser:
         raise HTTPException(status_code=404, detail="User not found")
-    return user 
\ No newline at end of file
+    # Scopes every ORM read for the rest of this request to the user's organization,
+    # and only this request: the next one on the same task starts unscoped.
+    org_token = tenancy.set_current_org(principal.org_id)
+    try:
+        yield principal
+    finally:
+        tenancy.reset_current_org(org_token)
+
+async def get_current_admin(current_user: UserRead = Depends(get_current_user)) -> UserRead:
+    if current_user.role != ROLE_ADMIN:
+        raise HTTPException(status_code=403, detail="Organization admin required")
+    return current_user
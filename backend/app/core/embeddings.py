@@ -0,0 +1,78 @@
+import hashlib
+import re
+import numpy as np
+from app.core.config import settings
+
+EMBEDDER = settings.embedder
+EMBEDDING_DIM = settings.embedding_dim
+EMBEDDING_BATCH_SIZE = settings.embedding_batch_size
+EMBEDDING_API_URL = settings.embedding_api_url
+EMBEDDING_API_KEY = settings.embedding_api_key
+EMBEDDING_MODEL = settings.embedding_model
+
+_TOKEN = re.compile(r"\w+")
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+class HashingEmbedder:
+    """Deterministic bag-of-words feature hashing; no model or network needed."""
+
+    def __init__(self, dimensions: int = EMBEDDING_DIM):
+        self.dimensions = dimensions
+
+    def _bucket(self, token: str) -> tuple[int, float]:
+        digest = int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), "little")
+        return digest % self.dimensions, 1.0 if digest >> 63 else -1.0
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token in _TOKEN.findall(text.lower()):
+                index, sign = self._bucket(token)
+                matrix[row, index] += sign
+        return _normalize_rows(matrix)
+
+class HTTPEmbedder:
+    """Any OpenAI-compatible /embeddings endpoint."""
+
+    def __init__(self, url: str = EMBEDDING_API_URL, api_key: str | None = EMBEDDING_API_KEY,
+                 model: str = EMBEDDING_MODEL, dimensions: int = EMBEDDING_DIM):
+        import httpx
+        self.model = model
+        self.dimensions = dimensions
+        headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        self._client = httpx.Client(base_url=url, headers=headers, timeout=30.0)
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        resp = self._client.post("", json={"model": self.model, "input": texts, "dimensions": self.dimensions})
+        resp.raise_for_status()
+        data = sorted(resp.json()["data"], key=lambda entry: entry["index"])
+        return _normalize_rows(np.asarray([entry["embedding"] for entry in data], dtype=np.float32))
+
+_embedder = None
+
+def get_embedder():
+    global _embedder
+    if _embedder is None:
+        _embedder = HTTPEmbedder() if EMBEDDER == "http" else HashingEmbedder()
+    return _embedder
+
+def embed_in_batches(texts: list[str], batch_size: int = EMBEDDING_BATCH_SIZE) -> np.ndarray:
+    embedder = get_embedder()
+    if not texts:
+        return np.zeros((0, embedder.dimensions), dtype=np.float32)
+    return np.vstack([embedder.embed(texts[start:start + batch_size]) for start in range(0, len(texts), batch_size)])
+
+def top_k_cosine(matrix: np.ndarray, query: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+    """Exact top-k by cosine similarity; returns (row indexes, scores) best first."""
+    if len(matrix) == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+    query = query / (np.linalg.norm(query) or 1.0)
+    scores = _normalize_rows(matrix) @ query
+    k = min(k, len(scores))
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    order = candidates[np.argsort(-scores[candidates], kind="stable")]
+    return order, scores[order]
@@ -0,0 +1,105 @@
+import asyncio
+import json
+import logging
+import threading
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from app.core.config import settings
+
+EVENT_BUS_BACKEND = settings.event_bus_backend
+EVENT_BUS_QUEUE_SIZE = settings.event_bus_queue_size
+REDIS_URL = settings.redis_url
+
+logger = logging.getLogger(__name__)
+
+def _offer(queue: asyncio.Queue, event: dict):
+    try:
+        queue.put_nowait(event)
+    except asyncio.QueueFull:
+        # A subscriber that cannot keep up loses events rather than stalling publishers.
+        logger.warning("Dropping event for slow subscriber")
+
+class MemoryEventBus:
+    def __init__(self, queue_size: int = EVENT_BUS_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._subscribers: dict[str, set] = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def publish(self, channel: str, event: dict):
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(_offer, queue, event)
+            except RuntimeError:
+                pass
+
+    @asynccontextmanager
+    async def subscribe(self, channel: str):
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        entry = (asyncio.get_running_loop(), queue)
+        with self._lock:
+            self._subscribers[channel].add(entry)
+
+        async def events():
+            while True:
+                yield await queue.get()
+
+        try:
+            yield events()
+        finally:
+            with self._lock:
+                self._subscribers[channel].discard(entry)
+                if not self._subscribers[channel]:
+                    del self._subscribers[channel]
+
+class RedisEventBus:
+    prefix = "events:"
+
+    def __init__(self, url: str):
+        import redis
+        self.url = url
+        self._publisher = redis.Redis.from_url(url)
+
+    def publish(self, channel: str, event: dict):
+        self._publisher.publish(self.prefix + channel, json.dumps(event))
+
+    @asynccontextmanager
+    async def subscribe(self, channel: str):
+        import redis.asyncio
+        client = redis.asyncio.Redis.from_url(self.url)
+        pubsub = client.pubsub()
+        await pubsub.subscribe(self.prefix + channel)
+
+        async def events():
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    yield json.loads(message["data"])
+
+        try:
+            yield events()
+        finally:
+            await pubsub.unsubscribe()
+            await pubsub.close()
+            await client.close()
+
+def _build_bus():
+    if EVENT_BUS_BACKEND == "redis":
+        if not REDIS_URL:
+            raise RuntimeError("EVENT_BUS_BACKEND=redis requires REDIS_URL")
+        return RedisEventBus(REDIS_URL)
+    return MemoryEventBus()
+
+bus = _build_bus()
+
+def user_channel(user_id: int) -> str:
+    return f"user:{user_id}"
+
+def publish_to_user(user_id: int | None, event: dict):
+    if user_id is None:
+        return
+    try:
+        bus.publish(user_channel(user_id), event)
+    except Exception:
+        # Notifications are best effort; the write they describe has already committed.
+        logger.exception("Failed to publish %s event", event.get("event"))
@@ -0,0 +1,97 @@
+import asyncio
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from app.core import security
+from app.core.config import settings
+
+# 0 workers runs bcrypt on a small thread pool instead of separate processes.
+PASSWORD_HASH_WORKERS = settings.password_hash_workers
+PASSWORD_HASH_QUEUE_SIZE = settings.password_hash_queue_size
+PASSWORD_HASH_RETRY_AFTER_SECONDS = settings.password_hash_retry_after_seconds
+
+class HasherBusyError(Exception):
+    def __init__(self, retry_after: int = PASSWORD_HASH_RETRY_AFTER_SECONDS):
+        super().__init__("Password hashing queue is full")
+        self.retry_after = retry_after
+
+_executor: Executor | None = None
+_lock = threading.Lock()
+_in_flight = 0
+
+def get_executor() -> Executor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            if PASSWORD_HASH_WORKERS > 0:
+                _executor = ProcessPoolExecutor(max_workers=PASSWORD_HASH_WORKERS)
+            else:
+                _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bcrypt")
+        return _executor
+
+def shutdown():
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+_dummy_hash: str | None = None
+
+async def dummy_hash() -> str:
+    global _dummy_hash
+    if _dummy_hash is None:
+        _dummy_hash = await _submit(security.hash_password, security.DUMMY_PASSWORD)
+    return _dummy_hash
+
+async def prewarm():
+    # Starts every worker and runs one hash in each, so the first logins skip process start-up.
+    executor = get_executor()
+    await asyncio.gather(*(
+        asyncio.wrap_future(executor.submit(security.hash_password, "prewarm"))
+        for _ in range(max(PASSWORD_HASH_WORKERS, 1))
+    ))
+    await dummy_hash()
+
+def in_flight() -> int:
+    return _in_flight
+
+def _release(_future):
+    global _in_flight
+    with _lock:
+        _in_flight -= 1
+
+def _submit(fn, *args):
+    global _in_flight
+    executor = get_executor()
+    with _lock:
+        if _in_flight >= PASSWORD_HASH_QUEUE_SIZE:
+            raise HasherBusyError()
+        _in_flight += 1
+    try:
+        future = executor.submit(fn, *args)
+    except Exception:
+        _release(None)
+        raise
+    future.add_done_callback(_release)
+    return asyncio.wrap_future(future)
+
+async def hash_password(password: str) -> str:
+    return await _submit(security.hash_password, password)
+
+async def hash_passwords(passwords: list[str]) -> list[str]:
+    """Bulk hashing for provisioning. Every hash goes through the admission queue, at most two
+    per worker at a time, so logins still interleave with a large import; a full queue raises
+    HasherBusyError like any other caller."""
+    window = asyncio.Semaphore(max(1, min(2 * max(PASSWORD_HASH_WORKERS, 1), PASSWORD_HASH_QUEUE_SIZE)))
+
+    async def one(password: str) -> str:
+        async with window:
+            return await _submit(security.hash_password, password)
+
+    return await asyncio.gather(*(one(password) for password in passwords))
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await _submit(security.verify_password, plain_password, hashed_password)
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    return await _submit(security.verify_and_update_password, plain_password, hashed_password)
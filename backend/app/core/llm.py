@@ -0,0 +1,50 @@
+import re
+from app.core.config import settings
+
+LLM_CLIENT = settings.llm_client
+LLM_API_URL = settings.llm_api_url
+LLM_API_KEY = settings.llm_api_key
+LLM_MODEL = settings.llm_model
+LLM_TIMEOUT_SECONDS = settings.llm_timeout_seconds
+
+_SENTENCE = re.compile(r"(?<=[.!?])\s+")
+
+class StubLLMClient:
+    """Local stand-in: "summarizes" by keeping the first sentence of the input."""
+
+    model = "stub"
+
+    def __init__(self):
+        self.calls = 0
+
+    async def complete(self, prompt: str) -> str:
+        self.calls += 1
+        text = prompt.split("\n\n", 1)[-1].strip()
+        return _SENTENCE.split(text, 1)[0][:500]
+
+class HTTPLLMClient:
+    """Any OpenAI-compatible /chat/completions endpoint."""
+
+    def __init__(self, url: str = LLM_API_URL, api_key: str | None = LLM_API_KEY, model: str = LLM_MODEL):
+        self.url = url
+        self.model = model
+        self.headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+
+    async def complete(self, prompt: str) -> str:
+        import httpx
+        # A client per call keeps this usable from the short-lived event loops Celery tasks run.
+        async with httpx.AsyncClient(headers=self.headers, timeout=LLM_TIMEOUT_SECONDS) as client:
+            resp = await client.post(self.url, json={
+                "model": self.model,
+                "messages": [{"role": "user", "content": prompt}]
+            })
+        resp.raise_for_status()
+        return resp.json()["choices"][0]["message"]["content"].strip()
+
+_client = None
+
+def get_llm_client():
+    global _client
+    if _client is None:
+        _client = HTTPLLMClient() if LLM_CLIENT == "http" else StubLLMClient()
+    return _client
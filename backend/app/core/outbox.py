@@ -0,0 +1,148 @@
+"""Transactional outbox.
+
+Writes record their side effects (cache invalidation, notifications, follow-up
+tasks) as outbox rows in the same transaction as the change, so a side effect
+exists if and only if the change committed. The relay delivers rows to the
+subscribers of their topic in batches and marks them published only once every
+subscriber succeeded; a failure leaves the batch for a later pass, so delivery
+is at least once and subscribers must be idempotent.
+"""
+import asyncio
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import delete, event, func, select
+from sqlalchemy.orm import Session
+from app.core import profiling
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.outbox import OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_BATCH_SIZE = settings.outbox_batch_size
+OUTBOX_BACKOFF_SECONDS = settings.outbox_backoff_seconds
+OUTBOX_RETENTION_HOURS = settings.outbox_retention_hours
+OUTBOX_RELAY_EAGER = settings.outbox_relay_eager
+OUTBOX_RELAY_INTERVAL_SECONDS = settings.outbox_relay_interval_seconds
+
+MAX_BACKOFF_SECONDS = 300
+
+# Swapped by tests so eager relays use the test database.
+session_factory = SessionLocal
+
+SUBSCRIBERS = defaultdict(list)
+
+def subscriber(topic: str):
+    """Register fn(payloads) for a topic; it gets every payload of the topic in a batch, oldest first."""
+    def register(fn):
+        SUBSCRIBERS[topic].append(fn)
+        return fn
+    return register
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+def record(db: Session, topic: str, payload: dict) -> OutboxEvent:
+    """Add an event to db's transaction; it is relayed only if that transaction commits."""
+    outbox_event = OutboxEvent(topic=topic, payload=payload)
+    db.add(outbox_event)
+    db.info["outbox_pending"] = True
+    return outbox_event
+
+def _backoff(attempts: int) -> float:
+    return min(MAX_BACKOFF_SECONDS, OUTBOX_BACKOFF_SECONDS * 2 ** (attempts - 1))
+
+def relay(db: Session, limit: int = OUTBOX_BATCH_SIZE) -> int:
+    """Deliver one batch of due events and commit; returns how many were claimed."""
+    now = _now()
+    # SKIP LOCKED lets several relays drain the outbox without delivering a row twice at once.
+    batch = list(db.scalars(
+        select(OutboxEvent)
+        .where(OutboxEvent.published_at.is_(None), OutboxEvent.available_at <= now)
+        .order_by(OutboxEvent.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    ))
+    by_topic = defaultdict(list)
+    for outbox_event in batch:
+        by_topic[outbox_event.topic].append(outbox_event)
+
+    for topic, topic_events in by_topic.items():
+        try:
+            for fn in SUBSCRIBERS.get(topic, ()):
+                fn([outbox_event.payload for outbox_event in topic_events])
+        except Exception as exc:
+            logger.exception("Delivery of %d %s events failed", len(topic_events), topic)
+            for outbox_event in topic_events:
+                outbox_event.attempts += 1
+                outbox_event.last_error = repr(exc)
+                outbox_event.available_at = now + timedelta(seconds=_backoff(outbox_event.attempts))
+            continue
+        for outbox_event in topic_events:
+            outbox_event.published_at = now
+    db.commit()
+    return len(batch)
+
+def drain(db: Session, limit: int = OUTBOX_BATCH_SIZE) -> int:
+    """Relay batches until a batch comes back short; returns how many events were claimed."""
+    claimed = 0
+    while True:
+        count = relay(db, limit)
+        claimed += count
+        if count < limit:
+            return claimed
+
+def purge(db: Session) -> int:
+    """Delete events published longer ago than the retention window."""
+    cutoff = _now() - timedelta(hours=OUTBOX_RETENTION_HOURS)
+    result = db.execute(delete(OutboxEvent).where(OutboxEvent.published_at < cutoff))
+    db.commit()
+    return result.rowcount
+
+def stats(db: Session) -> dict:
+    """Backlog figures; a growing backlog or failing count means a derived store is behind."""
+    pending, failing, oldest = db.execute(
+        select(
+            func.count(OutboxEvent.id),
+            func.count(OutboxEvent.id).filter(OutboxEvent.attempts > 0),
+            func.min(OutboxEvent.created_at),
+        ).where(OutboxEvent.published_at.is_(None))
+    ).one()
+    if oldest is not None and oldest.tzinfo is None:
+        oldest = oldest.replace(tzinfo=timezone.utc)
+    return {
+        "pending": pending,
+        "failing": failing,
+        "oldest_pending_seconds": (_now() - oldest).total_seconds() if oldest is not None else 0.0,
+    }
+
+def _relay_pass(purge_published: bool = False):
+    with profiling.detached(), session_factory() as db:
+        drain(db)
+        if purge_published:
+            purge(db)
+
+async def relay_forever():
+    """Relay and purge every OUTBOX_RELAY_INTERVAL_SECONDS until cancelled; the API
+    runs this in place of beat when subscribers only reach its own process."""
+    while True:
+        try:
+            await asyncio.to_thread(_relay_pass, True)
+        except Exception:
+            logger.exception("Outbox relay pass failed")
+        await asyncio.sleep(OUTBOX_RELAY_INTERVAL_SECONDS)
+
+@event.listens_for(Session, "after_commit")
+def _relay_committed_events(session):
+    if not session.info.pop("outbox_pending", False) or not OUTBOX_RELAY_EAGER:
+        return
+    try:
+        _relay_pass()
+    except Exception:
+        # The events are committed; beat relays them if this pass could not.
+        logger.exception("Eager outbox relay failed")
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_flag(session):
+    session.info.pop("outbox_pending", None)
@@ -0,0 +1,19 @@
+import base64
+import json
+
+class InvalidCursorError(ValueError):
+    pass
+
+def encode_cursor(**position) -> str:
+    raw = json.dumps(position, separators=(",", ":"), sort_keys=True).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> dict:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursorError("Invalid cursor") from exc
+    if not isinstance(position, dict):
+        raise InvalidCursorError("Invalid cursor")
+    return position
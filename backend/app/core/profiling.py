@@ -0,0 +1,145 @@
+import json
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+
+SQL_PROFILING_ENABLED = settings.sql_profiling_enabled
+SQL_N_PLUS_ONE_THRESHOLD = settings.sql_n_plus_one_threshold
+
+logger = logging.getLogger("app.sql")
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    total_seconds: float = 0.0
+    slowest_seconds: float = 0.0
+    slowest_statement: str | None = None
+    statements: Counter = field(default_factory=Counter)
+
+    def record(self, statement: str, elapsed: float):
+        self.count += 1
+        self.total_seconds += elapsed
+        if elapsed >= self.slowest_seconds:
+            self.slowest_seconds = elapsed
+            self.slowest_statement = statement
+        self.statements[_normalize(statement)] += 1
+
+    def repeated_statements(self, threshold: int = SQL_N_PLUS_ONE_THRESHOLD) -> dict[str, int]:
+        return {sql: n for sql, n in self.statements.items() if n >= threshold}
+
+_NUMBER = re.compile(r"\b\d+\b")
+_WHITESPACE = re.compile(r"\s+")
+
+def _normalize(statement: str) -> str:
+    return _WHITESPACE.sub(" ", _NUMBER.sub("?", statement)).strip()
+
+_request_stats: ContextVar[QueryStats | None] = ContextVar("request_query_stats", default=None)
+_detached: ContextVar[bool] = ContextVar("query_stats_detached", default=False)
+_captures: list[QueryStats] = []
+_captures_lock = threading.Lock()
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+    if _detached.get():
+        return
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+    if _captures:
+        with _captures_lock:
+            for captured in _captures:
+                captured.record(statement, elapsed)
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start_time"):
+        conn.info["query_start_time"].pop()
+
+@contextmanager
+def capture():
+    stats = QueryStats()
+    with _captures_lock:
+        _captures.append(stats)
+    try:
+        yield stats
+    finally:
+        with _captures_lock:
+            _captures.remove(stats)
+
+@contextmanager
+def detached():
+    # Background work that happens to run inline (eager Celery tasks) is not charged to the request.
+    token = _detached.set(True)
+    try:
+        yield
+    finally:
+        _detached.reset(token)
+
+def server_timing(stats: QueryStats, app_seconds: float) -> str:
+    return (
+        f'db;dur={stats.total_seconds * 1000:.2f};desc="{stats.count} queries", '
+        f"db-slowest;dur={stats.slowest_seconds * 1000:.2f}, "
+        f"app;dur={app_seconds * 1000:.2f}"
+    )
+
+class QueryProfilerMiddleware:
+    def __init__(self, app, enabled: bool = SQL_PROFILING_ENABLED):
+        self.app = app
+        self.enabled = enabled
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _request_stats.set(stats)
+        started = time.perf_counter()
+        status_code = None
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", server_timing(stats, time.perf_counter() - started).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_stats.reset(token)
+            _log_request(scope, status_code, stats, time.perf_counter() - started)
+
+def _log_request(scope, status_code, stats: QueryStats, elapsed: float):
+    repeated = stats.repeated_statements()
+    record = {
+        "method": scope["method"],
+        "path": scope["path"],
+        "status": status_code,
+        "duration_ms": round(elapsed * 1000, 2),
+        "query_count": stats.count,
+        "db_ms": round(stats.total_seconds * 1000, 2),
+        "slowest_ms": round(stats.slowest_seconds * 1000, 2),
+        "slowest_sql": stats.slowest_statement,
+    }
+    if repeated:
+        record["n_plus_one"] = repeated
+        logger.warning(json.dumps(record))
+    else:
+        logger.info(json.dumps(record))
@@ -0,0 +1,132 @@
+import math
+import threading
+import time
+from dataclasses import dataclass
+from fastapi import Request
+from app.core.cache import LRUCache
+from app.core.config import settings
+
+RATE_LIMIT_ENABLED = settings.rate_limit_enabled
+RATE_LIMIT_BACKEND = settings.rate_limit_backend
+REDIS_URL = settings.redis_url
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+@dataclass(frozen=True)
+class Rate:
+    capacity: int
+    refill_per_second: float
+
+def parse_rate(rate: str) -> Rate:
+    """"5/minute" is a bucket of 5 that refills completely over a minute."""
+    count, _, period = rate.partition("/")
+    seconds = _PERIODS.get(period.strip().rstrip("s"))
+    if seconds is None or int(count) < 1:
+        raise ValueError(f"Invalid rate {rate!r}; expected e.g. '5/minute'")
+    return Rate(capacity=int(count), refill_per_second=int(count) / seconds)
+
+class RateLimitExceeded(Exception):
+    def __init__(self, retry_after: float):
+        super().__init__("Rate limit exceeded")
+        self.retry_after = max(1, math.ceil(retry_after))
+
+class MemoryRateLimitBackend:
+    def __init__(self, max_entries: int = 100000):
+        self._buckets = LRUCache(max_entries=max_entries)
+        self._lock = threading.Lock()
+
+    def take(self, key: str, rate: Rate, now: float | None = None) -> float:
+        """Spend one token; returns 0 if allowed, otherwise seconds until a token is available."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (rate.capacity, now))
+            tokens = min(rate.capacity, tokens + (now - updated_at) * rate.refill_per_second)
+            if tokens >= 1:
+                self._buckets.set(key, (tokens - 1, now))
+                return 0.0
+            self._buckets.set(key, (tokens, now))
+            return (1 - tokens) / rate.refill_per_second
+
+    # The dependency and /token are async; an in-process bucket never blocks the loop.
+    async def atake(self, key: str, rate: Rate) -> float:
+        return self.take(key, rate)
+
+    def clear(self):
+        self._buckets.clear()
+
+# Refill and spend in one round trip so concurrent app instances share a bucket exactly.
+_TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + (now - ts) * rate)
+local retry = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    retry = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return tostring(retry)
+"""
+
+class RedisRateLimitBackend:
+    """take() for sync callers; the request path uses atake(), which runs the script
+    through redis.asyncio so a throttled route never blocks the event loop."""
+
+    prefix = "ratelimit:"
+
+    def __init__(self, url: str | None = None, client=None, async_client=None):
+        if client is None:
+            import redis
+            client = redis.Redis.from_url(url)
+        if async_client is None and url is not None:
+            import redis.asyncio
+            async_client = redis.asyncio.Redis.from_url(url)
+        self._client = client
+        self._script = client.register_script(_TOKEN_BUCKET_LUA)
+        self._async_script = async_client.register_script(_TOKEN_BUCKET_LUA) if async_client is not None else None
+
+    def take(self, key: str, rate: Rate) -> float:
+        return float(self._script(keys=[self.prefix + key], args=[rate.capacity, rate.refill_per_second]))
+
+    async def atake(self, key: str, rate: Rate) -> float:
+        return float(await self._async_script(keys=[self.prefix + key], args=[rate.capacity, rate.refill_per_second]))
+
+    def clear(self):
+        for key in self._client.scan_iter(match=self.prefix + "*"):
+            self._client.delete(key)
+
+def _build_backend():
+    if RATE_LIMIT_BACKEND == "redis":
+        if not REDIS_URL:
+            raise RuntimeError("RATE_LIMIT_BACKEND=redis requires REDIS_URL")
+        return RedisRateLimitBackend(REDIS_URL)
+    return MemoryRateLimitBackend()
+
+backend = _build_backend()
+
+async def hit(scope: str, identity: str, rate: Rate):
+    if not RATE_LIMIT_ENABLED:
+        return
+    retry_after = await backend.atake(f"{scope}:{identity}", rate)
+    if retry_after > 0:
+        raise RateLimitExceeded(retry_after)
+
+def client_ip(request: Request) -> str:
+    # Behind a proxy, run uvicorn with --proxy-headers so this is the real client.
+    return request.client.host if request.client else "unknown"
+
+class RateLimit:
+    """Dependency limiting each client IP per route, e.g. Depends(RateLimit("5/minute"))."""
+
+    def __init__(self, rate: str):
+        self.rate = parse_rate(rate)
+
+    async def __call__(self, request: Request):
+        await hit(f"route:{request.url.path}", client_ip(request), self.rate)
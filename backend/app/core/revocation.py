@@ -0,0 +1,231 @@
+import hashlib
+import math
+import threading
+import time
+from app.core.cache import LRUCache
+from app.core.config import settings
+
+REVOCATION_BACKEND = settings.revocation_backend
+REVOCATION_CAPACITY = settings.revocation_capacity
+REVOCATION_ERROR_RATE = settings.revocation_error_rate
+REVOCATION_SYNC_SECONDS = settings.revocation_sync_seconds
+REDIS_URL = settings.redis_url
+
+class BloomFilter:
+    """Set membership with no false negatives; a miss means the item was never added."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        capacity = max(1, capacity)
+        self.size = max(64, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, item: str):
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+_stats_lock = threading.Lock()
+_stats = {"checks": 0, "bloom_skips": 0, "confirmed": 0}
+
+def _count(name: str):
+    with _stats_lock:
+        _stats[name] += 1
+
+# Rotation never drops a live session to make room: a session is forgotten only
+# once it expires or is revoked.
+#
+# The memory store lives in one process and forgets everything on restart, so a
+# session it does not know is refused: adopting it would revive revoked and
+# rotated-away tokens after a restart, and let a replayed token through on a
+# worker that never saw the session. Running more than one worker therefore
+# needs REVOCATION_BACKEND=redis (see check_deployment). The Redis store keeps
+# the revoked set durably, so it adopts a session whose key expired or was lost.
+
+class MemoryRevocationStore:
+    def __init__(self, capacity: int = REVOCATION_CAPACITY, error_rate: float = REVOCATION_ERROR_RATE):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._sessions: dict[str, tuple[int, float]] = {}
+        self._revoked: dict[str, float] = {}
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._lock = threading.Lock()
+
+    def _set_session(self, session_id: str, generation: int, ttl_seconds: float):
+        now = time.time()
+        self._sessions[session_id] = (generation, now + ttl_seconds)
+        if len(self._sessions) > self.capacity:
+            self._sessions = {sid: entry for sid, entry in self._sessions.items() if entry[1] > now}
+
+    async def start(self, session_id: str, ttl_seconds: float):
+        with self._lock:
+            self._set_session(session_id, 0, ttl_seconds)
+
+    async def rotate(self, session_id: str, generation: int, ttl_seconds: float) -> bool:
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None or entry[1] <= time.time() or entry[0] != generation:
+                return False
+            self._set_session(session_id, generation + 1, ttl_seconds)
+            return True
+
+    async def revoke(self, session_id: str, ttl_seconds: float):
+        now = time.time()
+        with self._lock:
+            self._sessions.pop(session_id, None)
+            self._revoked[session_id] = now + ttl_seconds
+            if len(self._revoked) > self.capacity:
+                # Bloom filters cannot forget, so drop expired entries by rebuilding.
+                self._revoked = {sid: exp for sid, exp in self._revoked.items() if exp > now}
+                self._bloom = BloomFilter(max(self.capacity, 2 * len(self._revoked)), self.error_rate)
+                for sid in self._revoked:
+                    self._bloom.add(sid)
+            else:
+                self._bloom.add(session_id)
+
+    async def is_revoked(self, session_id: str) -> bool:
+        if session_id not in self._bloom:
+            _count("bloom_skips")
+            return False
+        _count("confirmed")
+        return self._revoked.get(session_id, 0) > time.time()
+
+    async def clear(self):
+        with self._lock:
+            self._sessions.clear()
+            self._revoked.clear()
+            self._bloom = BloomFilter(self.capacity, self.error_rate)
+
+# Compare-and-increment, so two refreshes racing with one token cannot both win.
+# A missing key is adopted at the token's generation.
+_ROTATE_LUA = """
+local current = redis.call('GET', KEYS[1])
+if current and tonumber(current) ~= tonumber(ARGV[1]) then
+    return 0
+end
+redis.call('SET', KEYS[1], tonumber(ARGV[1]) + 1, 'PX', ARGV[2])
+return 1
+"""
+
+class RedisRevocationStore:
+    """Sessions and revocations live in Redis; each process keeps a Bloom filter of the
+    revoked set, rebuilt every sync_seconds, so valid tokens are checked without a round trip.
+    A revocation made by another process is therefore seen within sync_seconds.
+    Uses redis.asyncio, since every caller is a request handler."""
+
+    prefix = "revocation:"
+
+    def __init__(self, url: str | None = None, client=None, capacity: int = REVOCATION_CAPACITY,
+                 error_rate: float = REVOCATION_ERROR_RATE, sync_seconds: float = REVOCATION_SYNC_SECONDS):
+        if client is None:
+            import redis.asyncio
+            client = redis.asyncio.Redis.from_url(url)
+        self._client = client
+        self._rotate = client.register_script(_ROTATE_LUA)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_seconds = sync_seconds
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._synced_at = float("-inf")
+
+    @property
+    def _revoked_key(self) -> str:
+        return self.prefix + "revoked"
+
+    def _session_key(self, session_id: str) -> str:
+        return self.prefix + "session:" + session_id
+
+    async def start(self, session_id: str, ttl_seconds: float):
+        await self._client.set(self._session_key(session_id), 0, px=math.ceil(ttl_seconds * 1000))
+
+    async def rotate(self, session_id: str, generation: int, ttl_seconds: float) -> bool:
+        return bool(await self._rotate(keys=[self._session_key(session_id)], args=[generation, math.ceil(ttl_seconds * 1000)]))
+
+    async def revoke(self, session_id: str, ttl_seconds: float):
+        pipe = self._client.pipeline()
+        pipe.delete(self._session_key(session_id))
+        pipe.zadd(self._revoked_key, {session_id: time.time() + ttl_seconds})
+        await pipe.execute()
+        self._bloom.add(session_id)
+
+    async def _sync(self):
+        # Claimed before the first await, so concurrent requests do not all rebuild.
+        if time.monotonic() - self._synced_at < self.sync_seconds:
+            return
+        self._synced_at = time.monotonic()
+        pipe = self._client.pipeline()
+        pipe.zremrangebyscore(self._revoked_key, "-inf", time.time())
+        pipe.zrange(self._revoked_key, 0, -1)
+        _, members = await pipe.execute()
+        bloom = BloomFilter(max(self.capacity, 2 * len(members)), self.error_rate)
+        for member in members:
+            bloom.add(member.decode() if isinstance(member, bytes) else member)
+        self._bloom = bloom
+
+    async def is_revoked(self, session_id: str) -> bool:
+        await self._sync()
+        if session_id not in self._bloom:
+            _count("bloom_skips")
+            return False
+        _count("confirmed")
+        expires_at = await self._client.zscore(self._revoked_key, session_id)
+        return expires_at is not None and expires_at > time.time()
+
+    async def clear(self):
+        keys = [key async for key in self._client.scan_iter(match=self.prefix + "*")]
+        if keys:
+            await self._client.delete(*keys)
+        self._bloom = BloomFilter(self.capacity, self.error_rate)
+        self._synced_at = float("-inf")
+
+def _build_backend():
+    if REVOCATION_BACKEND == "redis":
+        if not REDIS_URL:
+            raise RuntimeError("REVOCATION_BACKEND=redis requires REDIS_URL")
+        return RedisRevocationStore(REDIS_URL)
+    return MemoryRevocationStore()
+
+backend = _build_backend()
+
+async def start_session(session_id: str, ttl_seconds: float):
+    await backend.start(session_id, ttl_seconds)
+
+async def rotate(session_id: str, generation: int, ttl_seconds: float) -> bool:
+    """Advance the session to generation + 1; False if it is past `generation`, or unknown to the memory store."""
+    return await backend.rotate(session_id, generation, ttl_seconds)
+
+async def revoke(session_id: str, ttl_seconds: float):
+    await backend.revoke(session_id, ttl_seconds)
+
+async def is_revoked(session_id: str | None) -> bool:
+    # Tokens issued before sessions existed carry no sid and simply expire.
+    if session_id is None:
+        return False
+    _count("checks")
+    return await backend.is_revoked(session_id)
+
+async def reset():
+    await backend.clear()
+    with _stats_lock:
+        for name in _stats:
+            _stats[name] = 0
+
+def check_deployment(web_concurrency: int, backend_name: str = REVOCATION_BACKEND):
+    """Refuse to serve from several worker processes with per-process revocation state."""
+    if web_concurrency > 1 and backend_name == "memory":
+        raise RuntimeError(
+            f"WEB_CONCURRENCY={web_concurrency} needs REVOCATION_BACKEND=redis: with the memory "
+            "backend a logout or rotated refresh token is only seen by the worker that handled it"
+        )
+
+def stats() -> dict:
+    with _stats_lock:
+        return dict(_stats)
@@ -0,0 +1,142 @@
+import hashlib
+import random
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from app.core import cache
+from app.core.config import settings
+
+DATABASE_REPLICA_URLS = [url.strip() for url in settings.database_replica_urls.split(",") if url.strip()]
+REPLICA_STICKY_SECONDS = settings.replica_sticky_seconds
+REPLICA_STICKY_BACKEND = settings.replica_sticky_backend
+REDIS_URL = settings.redis_url
+
+@dataclass
+class RequestRouting:
+    client_key: str | None = None
+    pinned: bool = False
+    # Set by the commit hook; the middleware stores the pin, off the commit path.
+    pin_pending: bool = False
+
+_request_routing: ContextVar[RequestRouting | None] = ContextVar("request_routing", default=None)
+_force_primary: ContextVar[bool] = ContextVar("force_primary", default=False)
+
+_stats = Counter()
+_stats_lock = threading.Lock()
+
+def _count(target: str):
+    with _stats_lock:
+        _stats[target] += 1
+
+def stats() -> dict:
+    with _stats_lock:
+        return {"primary": _stats["primary"], "replica": _stats["replica"], "replicas_configured": len(DATABASE_REPLICA_URLS)}
+
+def reset_stats():
+    with _stats_lock:
+        _stats.clear()
+
+@contextmanager
+def use_primary():
+    token = _force_primary.set(True)
+    try:
+        yield
+    finally:
+        _force_primary.reset(token)
+
+def _pinned() -> bool:
+    if _force_primary.get():
+        return True
+    routing = _request_routing.get()
+    return routing is not None and routing.pinned
+
+def _is_read(clause) -> bool:
+    if isinstance(clause, Select):
+        return clause._for_update_arg is None
+    # Raw SQL cannot be told apart from a write, so read-only text() opts in.
+    return clause is not None and clause.get_execution_options().get("replica", False)
+
+class RoutingSession(Session):
+    """Sends plain SELECTs, and statements marked execution_options(replica=True),
+    to a replica and everything else to the primary.
+
+    Once a session writes, it stays on the primary so it reads its own changes.
+    A session sticks to one replica, so session-level settings (SET LOCAL) apply
+    to the statements that follow them.
+    """
+
+    def __init__(self, *args, primary=None, replicas=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.primary = primary
+        self.replicas = list(replicas)
+        self._replica = None
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self.primary is None:
+            return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+        if self._flushing or not _is_read(clause):
+            self.info["wrote"] = True
+        if not self.replicas or self.info.get("wrote") or _pinned():
+            _count("primary")
+            return self.primary
+        _count("replica")
+        if self._replica is None:
+            self._replica = random.choice(self.replicas)
+        return self._replica
+
+sticky_backend = cache.build_backend(REPLICA_STICKY_BACKEND, redis_url=REDIS_URL)
+
+@event.listens_for(RoutingSession, "after_commit")
+def _pin_client_after_write(session):
+    routing = _request_routing.get()
+    if routing is None or routing.client_key is None or not session.info.get("wrote"):
+        return
+    # Commit hooks run on the event loop for an AsyncSession, so only record the pin here.
+    routing.pinned = True
+    routing.pin_pending = True
+
+async def _store_pin(routing: RequestRouting):
+    if routing.pin_pending:
+        routing.pin_pending = False
+        await sticky_backend.aset(routing.client_key, str(time.time()), ttl_seconds=REPLICA_STICKY_SECONDS)
+
+def client_key(scope) -> str | None:
+    for name, value in scope.get("headers", []):
+        if name == b"authorization":
+            return "sticky:" + hashlib.sha256(value).hexdigest()
+    client = scope.get("client")
+    return f"sticky:ip:{client[0]}" if client else None
+
+class ReadYourWritesMiddleware:
+    """Pins a client to the primary for REPLICA_STICKY_SECONDS after one of its requests commits a write."""
+
+    def __init__(self, app, enabled: bool = bool(DATABASE_REPLICA_URLS)):
+        self.app = app
+        self.enabled = enabled
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket") or not self.enabled:
+            await self.app(scope, receive, send)
+            return
+        key = client_key(scope)
+        routing = RequestRouting(client_key=key, pinned=key is not None and await sticky_backend.aget(key) is not None)
+        token = _request_routing.set(routing)
+
+        async def send_after_pin(message):
+            # Stored before the response goes out, so the client's next request already reads the primary.
+            if message["type"] == "http.response.start":
+                await _store_pin(routing)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_after_pin)
+        finally:
+            _request_routing.reset(token)
+            # Writes committed after the response started (or on a websocket) pin the next request.
+            await _store_pin(routing)
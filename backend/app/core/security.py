@@ -1,17 +1,18 @@
 from passlib.context import CryptContext
 from jose import jwt, JWTError
 from datetime import datetime, timedelta
-from dotenv import load_dotenv
-import os
+from functools import lru_cache
 from fastapi.security import OAuth2PasswordBearer
+from app.core.config import settings
 
-load_dotenv()
+BCRYPT_ROUNDS = settings.bcrypt_rounds
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=12)
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
 
-SECRET_KEY = os.getenv("SECRET_KEY", "change-this-in-prod")
-ALGORITHM = os.getenv("ALGORITHM", "HS256")
-ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
+SECRET_KEY = settings.secret_key
+ALGORITHM = settings.algorithm
+ACCESS_TOKEN_EXPIRE_MINUTES = settings.access_token_expire_minutes
+REFRESH_TOKEN_EXPIRE_DAYS = settings.refresh_token_expire_days
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
@@ -21,6 +22,16 @@ def hash_password(password: str) -> str:
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
+# Verified against for unknown usernames so they cost the same as a wrong password.
+DUMMY_PASSWORD = "dummy-password-for-timing"
+
+@lru_cache(maxsize=1)
+def dummy_hash() -> str:
+    return hash_password(DUMMY_PASSWORD)
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
 def create_access_token(data: dict, expires_delta: timedelta = None) -> str:
     to_encode = data.copy()
     if expires_delta:
@@ -38,4 +49,14 @@ def decode_access_token(token: str):
     except JWTError:
         return None
 
- 
\ No newline at end of file
+def create_refresh_token(username: str, session_id: str, generation: int, expires_delta: timedelta = None) -> str:
+    """Long-lived token for one login session; `gen` lets the server spot a token being reused."""
+    expire = datetime.utcnow() + (expires_delta or timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS))
+    to_encode = {"sub": username, "sid": session_id, "gen": generation, "type": "refresh", "exp": expire}
+    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+
+def decode_refresh_token(token: str):
+    payload = decode_access_token(token)
+    if payload is None or payload.get("type") != "refresh" or "sid" not in payload or "gen" not in payload:
+        return None
+    return payload
@@ -0,0 +1,45 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from sqlalchemy import Column, ForeignKey, Integer, event
+from sqlalchemy.orm import Session, declared_attr, with_loader_criteria
+
+_current_org_id: ContextVar[int | None] = ContextVar("current_org_id", default=None)
+
+class TenantScoped:
+    """Mixin for tables that belong to an organization; ORM reads are filtered to the current org."""
+
+    @declared_attr
+    def org_id(cls):
+        return Column(Integer, ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False)
+
+def current_org_id() -> int | None:
+    return _current_org_id.get()
+
+def set_current_org(org_id: int | None):
+    return _current_org_id.set(org_id)
+
+def reset_current_org(token):
+    _current_org_id.reset(token)
+
+@contextmanager
+def scoped_to(org_id: int | None):
+    token = _current_org_id.set(org_id)
+    try:
+        yield
+    finally:
+        _current_org_id.reset(token)
+
+@event.listens_for(Session, "do_orm_execute")
+def _filter_by_tenant(state):
+    org_id = _current_org_id.get()
+    if (
+        org_id is None
+        or not state.is_select
+        or state.is_column_load
+        or state.is_relationship_load
+        or state.execution_options.get("all_tenants", False)
+    ):
+        return
+    state.statement = state.statement.options(
+        with_loader_criteria(TenantScoped, lambda cls: cls.org_id == org_id, include_aliases=True)
+    )
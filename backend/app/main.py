@@ -1,27 +1,91 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager, suppress
+from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from app.core import database
-from app.api import users, auth, items
-
-app = FastAPI(
-    title="Backend API",
-    version="1.0.0",
-    description="API for the backend service",
-    docs_url="/docs"
-)
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["http://localhost:3000", "http://localhost:8000"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-app.include_router(users.router)
-app.include_router(auth.auth_router)
-app.include_router(items.router)
-
-@app.get("/")
-def root():
-    return {"message": "Backend API", "version": "1.0.0"}
\ No newline at end of file
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import Session
+from app.core import database, auth_cache, hashing, outbox, profiling, rate_limit, revocation, routing
+from app.core.config import Settings, settings
+from app.api import users, auth, items, jobs, connectors, ws
+from app.workers import subscribers  # registers the outbox subscribers for relays in this process
+
+def hasher_busy_handler(request: Request, exc: hashing.HasherBusyError):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server is busy, please retry"},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
+def rate_limited_handler(request: Request, exc: rate_limit.RateLimitExceeded):
+    return JSONResponse(
+        status_code=429,
+        content={"detail": "Too many requests, please retry later"},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
+def create_app(app_settings: Settings = settings) -> FastAPI:
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        revocation.check_deployment(app_settings.web_concurrency, app_settings.revocation_backend)
+        subscribers.check_deployment(app_settings.web_concurrency)
+        database.init_engines()
+        if app_settings.database_prewarm:
+            await database.prewarm_pool(app_settings.database_pool_size)
+        if app_settings.password_hash_prewarm:
+            await hashing.prewarm()
+        relay = asyncio.create_task(outbox.relay_forever()) if subscribers.relays_in_api() else None
+        yield
+        if relay is not None:
+            relay.cancel()
+            with suppress(asyncio.CancelledError):
+                await relay
+        hashing.shutdown()
+        await database.dispose_engines()
+
+    app = FastAPI(
+        title="Backend API",
+        version="1.0.0",
+        description="API for the backend service",
+        docs_url="/docs",
+        lifespan=lifespan
+    )
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=app_settings.allowed_hosts,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=["Server-Timing"],
+    )
+    app.add_middleware(routing.ReadYourWritesMiddleware)
+    app.add_middleware(profiling.QueryProfilerMiddleware)
+    app.add_exception_handler(hashing.HasherBusyError, hasher_busy_handler)
+    app.add_exception_handler(rate_limit.RateLimitExceeded, rate_limited_handler)
+
+    app.include_router(users.router)
+    app.include_router(auth.auth_router)
+    app.include_router(items.router)
+    app.include_router(jobs.router)
+    app.include_router(connectors.router)
+    app.include_router(ws.router)
+
+    @app.get("/")
+    def root():
+        return {"message": "Backend API", "version": "1.0.0"}
+
+    @app.get("/metrics/auth-cache")
+    def auth_cache_metrics():
+        return auth_cache.stats()
+
+    @app.get("/metrics/db-routing")
+    def db_routing_metrics():
+        return routing.stats()
+
+    @app.get("/metrics/outbox")
+    def outbox_metrics(db: Session = Depends(database.get_db)):
+        return outbox.stats(db)
+
+    return app
+
+app = create_app()
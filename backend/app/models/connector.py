@@ -0,0 +1,39 @@
+from app.core.database import Base
+from sqlalchemy import Column, Integer, String, DateTime, JSON, ForeignKey, UniqueConstraint, func
+from app.core.tenancy import TenantScoped
+
+class ConnectorSource(TenantScoped, Base):
+    """An external workspace whose records are mirrored into the owner's items."""
+
+    __tablename__ = "connector_sources"
+
+    id = Column(Integer, primary_key=True, index=True)
+    owner_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    kind = Column(String, nullable=False)
+    base_url = Column(String, nullable=False)
+    config = Column(JSON, nullable=True)
+    # Opaque position handed back by the connector; only records changed after it are listed.
+    cursor = Column(String, nullable=True)
+    last_synced_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    def __repr__(self):
+        return f"<ConnectorSource(id={self.id}, kind={self.kind}, owner_id={self.owner_id})>"
+
+class SourceRecord(Base):
+    """Which item mirrors which external record, and the hash of the content last written."""
+
+    __tablename__ = "source_records"
+    __table_args__ = (
+        UniqueConstraint("source_id", "external_id", name="uq_source_records_source_id_external_id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    source_id = Column(Integer, ForeignKey("connector_sources.id", ondelete="CASCADE"), nullable=False)
+    external_id = Column(String, nullable=False)
+    item_id = Column(Integer, ForeignKey("items.id", ondelete="CASCADE"), nullable=False, index=True)
+    content_hash = Column(String(64), nullable=False)
+    synced_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    def __repr__(self):
+        return f"<SourceRecord(source_id={self.source_id}, external_id={self.external_id}, item_id={self.item_id})>"
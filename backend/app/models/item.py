@@ -1,16 +1,57 @@
 from app.core.database import Base
-from sqlalchemy import Column, Integer, String, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, ForeignKey, Index, DDL, event
+from sqlalchemy.orm import relationship, deferred
+from app.core.embeddings import EMBEDDING_DIM
+from app.core.tenancy import TenantScoped
+from app.models.types import EmbeddingVector
 
-class Item(Base):
+class Item(TenantScoped, Base):
     __tablename__ = "items"
+    __table_args__ = (
+        Index("ix_items_org_id_owner_id_id", "org_id", "owner_id", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, index=True, nullable=False)
     description = Column(String, nullable=True)
     owner_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    version = Column(Integer, nullable=False, server_default="1")
+    # Deferred so ordinary item reads never pull the vector over the wire.
+    embedding = deferred(Column(EmbeddingVector(EMBEDDING_DIM), nullable=True))
     
     owner = relationship("User", back_populates="items")
+
+    __mapper_args__ = {"version_id_col": version}
     
     def __repr__(self):
-        return f"<Item(id={self.id}, title={self.title}, owner_id={self.owner_id})>" 
\ No newline at end of file
+        return f"<Item(id={self.id}, title={self.title}, owner_id={self.owner_id})>"
+
+# Search structures are dialect specific and not mapped on the model:
+# Postgres gets an HNSW index over the embedding and a generated tsvector
+# column with a GIN index, SQLite an FTS5 table kept in sync by triggers.
+# Queries live in item_service.search_items_async and embedding_service.
+SEARCH_DDL = {
+    "postgresql": [
+        "CREATE INDEX ix_items_embedding_hnsw ON items USING hnsw (embedding vector_cosine_ops)",
+        "ALTER TABLE items ADD COLUMN search_vector tsvector GENERATED ALWAYS AS "
+        "(to_tsvector('english', coalesce(title, '') || ' ' || coalesce(description, ''))) STORED",
+        "CREATE INDEX ix_items_search_vector ON items USING gin (search_vector)",
+    ],
+    "sqlite": [
+        "CREATE VIRTUAL TABLE items_fts USING fts5(title, description, content='items', content_rowid='id')",
+        "CREATE TRIGGER items_fts_insert AFTER INSERT ON items BEGIN "
+        "INSERT INTO items_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+        "CREATE TRIGGER items_fts_delete AFTER DELETE ON items BEGIN "
+        "INSERT INTO items_fts(items_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description); END",
+        "CREATE TRIGGER items_fts_update AFTER UPDATE ON items BEGIN "
+        "INSERT INTO items_fts(items_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description); "
+        "INSERT INTO items_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+    ],
+}
+
+for _dialect, _statements in SEARCH_DDL.items():
+    for _statement in _statements:
+        event.listen(Item.__table__, "after_create", DDL(_statement).execute_if(dialect=_dialect))
+
+event.listen(Item.__table__, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS vector").execute_if(dialect="postgresql"))
+event.listen(Item.__table__, "before_drop", DDL("DROP TABLE IF EXISTS items_fts").execute_if(dialect="sqlite"))
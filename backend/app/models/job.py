@@ -0,0 +1,29 @@
+from app.core.database import Base
+from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, ForeignKey, Index, func
+
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+class Job(Base):
+    __tablename__ = "jobs"
+    __table_args__ = (
+        Index("ix_jobs_user_id_id", "user_id", "id"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=True)
+    job_type = Column(String, nullable=False)
+    related_id = Column(Integer, nullable=True)
+    status = Column(String, nullable=False, default=JOB_PENDING, server_default=JOB_PENDING)
+    payload = Column(JSON, nullable=True)
+    result = Column(JSON, nullable=True)
+    error_message = Column(Text, nullable=True)
+    celery_task_id = Column(String, nullable=True)
+    queued_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    
+    def __repr__(self):
+        return f"<Job(id={self.id}, job_type={self.job_type}, status={self.status})>"
@@ -0,0 +1,15 @@
+from app.core.database import Base
+from sqlalchemy import Column, Integer, String, DateTime, func
+from sqlalchemy.orm import relationship
+
+class Organization(Base):
+    __tablename__ = "organizations"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    users = relationship("User", back_populates="organization")
+
+    def __repr__(self):
+        return f"<Organization(id={self.id}, name={self.name})>"
@@ -0,0 +1,28 @@
+from app.core.database import Base
+from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, Index, func, text
+
+class OutboxEvent(Base):
+    """A side effect of a committed write, stored in the write's own transaction until the relay delivers it."""
+
+    __tablename__ = "outbox_events"
+    __table_args__ = (
+        # Only undelivered rows are ever scanned, so the index stays small however long rows are retained.
+        Index(
+            "ix_outbox_events_pending", "id",
+            postgresql_where=text("published_at IS NULL"), sqlite_where=text("published_at IS NULL")
+        ),
+        Index("ix_outbox_events_published_at", "published_at"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    topic = Column(String, nullable=False)
+    payload = Column(JSON, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    # Not before this time; pushed back after each failed delivery.
+    available_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    published_at = Column(DateTime(timezone=True), nullable=True)
+    attempts = Column(Integer, nullable=False, server_default="0")
+    last_error = Column(Text, nullable=True)
+
+    def __repr__(self):
+        return f"<OutboxEvent(id={self.id}, topic={self.topic}, published_at={self.published_at})>"
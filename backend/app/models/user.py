@@ -1,17 +1,31 @@
 from app.core.database import Base
-from sqlalchemy import Column, Integer, String, Boolean
+from sqlalchemy import Column, Integer, String, Boolean, Index
 from sqlalchemy.orm import relationship
+from app.core.tenancy import TenantScoped
+from app.models.organization import Organization
 
-class User(Base):
+ROLE_MEMBER = "member"
+# Manages the organization's users, e.g. bulk provisioning.
+ROLE_ADMIN = "admin"
+
+class User(TenantScoped, Base):
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_org_id_id", "org_id", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     username = Column(String, unique=True, index=True, nullable=False)
     email = Column(String, unique=True, index=True, nullable=False)
     hashed_password = Column(String, nullable=False)
     is_active = Column(Boolean, default=True)
+    role = Column(String, nullable=False, default=ROLE_MEMBER, server_default=ROLE_MEMBER)
+    version = Column(Integer, nullable=False, server_default="1")
     
     items = relationship("Item", back_populates="owner")
+    organization = relationship(Organization, back_populates="users")
+
+    __mapper_args__ = {"version_id_col": version}
     
     def __repr__(self):
         return f"<User(id={self.id}, username={self.username}, email={self.email})>" 
\ No newline at end of file
@@ -0,0 +1,27 @@
+from datetime import datetime
+from typing import Any
+from pydantic import BaseModel, field_validator
+
+class ConnectorSourceCreate(BaseModel):
+    kind: str
+    base_url: str
+    # Connector options: token, rate_limit, concurrency and anything the kind reads.
+    config: dict[str, Any] | None = None
+
+    @field_validator("base_url")
+    @classmethod
+    def _http_url(cls, value: str) -> str:
+        if not value.startswith(("http://", "https://")):
+            raise ValueError("base_url must be an http(s) URL")
+        return value.rstrip("/")
+
+class ConnectorSourceRead(BaseModel):
+    # config is write-only: it can hold the source's API token.
+    id: int
+    kind: str
+    base_url: str
+    cursor: str | None = None
+    last_synced_at: datetime | None = None
+    created_at: datetime
+
+    model_config = {"from_attributes": True}
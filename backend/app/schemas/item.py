@@ -9,5 +9,33 @@ class ItemRead(BaseModel):
     title: str
     description: str | None = None
     owner_id: int
+    org_id: int | None = None
+    version: int = 1
 
-    model_config = {"from_attributes": True} 
\ No newline at end of file
+    model_config = {"from_attributes": True}
+
+class ItemPage(BaseModel):
+    items: list[ItemRead]
+    next_cursor: str | None = None
+
+class ItemBulkError(BaseModel):
+    index: int
+    detail: str | list
+
+class ItemBulkResult(BaseModel):
+    # One entry per input row, in order; null where the row is reported in errors.
+    created_ids: list[int | None]
+    errors: list[ItemBulkError]
+
+class ItemSearchHit(ItemRead):
+    rank: float
+
+class ItemSearchPage(BaseModel):
+    items: list[ItemSearchHit]
+    next_cursor: str | None = None
+
+class ItemSimilarHit(ItemRead):
+    score: float
+
+class ItemSimilarResult(BaseModel):
+    items: list[ItemSimilarHit]
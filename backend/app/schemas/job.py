@@ -0,0 +1,21 @@
+from datetime import datetime
+from typing import Any
+from pydantic import BaseModel
+
+class JobCreate(BaseModel):
+    job_type: str
+    related_id: int | None = None
+    payload: dict[str, Any] = {}
+
+class JobRead(BaseModel):
+    id: int
+    job_type: str
+    related_id: int | None = None
+    status: str
+    result: Any = None
+    error_message: str | None = None
+    queued_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+    model_config = {"from_attributes": True}
@@ -10,5 +10,28 @@ class UserRead(BaseModel):
     username: str
     email: EmailStr
     is_active: bool
+    org_id: int | None = None
+    role: str = "member"
+    version: int = 1
 
-    model_config = {"from_attributes": True} 
\ No newline at end of file
+    model_config = {"from_attributes": True}
+
+class UserBulkCreated(BaseModel):
+    row: int
+    id: int
+    username: str
+
+class UserBulkConflict(BaseModel):
+    row: int
+    username: str
+    email: str
+    detail: str
+
+class UserBulkError(BaseModel):
+    row: int
+    detail: str | list
+
+class UserBulkResult(BaseModel):
+    created: list[UserBulkCreated]
+    conflicts: list[UserBulkConflict]
+    errors: list[UserBulkError]
@@ -0,0 +1,18 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.connector import ConnectorSource
+from app.schemas import connector as connector_schema
+
+async def create_source_async(
+    db: AsyncSession, source_in: connector_schema.ConnectorSourceCreate, owner_id: int, org_id: int
+) -> ConnectorSource:
+    source = ConnectorSource(
+        owner_id=owner_id, org_id=org_id, kind=source_in.kind, base_url=source_in.base_url, config=source_in.config
+    )
+    db.add(source)
+    await db.commit()
+    await db.refresh(source)
+    return source
+
+async def get_sources_by_owner_async(db: AsyncSession, owner_id: int) -> list[ConnectorSource]:
+    return list(await db.scalars(select(ConnectorSource).where(ConnectorSource.owner_id == owner_id).order_by(ConnectorSource.id)))
@@ -0,0 +1,89 @@
+import numpy as np
+from sqlalchemy import select, update, bindparam, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core import embeddings
+from app.models import item as item_model
+
+def item_text(title: str, description: str | None) -> str:
+    return f"{title}\n{description or ''}".strip()
+
+def embed_items(db: Session, item_ids: list[int], batch_size: int = embeddings.EMBEDDING_BATCH_SIZE) -> int:
+    rows = db.execute(
+        select(item_model.Item.id, item_model.Item.title, item_model.Item.description)
+        .where(item_model.Item.id.in_(item_ids))
+    ).all()
+    if not rows:
+        return 0
+    vectors = embeddings.embed_in_batches([item_text(row.title, row.description) for row in rows], batch_size)
+    table = item_model.Item.__table__
+    # Core UPDATE so the row version (and with it every ETag) is left alone.
+    stmt = update(table).where(table.c.id == bindparam("item_id")).values(embedding=bindparam("vector"))
+    db.execute(stmt, [{"item_id": row.id, "vector": vector} for row, vector in zip(rows, vectors)])
+    db.commit()
+    return len(rows)
+
+_PG_SIMILAR_SQL = """
+    SELECT id, title, description, owner_id, org_id, version, 1 - (embedding <=> CAST(:query AS vector)) AS score
+    FROM items
+    WHERE org_id = :org_id AND owner_id = :owner_id AND embedding IS NOT NULL AND id != CAST(:exclude_id AS integer)
+    ORDER BY embedding <=> CAST(:query AS vector)
+    LIMIT :k
+"""
+
+# The HNSW scan returns ef_search candidates before the org/owner filter runs,
+# so it has to look well past k for k hits to survive a selective filter.
+HNSW_OVERSAMPLING = 10
+HNSW_MIN_EF_SEARCH = 40
+HNSW_MAX_EF_SEARCH = 1000
+
+def _vector_literal(vector: np.ndarray) -> str:
+    return "[" + ",".join(f"{value:.7g}" for value in vector) + "]"
+
+async def _similar_postgres(db: AsyncSession, owner_id: int, org_id: int, k: int, query_vector, item_id) -> list[dict]:
+    if query_vector is None:
+        query_vector = await db.scalar(select(item_model.Item.embedding).where(item_model.Item.id == item_id))
+        # Not embedded yet: nothing to compare against, as in the NumPy path.
+        if query_vector is None:
+            return []
+    ef_search = min(HNSW_MAX_EF_SEARCH, max(HNSW_MIN_EF_SEARCH, k * HNSW_OVERSAMPLING))
+    # SET LOCAL only lasts for this transaction; it cannot take a bind parameter.
+    await db.execute(text(f"SET LOCAL hnsw.ef_search = {int(ef_search)}").execution_options(replica=True))
+    result = await db.execute(text(_PG_SIMILAR_SQL).execution_options(replica=True), {
+        "owner_id": owner_id, "org_id": org_id, "k": k, "exclude_id": item_id or 0, "query": _vector_literal(query_vector)
+    })
+    return [dict(row._mapping) for row in result]
+
+async def _similar_numpy(db: AsyncSession, owner_id: int, org_id: int, k: int, query_vector, item_id) -> list[dict]:
+    Item = item_model.Item
+    result = await db.execute(
+        select(Item.id, Item.embedding).where(Item.org_id == org_id, Item.owner_id == owner_id, Item.embedding.is_not(None))
+    )
+    ids, vectors = [], []
+    for row in result:
+        ids.append(row.id)
+        vectors.append(row.embedding)
+    if not ids:
+        return []
+    matrix = np.vstack(vectors)
+    if query_vector is None:
+        if item_id not in ids:
+            return []
+        query_vector = matrix[ids.index(item_id)]
+    order, scores = embeddings.top_k_cosine(matrix, np.asarray(query_vector, dtype=np.float32), k + 1)
+    ranked = [(ids[index], float(score)) for index, score in zip(order, scores) if ids[index] != item_id][:k]
+    if not ranked:
+        return []
+    rows = await db.execute(
+        select(Item.id, Item.title, Item.description, Item.owner_id, Item.org_id, Item.version)
+        .where(Item.id.in_([item_id for item_id, _ in ranked]))
+    )
+    by_id = {row.id: dict(row._mapping) for row in rows}
+    return [{**by_id[item_id], "score": score} for item_id, score in ranked]
+
+async def similar_items_async(
+    db: AsyncSession, owner_id: int, org_id: int, k: int, query_vector: np.ndarray | None = None, item_id: int | None = None
+) -> list[dict]:
+    if db.bind.dialect.name == "postgresql":
+        return await _similar_postgres(db, owner_id, org_id, k, query_vector, item_id)
+    return await _similar_numpy(db, owner_id, org_id, k, query_vector, item_id)
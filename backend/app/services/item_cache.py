@@ -0,0 +1,119 @@
+import random
+import time
+import orjson
+from app.core import cache
+from app.schemas import item as item_schema
+from app.core.config import settings
+
+ITEM_CACHE_BACKEND = settings.item_cache_backend
+ITEM_CACHE_TTL_SECONDS = settings.item_cache_ttl_seconds
+ITEM_CACHE_MAX_ENTRIES = settings.item_cache_max_entries
+REDIS_URL = settings.redis_url
+
+backend = cache.build_backend(ITEM_CACHE_BACKEND, redis_url=REDIS_URL, max_entries=ITEM_CACHE_MAX_ENTRIES)
+_single_flight = cache.SingleFlight()
+
+def _ttl() -> float:
+    # Jitter keeps entries written together from expiring together.
+    return ITEM_CACHE_TTL_SECONDS * random.uniform(0.9, 1.1)
+
+def item_key(item_id: int) -> str:
+    return f"item:{item_id}"
+
+def _owner_version_key(owner_id: int) -> str:
+    return f"items:owner:{owner_id}:version"
+
+def _item_generation_key(item_id: int) -> str:
+    return f"item:{item_id}:generation"
+
+def _token() -> str:
+    # A fresh token, rather than a counter, so a lost version key can never
+    # resurrect entries cached under an old one.
+    return str(time.time_ns())
+
+# The owner version also names list ETags. With the memory backend each process
+# has its own, and a write only bumps the one in the process that handled it, so
+# versions expire with the pages: another process serves a stale list (or 304) for
+# at most ITEM_CACHE_TTL_SECONDS, the same bound as its cached pages.
+
+async def owner_version(owner_id: int) -> str:
+    version = await backend.aget(_owner_version_key(owner_id))
+    if version is None:
+        version = _token()
+        await backend.aset(_owner_version_key(owner_id), version, ttl_seconds=ITEM_CACHE_TTL_SECONDS)
+    return version
+
+def bump_owner_version(owner_id: int) -> str:
+    version = _token()
+    backend.set(_owner_version_key(owner_id), version, ttl_seconds=ITEM_CACHE_TTL_SECONDS)
+    return version
+
+async def bump_owner_version_async(owner_id: int) -> str:
+    version = _token()
+    await backend.aset(_owner_version_key(owner_id), version, ttl_seconds=ITEM_CACHE_TTL_SECONDS)
+    return version
+
+def _page_key(owner_id: int, version: str, limit: int, after_id: int | None) -> str:
+    return f"items:owner:{owner_id}:v{version}:{limit}:{after_id or 0}"
+
+async def page_key(owner_id: int, limit: int, after_id: int | None) -> str:
+    return _page_key(owner_id, await owner_version(owner_id), limit, after_id)
+
+# Invalidation also bumps a per-item generation: a load that started before it
+# sees the generation change and drops its result instead of caching it.
+# Generations only need to outlive the slowest load, so they expire with entries.
+
+def invalidate_item(item_id: int | None, owner_id: int):
+    if item_id is not None:
+        backend.set(_item_generation_key(item_id), _token(), ttl_seconds=ITEM_CACHE_TTL_SECONDS)
+        backend.delete(item_key(item_id))
+    bump_owner_version(owner_id)
+
+def invalidate_owner(owner_id: int):
+    bump_owner_version(owner_id)
+
+async def invalidate_item_async(item_id: int | None, owner_id: int):
+    if item_id is not None:
+        await backend.aset(_item_generation_key(item_id), _token(), ttl_seconds=ITEM_CACHE_TTL_SECONDS)
+        await backend.adelete(item_key(item_id))
+    await bump_owner_version_async(owner_id)
+
+async def invalidate_owner_async(owner_id: int):
+    await bump_owner_version_async(owner_id)
+
+async def get_or_load_item(item_id: int, loader) -> item_schema.ItemRead | None:
+    key = item_key(item_id)
+    raw = await backend.aget(key)
+    if raw is not None:
+        return item_schema.ItemRead.model_validate_json(raw)
+
+    async def load():
+        generation = await backend.aget(_item_generation_key(item_id))
+        item = await loader()
+        if item is None:
+            return None
+        cached = item_schema.ItemRead.model_validate(item)
+        if await backend.aget(_item_generation_key(item_id)) == generation:
+            await backend.aset(key, cached.model_dump_json(), ttl_seconds=_ttl())
+        return cached
+
+    return await _single_flight.run(key, load)
+
+async def get_or_load_page(owner_id: int, limit: int, after_id: int | None, loader) -> tuple[list[dict], int | None]:
+    """Pages are plain dicts with the ItemRead fields; the loader must already return those."""
+    version = await owner_version(owner_id)
+    key = _page_key(owner_id, version, limit, after_id)
+    raw = await backend.aget(key)
+    if raw is not None:
+        page = orjson.loads(raw)
+        return page["items"], page["last_id"]
+
+    async def load():
+        items, last_id = await loader()
+        # The key already names the version, so a stale page could never be read back;
+        # checking first just avoids writing one nobody will ask for.
+        if await owner_version(owner_id) == version:
+            await backend.aset(key, orjson.dumps({"items": items, "last_id": last_id}).decode(), ttl_seconds=_ttl())
+        return items, last_id
+
+    return await _single_flight.run(key, load)
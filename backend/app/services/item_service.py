@@ -1,20 +1,245 @@
+from typing import AsyncIterator, Iterator
+from sqlalchemy import select, insert, text
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.models import item as item_model
 from app.schemas import item as item_schema
+from app.core import outbox
+from app.services import item_cache
 
-def create_item(db: Session, item_in: item_schema.ItemCreate, owner_id: int) -> item_model.Item:
-    new_item = item_model.Item(
+# Side effects go through the outbox in the write's transaction; the relay
+# delivers them. Caches are also invalidated inline right after the commit so
+# the writer reads its own change without waiting for the relay.
+
+def _record_item_created(db: Session, item: item_model.Item):
+    outbox.record(db, "item.created", item_schema.ItemRead.model_validate(item).model_dump(mode="json"))
+
+def _record_items_created(db: Session, owner_id: int, ids: list[int | None]):
+    created = [item_id for item_id in ids if item_id is not None]
+    if created:
+        outbox.record(db, "items.created", {"owner_id": owner_id, "ids": created})
+
+def _new_item(item_in: item_schema.ItemCreate, owner_id: int, org_id: int) -> item_model.Item:
+    return item_model.Item(
         title=item_in.title,
         description=item_in.description,
-        owner_id=owner_id
+        owner_id=owner_id,
+        org_id=org_id
     )
+
+def create_item(db: Session, item_in: item_schema.ItemCreate, owner_id: int, org_id: int) -> item_model.Item:
+    new_item = _new_item(item_in, owner_id, org_id)
     db.add(new_item)
+    db.flush()
+    _record_item_created(db, new_item)
     db.commit()
     db.refresh(new_item)
+    item_cache.invalidate_item(new_item.id, owner_id)
     return new_item
 
+async def create_item_async(db: AsyncSession, item_in: item_schema.ItemCreate, owner_id: int, org_id: int) -> item_model.Item:
+    new_item = _new_item(item_in, owner_id, org_id)
+    db.add(new_item)
+    await db.flush()
+    _record_item_created(db, new_item)
+    # Every ItemRead field is known once flushed and async sessions keep them
+    # after commit, so the outbox insert costs no extra round trip overall.
+    await db.commit()
+    await item_cache.invalidate_item_async(new_item.id, owner_id)
+    return new_item
+
+BULK_CHUNK_SIZE = 1000
+
+def _insert_stmt():
+    return insert(item_model.Item).returning(item_model.Item.id, sort_by_parameter_order=True)
+
+def _bulk_rows(items_in: list[item_schema.ItemCreate], owner_id: int, org_id: int) -> list[dict]:
+    return [
+        {"title": item_in.title, "description": item_in.description, "owner_id": owner_id, "org_id": org_id}
+        for item_in in items_in
+    ]
+
+def create_items_bulk(
+    db: Session, items_in: list[item_schema.ItemCreate], owner_id: int, org_id: int, chunk_size: int = BULK_CHUNK_SIZE
+) -> tuple[list[int | None], dict[int, str]]:
+    ids: list[int | None] = []
+    errors: dict[int, str] = {}
+    for start in range(0, len(items_in), chunk_size):
+        rows = _bulk_rows(items_in[start:start + chunk_size], owner_id, org_id)
+        try:
+            with db.begin_nested():
+                ids.extend(db.scalars(_insert_stmt(), rows))
+            continue
+        except SQLAlchemyError:
+            pass
+        # Fall back to one savepoint per row so a bad row only loses itself.
+        for offset, row in enumerate(rows):
+            try:
+                with db.begin_nested():
+                    ids.extend(db.scalars(_insert_stmt(), [row]))
+            except SQLAlchemyError as exc:
+                ids.append(None)
+                errors[start + offset] = str(exc.orig or exc)
+    _record_items_created(db, owner_id, ids)
+    db.commit()
+    item_cache.invalidate_owner(owner_id)
+    return ids, errors
+
+async def create_items_bulk_async(
+    db: AsyncSession, items_in: list[item_schema.ItemCreate], owner_id: int, org_id: int, chunk_size: int = BULK_CHUNK_SIZE
+) -> tuple[list[int | None], dict[int, str]]:
+    ids: list[int | None] = []
+    errors: dict[int, str] = {}
+    for start in range(0, len(items_in), chunk_size):
+        rows = _bulk_rows(items_in[start:start + chunk_size], owner_id, org_id)
+        try:
+            async with db.begin_nested():
+                ids.extend(await db.scalars(_insert_stmt(), rows))
+            continue
+        except SQLAlchemyError:
+            pass
+        for offset, row in enumerate(rows):
+            try:
+                async with db.begin_nested():
+                    ids.extend(await db.scalars(_insert_stmt(), [row]))
+            except SQLAlchemyError as exc:
+                ids.append(None)
+                errors[start + offset] = str(exc.orig or exc)
+    _record_items_created(db, owner_id, ids)
+    await db.commit()
+    await item_cache.invalidate_owner_async(owner_id)
+    return ids, errors
+
 def get_items_by_owner(db: Session, owner_id: int) -> list[item_model.Item]:
     return db.query(item_model.Item).filter(item_model.Item.owner_id == owner_id).all()
 
+def _page_stmt(owner_id: int, limit: int, after_id: int | None):
+    stmt = select(item_model.Item).where(item_model.Item.owner_id == owner_id)
+    if after_id is not None:
+        stmt = stmt.where(item_model.Item.id > after_id)
+    return stmt.order_by(item_model.Item.id).limit(limit + 1)
+
+def _split_page(rows: list[item_model.Item], limit: int) -> tuple[list[item_model.Item], int | None]:
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, rows[-1].id
+    return rows, None
+
+def get_items_page(db: Session, owner_id: int, limit: int, after_id: int | None = None) -> tuple[list[item_model.Item], int | None]:
+    rows = list(db.scalars(_page_stmt(owner_id, limit, after_id)))
+    return _split_page(rows, limit)
+
+async def get_items_page_async(db: AsyncSession, owner_id: int, limit: int, after_id: int | None = None) -> tuple[list[item_model.Item], int | None]:
+    rows = list(await db.scalars(_page_stmt(owner_id, limit, after_id)))
+    return _split_page(rows, limit)
+
+# Exactly the ItemRead fields, so rows can be served as-is without ORM objects or re-validation.
+READ_COLUMNS = tuple(item_schema.ItemRead.model_fields)
+
+def _rows_page_stmt(owner_id: int, limit: int, after_id: int | None):
+    stmt = select(*(getattr(item_model.Item, name) for name in READ_COLUMNS)).where(item_model.Item.owner_id == owner_id)
+    if after_id is not None:
+        stmt = stmt.where(item_model.Item.id > after_id)
+    return stmt.order_by(item_model.Item.id).limit(limit + 1)
+
+def _split_rows_page(rows, limit: int) -> tuple[list[dict], int | None]:
+    page = [dict(zip(READ_COLUMNS, row)) for row in rows[:limit]]
+    return page, (page[-1]["id"] if len(rows) > limit else None)
+
+def get_item_rows_page(db: Session, owner_id: int, limit: int, after_id: int | None = None) -> tuple[list[dict], int | None]:
+    return _split_rows_page(db.execute(_rows_page_stmt(owner_id, limit, after_id)).all(), limit)
+
+async def get_item_rows_page_async(db: AsyncSession, owner_id: int, limit: int, after_id: int | None = None) -> tuple[list[dict], int | None]:
+    return _split_rows_page((await db.execute(_rows_page_stmt(owner_id, limit, after_id))).all(), limit)
+
+async def get_items_page_cached_async(db: AsyncSession, owner_id: int, limit: int, after_id: int | None = None) -> tuple[list[dict], int | None]:
+    return await item_cache.get_or_load_page(
+        owner_id, limit, after_id, lambda: get_item_rows_page_async(db, owner_id, limit, after_id)
+    )
+
+_SEARCH_SQL = {
+    "postgresql": """
+        WITH q AS (SELECT websearch_to_tsquery('english', :q) AS query),
+        ranked AS (
+            SELECT items.id, items.title, items.description, items.owner_id, items.org_id, items.version,
+                   ts_rank_cd(items.search_vector, q.query)::float8 AS rank
+            FROM items, q
+            WHERE items.org_id = :org_id AND items.owner_id = :owner_id AND items.search_vector @@ q.query
+        )
+        SELECT * FROM ranked
+        WHERE CAST(:after_rank AS float8) IS NULL
+           OR rank < CAST(:after_rank AS float8)
+           OR (rank = CAST(:after_rank AS float8) AND id > CAST(:after_id AS integer))
+        ORDER BY rank DESC, id ASC
+        LIMIT :limit
+    """,
+    "sqlite": """
+        WITH ranked AS (
+            SELECT items.id, items.title, items.description, items.owner_id, items.org_id, items.version,
+                   -bm25(items_fts) AS rank
+            FROM items_fts JOIN items ON items.id = items_fts.rowid
+            WHERE items_fts MATCH :q AND items.org_id = :org_id AND items.owner_id = :owner_id
+        )
+        SELECT * FROM ranked
+        WHERE :after_rank IS NULL OR rank < :after_rank OR (rank = :after_rank AND id > :after_id)
+        ORDER BY rank DESC, id ASC
+        LIMIT :limit
+    """,
+}
+
+class SearchUnavailableError(Exception):
+    """The database has no full-text search support this service knows how to query."""
+
+def _fts5_query(q: str) -> str:
+    # Quote every term so user input is never parsed as FTS5 syntax.
+    return " ".join('"' + term.replace('"', '""') + '"' for term in q.split())
+
+async def search_items_async(
+    db: AsyncSession, owner_id: int, org_id: int, q: str, limit: int, after: tuple[float, int] | None = None
+) -> tuple[list[dict], tuple[float, int] | None]:
+    dialect = db.bind.dialect.name
+    if dialect not in _SEARCH_SQL:
+        raise SearchUnavailableError(f"Full-text search is not available on {dialect}")
+    query = _fts5_query(q) if dialect == "sqlite" else q
+    if not query.strip():
+        return [], None
+    after_rank, after_id = after if after is not None else (None, None)
+    result = await db.execute(text(_SEARCH_SQL[dialect]).execution_options(replica=True), {
+        "q": query, "owner_id": owner_id, "org_id": org_id, "limit": limit + 1,
+        "after_rank": after_rank, "after_id": after_id,
+    })
+    rows = [dict(row._mapping) for row in result]
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, (rows[-1]["rank"], rows[-1]["id"])
+    return rows, None
+
+EXPORT_COLUMNS = ("id", "title", "description", "owner_id")
+
+def _export_stmt(owner_id: int, batch_size: int):
+    return (
+        select(*(getattr(item_model.Item, name) for name in EXPORT_COLUMNS))
+        .where(item_model.Item.owner_id == owner_id)
+        .order_by(item_model.Item.id)
+        .execution_options(yield_per=batch_size)
+    )
+
+def iter_items_for_export(db: Session, owner_id: int, batch_size: int = 1000) -> Iterator[Row]:
+    yield from db.execute(_export_stmt(owner_id, batch_size))
+
+async def iter_items_for_export_async(db: AsyncSession, owner_id: int, batch_size: int = 1000) -> AsyncIterator[Row]:
+    result = await db.stream(_export_stmt(owner_id, batch_size))
+    async for row in result:
+        yield row
+
 def get_item(db: Session, item_id: int) -> item_model.Item | None:
-    return db.query(item_model.Item).filter(item_model.Item.id == item_id).first() 
\ No newline at end of file
+    return db.query(item_model.Item).filter(item_model.Item.id == item_id).first()
+
+async def get_item_async(db: AsyncSession, item_id: int) -> item_model.Item | None:
+    return await db.get(item_model.Item, item_id)
+
+async def get_item_cached_async(db: AsyncSession, item_id: int) -> item_schema.ItemRead | None:
+    return await item_cache.get_or_load_item(item_id, lambda: get_item_async(db, item_id))
+
@@ -0,0 +1,82 @@
+import uuid
+from datetime import datetime, timezone
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.models import job as job_model
+from app.schemas import job as job_schema
+from app.core import events
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+def _job_updated(job: job_model.Job):
+    events.publish_to_user(job.user_id, {
+        "event": "job_update",
+        "job": job_schema.JobRead.model_validate(job).model_dump(mode="json")
+    })
+
+async def create_job_async(db: AsyncSession, job_in: job_schema.JobCreate, user_id: int | None) -> job_model.Job:
+    new_job = job_model.Job(
+        user_id=user_id,
+        job_type=job_in.job_type,
+        related_id=job_in.related_id,
+        payload=job_in.payload,
+        status=job_model.JOB_PENDING,
+        celery_task_id=str(uuid.uuid4())
+    )
+    db.add(new_job)
+    await db.commit()
+    await db.refresh(new_job)
+    return new_job
+
+async def get_job_async(db: AsyncSession, job_id: int) -> job_model.Job | None:
+    return await db.get(job_model.Job, job_id)
+
+async def mark_failed_async(db: AsyncSession, job: job_model.Job, error_message: str) -> job_model.Job:
+    job.status = job_model.JOB_FAILED
+    job.error_message = error_message
+    job.finished_at = _now()
+    await db.commit()
+    await db.refresh(job)
+    _job_updated(job)
+    return job
+
+def create_job(db: Session, job_type: str, user_id: int | None = None, related_id: int | None = None, payload: dict | None = None) -> job_model.Job:
+    new_job = job_model.Job(
+        user_id=user_id,
+        job_type=job_type,
+        related_id=related_id,
+        payload=payload or {},
+        status=job_model.JOB_PENDING,
+        celery_task_id=str(uuid.uuid4())
+    )
+    db.add(new_job)
+    db.commit()
+    db.refresh(new_job)
+    return new_job
+
+def get_job(db: Session, job_id: int) -> job_model.Job | None:
+    return db.get(job_model.Job, job_id)
+
+def mark_running(db: Session, job: job_model.Job) -> job_model.Job:
+    job.status = job_model.JOB_RUNNING
+    job.started_at = _now()
+    db.commit()
+    _job_updated(job)
+    return job
+
+def mark_done(db: Session, job: job_model.Job, result) -> job_model.Job:
+    job.status = job_model.JOB_DONE
+    job.result = result
+    job.finished_at = _now()
+    db.commit()
+    _job_updated(job)
+    return job
+
+def mark_failed(db: Session, job: job_model.Job, error_message: str) -> job_model.Job:
+    job.status = job_model.JOB_FAILED
+    job.error_message = error_message
+    job.finished_at = _now()
+    db.commit()
+    _job_updated(job)
+    return job
@@ -0,0 +1,187 @@
+"""Bulk user provisioning from streamed CSV or NDJSON.
+
+Rows are validated and written in chunks: passwords are hashed in parallel
+through the hashing pool's admission queue, and users go in with INSERT ... ON CONFLICT DO NOTHING,
+so rows that collide with an existing username or email (or an earlier row)
+are reported as conflicts instead of failing the import.
+"""
+import codecs
+import csv
+import json
+from typing import AsyncIterator
+from pydantic import ValidationError
+from sqlalchemy import or_, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core import hashing, outbox
+from app.core.config import settings
+from app.models.user import User
+from app.schemas.user import UserCreate
+
+PROVISION_CHUNK_SIZE = settings.provision_chunk_size
+PROVISION_MAX_ROWS = settings.provision_max_rows
+
+FORMATS = ("csv", "ndjson")
+CSV_FIELDS = ("username", "email", "password")
+CONFLICT_DETAIL = "Username or email already registered"
+
+_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+def format_for(content_type: str) -> str | None:
+    content_type = content_type.split(";")[0].strip().lower()
+    if content_type in ("text/csv", "application/csv"):
+        return "csv"
+    if content_type in ("application/x-ndjson", "application/ndjson", "application/jsonl"):
+        return "ndjson"
+    return None
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Split a byte stream into lines (keeping the newline) without holding more than one line."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line + "\n"
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+async def _csv_records(lines: AsyncIterator[str]) -> AsyncIterator[dict | str]:
+    header = None
+    record = ""
+    async for line in lines:
+        record += line
+        # An odd number of quotes means a quoted field continues on the next line.
+        if record.count('"') % 2:
+            continue
+        text, record = record, ""
+        if not text.strip():
+            continue
+        fields = next(csv.reader([text]))
+        if header is None:
+            header = [field.strip().lower() for field in fields]
+            if not set(CSV_FIELDS) <= set(header):
+                raise ValueError(f"CSV header must include {', '.join(CSV_FIELDS)}")
+            continue
+        if len(fields) != len(header):
+            yield f"Expected {len(header)} fields, got {len(fields)}"
+            continue
+        yield dict(zip(header, fields))
+    if record.strip():
+        yield "Unterminated quoted field"
+
+async def _ndjson_records(lines: AsyncIterator[str]) -> AsyncIterator[dict | str]:
+    async for line in lines:
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            yield f"Invalid JSON: {exc}"
+            continue
+        yield record if isinstance(record, dict) else "Expected a JSON object"
+
+async def _chunks(
+    records: AsyncIterator[dict | str], size: int, max_rows: int | None, report: dict
+) -> AsyncIterator[list[tuple[int, dict | str]]]:
+    chunk = []
+    row = 0
+    async for record in records:
+        row += 1
+        if max_rows is not None and row > max_rows:
+            # Stop reading: the rest of the body is never buffered or parsed.
+            report["errors"].append({"row": row, "detail": f"Row limit of {max_rows} reached; remaining rows were not imported"})
+            break
+        chunk.append((row, record))
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+async def _existing(db: AsyncSession, users: list[UserCreate]) -> tuple[set[str], set[str]]:
+    usernames = [user.username for user in users]
+    emails = [user.email for user in users]
+    rows = await db.execute(
+        select(User.username, User.email)
+        .where(or_(User.username.in_(usernames), User.email.in_(emails)))
+        .execution_options(all_tenants=True)
+    )
+    taken_usernames, taken_emails = set(), set()
+    for username, email in rows:
+        taken_usernames.add(username)
+        taken_emails.add(email)
+    return taken_usernames, taken_emails
+
+async def _provision_chunk(db: AsyncSession, org_id: int, chunk: list[tuple[int, dict | str]], report: dict):
+    valid: list[tuple[int, UserCreate]] = []
+    for row, record in chunk:
+        if isinstance(record, str):
+            report["errors"].append({"row": row, "detail": record})
+            continue
+        try:
+            valid.append((row, UserCreate.model_validate(record)))
+        except ValidationError as exc:
+            # Never echo inputs back: the row holds a plaintext password.
+            detail = exc.errors(include_url=False, include_context=False, include_input=False)
+            report["errors"].append({"row": row, "detail": detail})
+    if not valid:
+        return
+
+    # Only an optimisation, so re-running an import does not pay bcrypt for users it
+    # already created; the insert below is what actually guarantees no duplicates.
+    taken_usernames, taken_emails = await _existing(db, [user for _, user in valid])
+    fresh = []
+    for row, user in valid:
+        if user.username in taken_usernames or user.email in taken_emails:
+            report["conflicts"].append({"row": row, "username": user.username, "email": user.email, "detail": CONFLICT_DETAIL})
+        else:
+            fresh.append((row, user))
+    if not fresh:
+        return
+
+    hashes = await hashing.hash_passwords([user.password for _, user in fresh])
+    insert = _INSERTS[db.bind.dialect.name]
+    stmt = (
+        insert(User)
+        .values([
+            {"username": user.username, "email": user.email, "hashed_password": hashed, "is_active": True, "org_id": org_id}
+            for (_, user), hashed in zip(fresh, hashes)
+        ])
+        .on_conflict_do_nothing()
+        .returning(User.id, User.username)
+    )
+    inserted = {username: user_id for user_id, username in await db.execute(stmt)}
+    if inserted:
+        outbox.record(db, "users.created", {"org_id": org_id, "ids": list(inserted.values())})
+    await db.commit()
+    for row, user in fresh:
+        user_id = inserted.pop(user.username, None)
+        if user_id is None:
+            # Taken by an earlier row of this import or by a concurrent writer.
+            report["conflicts"].append({"row": row, "username": user.username, "email": user.email, "detail": CONFLICT_DETAIL})
+        else:
+            report["created"].append({"row": row, "id": user_id, "username": user.username})
+
+async def provision_users(
+    db: AsyncSession, org_id: int, lines: AsyncIterator[str], fmt: str,
+    chunk_size: int = PROVISION_CHUNK_SIZE, max_rows: int | None = None
+) -> dict:
+    """Create users in org_id from CSV or NDJSON lines; each chunk commits on its own.
+
+    Returns {"created": [{row, id, username}], "conflicts": [...], "errors": [...]},
+    with rows numbered from 1 after any CSV header. Rows past max_rows (None for no
+    limit) are not read; an error entry marks where the import stopped. The HTTP endpoint
+    passes PROVISION_MAX_ROWS; the CLI imports whole files.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported format {fmt!r}")
+    records = _csv_records(lines) if fmt == "csv" else _ndjson_records(lines)
+    report = {"created": [], "conflicts": [], "errors": []}
+    async for chunk in _chunks(records, chunk_size, max_rows, report):
+        await _provision_chunk(db, org_id, chunk, report)
+    for key in ("conflicts", "errors"):
+        report[key].sort(key=lambda entry: entry["row"])
+    return report
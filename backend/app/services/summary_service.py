@@ -0,0 +1,83 @@
+import asyncio
+import hashlib
+import re
+from app.core import cache, llm
+from app.core.config import settings
+
+SUMMARY_CHUNK_TOKENS = settings.summary_chunk_tokens
+SUMMARY_CONCURRENCY = settings.summary_concurrency
+SUMMARY_CACHE_BACKEND = settings.summary_cache_backend
+SUMMARY_CACHE_TTL_SECONDS = settings.summary_cache_ttl_seconds
+SUMMARY_CACHE_MAX_ENTRIES = settings.summary_cache_max_entries
+REDIS_URL = settings.redis_url
+
+MAP_PROMPT = "Summarize the following section of a document in a few sentences.\n\n"
+REDUCE_PROMPT = "Combine these section summaries into one concise summary of the whole document.\n\n"
+
+backend = cache.build_backend(SUMMARY_CACHE_BACKEND, redis_url=REDIS_URL, max_entries=SUMMARY_CACHE_MAX_ENTRIES)
+
+_TOKEN = re.compile(r"\S+")
+_PARAGRAPH = re.compile(r"\n\s*\n")
+
+def count_tokens(text: str) -> int:
+    # Whitespace-delimited words; real tokenizers run about 1.3 tokens per English word,
+    # which SUMMARY_CHUNK_TOKENS leaves room for.
+    return len(_TOKEN.findall(text))
+
+def split_into_chunks(text: str, max_tokens: int = SUMMARY_CHUNK_TOKENS) -> list[str]:
+    """Greedily pack paragraphs into chunks of at most max_tokens, splitting oversized paragraphs on words."""
+    chunks, current, current_tokens = [], [], 0
+    for paragraph in _PARAGRAPH.split(text):
+        words = _TOKEN.findall(paragraph)
+        if not words:
+            continue
+        if len(words) > max_tokens:
+            if current:
+                chunks.append("\n\n".join(current))
+                current, current_tokens = [], 0
+            chunks.extend(" ".join(words[start:start + max_tokens]) for start in range(0, len(words), max_tokens))
+            continue
+        if current_tokens + len(words) > max_tokens:
+            chunks.append("\n\n".join(current))
+            current, current_tokens = [], 0
+        current.append(" ".join(words))
+        current_tokens += len(words)
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+def cache_key(model: str, prompt: str) -> str:
+    return "summary:" + hashlib.sha256(f"{model}\0{prompt}".encode()).hexdigest()
+
+async def _complete_cached(client, prompt: str, semaphore: asyncio.Semaphore) -> str:
+    # Sync cache calls on purpose: this only runs in workers, under a fresh asyncio.run()
+    # per job, and a module-level redis.asyncio pool would stay bound to the first job's loop.
+    key = cache_key(getattr(client, "model", ""), prompt)
+    cached = backend.get(key)
+    if cached is not None:
+        return cached
+    async with semaphore:
+        result = await client.complete(prompt)
+    backend.set(key, result, ttl_seconds=SUMMARY_CACHE_TTL_SECONDS)
+    return result
+
+async def _map(client, prompt: str, chunks: list[str], semaphore: asyncio.Semaphore) -> list[str]:
+    return list(await asyncio.gather(*(_complete_cached(client, prompt + chunk, semaphore) for chunk in chunks)))
+
+async def summarize_text(
+    text: str, client=None, max_tokens: int = SUMMARY_CHUNK_TOKENS, concurrency: int = SUMMARY_CONCURRENCY
+) -> dict:
+    client = client or llm.get_llm_client()
+    semaphore = asyncio.Semaphore(concurrency)
+    chunks = split_into_chunks(text, max_tokens)
+    if not chunks:
+        return {"summary": "", "chunks": 0}
+    summaries = await _map(client, MAP_PROMPT, chunks, semaphore)
+    # Collapse until the partial summaries fit one reduce call.
+    while len(summaries) > 1:
+        groups = split_into_chunks("\n\n".join(summaries), max_tokens)
+        if len(groups) >= len(summaries):
+            # Summaries too long to pack still have to shrink, so pair them up regardless.
+            groups = ["\n\n".join(summaries[start:start + 2]) for start in range(0, len(summaries), 2)]
+        summaries = await _map(client, REDUCE_PROMPT, groups, semaphore)
+    return {"summary": summaries[0], "chunks": len(chunks)}
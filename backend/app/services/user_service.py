@@ -1,37 +1,127 @@
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.models import user as user_model
+from app.models.organization import Organization
 from app.schemas import user as user_schema
-from app.core import security
+from app.core import security, hashing, outbox
 
-def create_user(db: Session, user_in: user_schema.UserCreate) -> user_model.User:
-    existing_user = db.query(user_model.User).filter(
+def _existing_user_stmt(user_in: user_schema.UserCreate):
+    return select(user_model.User).where(
         (user_model.User.username == user_in.username) | 
         (user_model.User.email == user_in.email)
-    ).first()
-    if existing_user:
-        return None
-    
-    hashed_pw = security.hash_password(user_in.password)
-    new_user = user_model.User(
+    ).limit(1).execution_options(all_tenants=True)
+
+def _new_user(user_in: user_schema.UserCreate, hashed_pw: str) -> user_model.User:
+    # Self-service sign-ups get a personal organization, inserted in the same flush, and administer it.
+    return user_model.User(
         username=user_in.username,
         email=user_in.email,
-        hashed_password=hashed_pw
+        hashed_password=hashed_pw,
+        role=user_model.ROLE_ADMIN,
+        organization=Organization(name=user_in.username)
     )
-    db.add(new_user)
+
+def _record_user_created(db: Session, user: user_model.User):
+    outbox.record(db, "user.created", {"id": user.id, "username": user.username, "org_id": user.org_id})
+
+def _store_password_hash(db: Session, user: user_model.User, hashed_pw: str) -> user_model.User:
+    user.hashed_password = hashed_pw
     db.commit()
+    db.refresh(user)
+    return user
+
+def create_user(db: Session, user_in: user_schema.UserCreate) -> user_model.User:
+    if db.scalars(_existing_user_stmt(user_in)).first():
+        return None
+    
+    new_user = _new_user(user_in, security.hash_password(user_in.password))
+    db.add(new_user)
+    try:
+        db.flush()
+        _record_user_created(db, new_user)
+        db.commit()
+    except IntegrityError:
+        # Lost a race with a concurrent sign-up for the same username or email.
+        db.rollback()
+        return None
     db.refresh(new_user)
     return new_user
 
+async def create_user_async(db: AsyncSession, user_in: user_schema.UserCreate) -> user_model.User:
+    if (await db.scalars(_existing_user_stmt(user_in))).first():
+        return None
+
+    new_user = _new_user(user_in, await hashing.hash_password(user_in.password))
+    db.add(new_user)
+    try:
+        await db.flush()
+        _record_user_created(db, new_user)
+        await db.commit()
+    except IntegrityError:
+        # Lost a race with a concurrent sign-up for the same username or email.
+        await db.rollback()
+        return None
+    await db.refresh(new_user)
+    return new_user
+
+# Usernames are global and these lookups are how the org gets known in the
+# first place, so they must never be filtered by whatever org is current.
+
 def get_user_by_username(db: Session, username: str) -> user_model.User | None:
-    return db.query(user_model.User).filter(user_model.User.username == username).first()
+    return (
+        db.query(user_model.User)
+        .filter(user_model.User.username == username)
+        .execution_options(all_tenants=True)
+        .first()
+    )
+
+async def get_user_by_username_async(db: AsyncSession, username: str) -> user_model.User | None:
+    stmt = select(user_model.User).where(user_model.User.username == username).execution_options(all_tenants=True)
+    return (await db.scalars(stmt)).first()
 
 def authenticate_user(db: Session, username: str, password: str) -> user_model.User | None:
     user = get_user_by_username(db, username)
     if not user:
+        security.verify_password(password, security.dummy_hash())
         return None
-    if not security.verify_password(password, user.hashed_password):
+    verified, new_hash = security.verify_and_update_password(password, user.hashed_password)
+    if not verified:
         return None
+    if new_hash:
+        _store_password_hash(db, user, new_hash)
+    return user
+
+async def authenticate_user_async(db: AsyncSession, username: str, password: str) -> user_model.User | None:
+    user = await get_user_by_username_async(db, username)
+    if not user:
+        await hashing.verify_password(password, await hashing.dummy_hash())
+        return None
+    verified, new_hash = await hashing.verify_and_update_password(password, user.hashed_password)
+    if not verified:
+        return None
+    if new_hash:
+        user.hashed_password = new_hash
+        await db.commit()
+        await db.refresh(user)
     return user
 
 def get_user(db: Session, user_id: int) -> user_model.User | None:
-    return db.query(user_model.User).get(user_id) 
\ No newline at end of file
+    return db.query(user_model.User).get(user_id)
+
+async def get_user_async(db: AsyncSession, user_id: int) -> user_model.User | None:
+    return await db.get(user_model.User, user_id)
+
+def update_password(db: Session, user: user_model.User, new_password: str) -> user_model.User:
+    return _store_password_hash(db, user, security.hash_password(new_password))
+
+def deactivate_user(db: Session, user: user_model.User) -> user_model.User:
+    user.is_active = False
+    db.commit()
+    db.refresh(user)
+    return user
+
+def delete_user(db: Session, user: user_model.User) -> None:
+    db.delete(user)
+    db.commit()
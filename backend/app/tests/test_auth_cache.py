@@ -0,0 +1,91 @@
+import asyncio
+import time
+from app.core import auth_cache
+from app.core.cache import LRUCache
+from app.services import user_service
+from app.schemas.user import UserCreate, UserRead
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+def test_lru_cache_expires_entries():
+    cache = LRUCache(max_entries=10, ttl_seconds=0.05)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    time.sleep(0.06)
+    assert cache.get("a") is None
+
+def test_repeated_requests_hit_principal_cache(client, auth_header):
+    auth = auth_header("cachey")
+    auth_cache.reset()
+    for _ in range(3):
+        assert client.get("/users/me", headers=auth).status_code == 200
+    stats = client.get("/metrics/auth-cache").json()
+    assert stats["principal_misses"] == 1
+    assert stats["principal_hits"] == 2
+    assert stats["claims_misses"] == 1
+    assert stats["claims_hits"] == 2
+
+def test_user_changes_invalidate_principal(client, db_session, auth_header):
+    auth = auth_header("fickle")
+    assert client.get("/users/me", headers=auth).json()["is_active"] is True
+    assert auth_cache.get_principal("fickle") is not None
+
+    user = user_service.get_user_by_username(db_session, "fickle")
+    user_service.deactivate_user(db_session, user)
+    assert auth_cache.get_principal("fickle") is None
+    assert client.get("/users/me", headers=auth).json()["is_active"] is False
+
+    user_service.delete_user(db_session, user)
+    assert auth_cache.get_principal("fickle") is None
+    assert client.get("/users/me", headers=auth).status_code == 404
+
+def test_rolled_back_change_keeps_principal(db_session):
+    user = user_service.create_user(db_session, UserCreate(username="steady", email="steady@example.com", password="pw"))
+    auth_cache.set_principal(UserRead.model_validate(user))
+    user.is_active = False
+    db_session.flush()
+    db_session.rollback()
+    assert auth_cache.get_principal("steady") is not None
+
+class BlockingRedis:
+    """The sync client; request paths must never reach it."""
+    def __getattr__(self, name):
+        raise AssertionError(f"blocking Redis call {name} on a request path")
+
+class FakeAsyncRedis:
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+def test_redis_backend_stays_async_on_request_paths(client, async_session_factory, monkeypatch, auth_header):
+    fake = FakeAsyncRedis()
+    monkeypatch.setattr(auth_cache, "backend", auth_cache.RedisPrincipalBackend(client=BlockingRedis(), async_client=fake))
+    auth = auth_header("asyncy")
+    for _ in range(2):
+        assert client.get("/users/me", headers=auth).status_code == 200
+    assert "auth:principal:asyncy" in fake.data
+
+    async def deactivate():
+        async with async_session_factory() as db:
+            user = await user_service.get_user_by_username_async(db, "asyncy")
+            user.is_active = False
+            await db.commit()
+        await asyncio.gather(*auth_cache._pending_invalidations)
+    asyncio.run(deactivate())
+    assert "auth:principal:asyncy" not in fake.data
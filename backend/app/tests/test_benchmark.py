@@ -0,0 +1,37 @@
+import asyncio
+from benchmarks import http_bench, list_serialization
+from app.core import rate_limit
+from app.main import app
+from app.tests.conftest import engine
+
+def test_summarize_percentiles():
+    result = http_bench.summarize([i / 1000 for i in range(1, 101)], errors=2, wall_seconds=2.0, error_statuses={"404": 2})
+    assert result["requests"] == 100 and result["errors"] == 2 and result["error_statuses"] == {"404": 2}
+    assert result["rps"] == 50.0
+    assert result["p50_ms"] == 50.5
+    assert 94 < result["p95_ms"] < 96 and 98 < result["p99_ms"] < 100
+
+def test_compare_flags_only_regressions():
+    baseline = {"results": {"GET /items/": {"p50_ms": 10, "p95_ms": 20, "p99_ms": 30, "rps": 1000}}}
+    faster = {"results": {"GET /items/": {"p50_ms": 5, "p95_ms": 21, "p99_ms": 30, "rps": 1500}}}
+    assert http_bench.compare(faster, baseline, threshold=0.1) == []
+    slower = {"results": {"GET /items/": {"p50_ms": 10, "p95_ms": 30, "p99_ms": 30, "rps": 800}, "GET /new": {"rps": 1}}}
+    flagged = {(r["metric"], r["change"]) for r in http_bench.compare(slower, baseline, threshold=0.1)}
+    assert flagged == {("p95_ms", 0.5), ("rps", -0.2)}
+
+def test_benchmark_runs_against_app(monkeypatch):
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_ENABLED", True)
+    # Several users interleaved at concurrency > 1, and more logins than the per-IP
+    # login limit allows: any 404 or 429 shows up as an error here.
+    seeded = http_bench.seed(engine, users=4, items_per_user=3)
+    results = asyncio.run(http_bench.run_benchmark(app, seeded, requests=60, concurrency=8, login_requests=40))
+    assert set(results) == {"POST /token", "GET /items/", "GET /items/{id}"}
+    assert {endpoint: result["error_statuses"] for endpoint, result in results.items()} == {endpoint: {} for endpoint in results}
+    assert results["POST /token"]["requests"] == 40
+    assert results["GET /items/"]["requests"] == results["GET /items/{id}"]["requests"] == 60
+
+def test_list_serialization_paths_agree():
+    # run() raises if the two paths encode different payloads.
+    report = list_serialization.run(items=20, limit=10, repeat=2)
+    assert set(report["results"]) == {"orm", "rows", "speedup"}
+    assert report["results"]["rows"]["median_ms"] > 0
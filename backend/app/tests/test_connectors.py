@@ -0,0 +1,241 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import pytest
+from app.core import rate_limit
+from app.models.connector import ConnectorSource, SourceRecord
+from app.models.item import Item
+from app.schemas.user import UserCreate
+from app.services import user_service
+from app.workers import connectors, tasks
+
+class FakeSource:
+    """In-memory knowledge base behind the http_json API, with injectable failures."""
+
+    page_size = 2
+
+    def __init__(self):
+        self.records = {}
+        self.clock = 0
+        self.failures = {}
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def put(self, record_id: str, title: str, body: str):
+        self.clock += 1
+        self.records[record_id] = {"id": record_id, "title": title, "body": body, "changed": self.clock}
+
+    def fail(self, path: str, *statuses: int):
+        self.failures.setdefault(path, []).extend(statuses)
+
+    def handle(self, path: str, query: dict) -> tuple[int, dict, dict]:
+        with self.lock:
+            self.requests.append(path)
+            failures = self.failures.get(path)
+            if failures:
+                return failures.pop(0), {"Retry-After": "0"}, {"detail": "try again"}
+        if path == "/records":
+            since = int(query.get("since", ["0"])[0])
+            offset = int(query.get("page_token", ["0"])[0])
+            changed = sorted((r for r in self.records.values() if r["changed"] > since), key=lambda r: r["changed"])
+            page = changed[offset:offset + self.page_size]
+            more = offset + self.page_size < len(changed)
+            return 200, {}, {
+                "records": [{"id": r["id"]} for r in page],
+                "next_page_token": str(offset + self.page_size) if more else None,
+                "cursor": str(max([since] + [r["changed"] for r in changed])),
+            }
+        record = self.records.get(path.removeprefix("/records/"))
+        if record is None:
+            return 404, {}, {"detail": "not found"}
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.02)
+        with self.lock:
+            self.in_flight -= 1
+        return 200, {}, {"id": record["id"], "title": record["title"], "body": record["body"]}
+
+@pytest.fixture()
+def fake_source():
+    source = FakeSource()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            status, headers, body = source.handle(url.path, parse_qs(url.query))
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            for name, value in {**headers, "Content-Type": "application/json", "Content-Length": str(len(payload))}.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    source.url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield source
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture()
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(connectors, "CONNECTOR_BACKOFF_SECONDS", 0)
+
+def make_source(db_session, username: str, url: str, **config) -> ConnectorSource:
+    user = user_service.create_user(db_session, UserCreate(username=username, email=f"{username}@example.com", password="pw"))
+    source = ConnectorSource(owner_id=user.id, org_id=user.org_id, kind="http_json", base_url=url, config=config or None)
+    db_session.add(source)
+    db_session.commit()
+    return source
+
+def synced_items(db_session, source_id: int) -> dict[str, tuple]:
+    rows = db_session.execute(
+        Item.__table__.select()
+        .with_only_columns(SourceRecord.external_id, Item.title, Item.description, Item.version)
+        .join_from(Item.__table__, SourceRecord.__table__, SourceRecord.item_id == Item.id)
+        .where(SourceRecord.source_id == source_id)
+    )
+    return {external_id: (title, description, version) for external_id, title, description, version in rows}
+
+def test_delta_sync_writes_only_changed_records(db_session, fake_source):
+    for n in range(5):
+        fake_source.put(f"doc-{n}", f"Doc {n}", f"Body {n}")
+    source = make_source(db_session, "syncer", fake_source.url, rate_limit="1000/second")
+
+    result = connectors.sync_sources(db_session, [source.id])[source.id]
+    assert len(result["created"]) == 5 and result["updated"] == [] and result["unchanged"] == 0
+    assert synced_items(db_session, source.id)["doc-3"] == ("Doc 3", "Body 3", 1)
+    db_session.refresh(source)
+    assert source.cursor == "5" and source.last_synced_at is not None
+
+    # Nothing changed: one listing request and no fetches.
+    fake_source.requests.clear()
+    result = connectors.sync_sources(db_session, [source.id])[source.id]
+    assert result["fetched"] == 0 and fake_source.requests == ["/records"]
+
+    fake_source.put("doc-1", "Doc 1", "Edited body")
+    fake_source.put("doc-2", "Doc 2", "Body 2")  # touched upstream, same content
+    fake_source.put("doc-9", "Doc 9", "New body")
+    fake_source.requests.clear()
+    result = connectors.sync_sources(db_session, [source.id])[source.id]
+    assert sorted(fake_source.requests) == ["/records", "/records", "/records/doc-1", "/records/doc-2", "/records/doc-9"]
+    assert len(result["created"]) == 1 and len(result["updated"]) == 1 and result["unchanged"] == 1
+    items = synced_items(db_session, source.id)
+    assert items["doc-1"] == ("Doc 1", "Edited body", 2)
+    assert items["doc-2"] == ("Doc 2", "Body 2", 1)
+    assert items["doc-9"] == ("Doc 9", "New body", 1)
+    assert len(items) == 6
+
+def test_fetches_run_concurrently_up_to_the_limit(db_session, fake_source):
+    for n in range(12):
+        fake_source.put(f"c-{n}", f"C {n}", "x")
+    source = make_source(db_session, "concurrent", fake_source.url, rate_limit="1000/second", concurrency=4)
+    result = connectors.sync_sources(db_session, [source.id])[source.id]
+    assert len(result["created"]) == 12
+    assert 1 < fake_source.max_in_flight <= 4
+
+def test_transient_failures_are_retried(db_session, fake_source, no_backoff):
+    fake_source.put("r-1", "R 1", "x")
+    fake_source.put("r-2", "R 2", "y")
+    fake_source.fail("/records", 429)
+    fake_source.fail("/records/r-2", 503, 502)
+    source = make_source(db_session, "retrier", fake_source.url, rate_limit="1000/second")
+    result = connectors.sync_sources(db_session, [source.id])[source.id]
+    assert len(result["created"]) == 2 and result["retries"] == 3
+
+def test_failed_sync_keeps_the_cursor(db_session, fake_source, no_backoff, monkeypatch):
+    monkeypatch.setattr(connectors, "CONNECTOR_MAX_RETRIES", 1)
+    fake_source.put("f-1", "F 1", "x")
+    fake_source.fail("/records/f-1", 500, 500)
+    source = make_source(db_session, "failer", fake_source.url, rate_limit="1000/second")
+    result = connectors.sync_sources(db_session, [source.id])[source.id]
+    assert "error" in result
+    db_session.refresh(source)
+    assert source.cursor is None
+    assert len(connectors.sync_sources(db_session, [source.id])[source.id]["created"]) == 1
+
+def test_requests_are_throttled_per_source(fake_source):
+    async def run():
+        async with connectors.new_http_client() as http:
+            client = connectors.SourceClient(http, "source:throttle-test", fake_source.url, rate_limit.Rate(capacity=1, refill_per_second=20))
+            started = time.perf_counter()
+            await asyncio.gather(*(client.get_json("/records") for _ in range(5)))
+            return time.perf_counter() - started
+    assert asyncio.run(run()) >= 0.19
+
+def test_sync_job_checks_ownership(client, db_session, fake_source):
+    fake_source.put("j-1", "Job doc", "from the job")
+    source = make_source(db_session, "jobsyncer", fake_source.url, rate_limit="1000/second")
+    token = client.post("/token", data={"username": "jobsyncer", "password": "pw"}).json()["access_token"]
+    job = client.post(
+        "/jobs/", json={"job_type": "sync_connector", "related_id": source.id}, headers={"Authorization": f"Bearer {token}"}
+    ).json()
+    assert job["status"] == "done", job
+    assert len(job["result"]["created"]) == 1
+
+    client.post("/users/", json={"username": "jobsnoop", "email": "jobsnoop@example.com", "password": "pw"})
+    other = client.post("/token", data={"username": "jobsnoop", "password": "pw"}).json()["access_token"]
+    job = client.post(
+        "/jobs/", json={"job_type": "sync_connector", "related_id": source.id}, headers={"Authorization": f"Bearer {other}"}
+    ).json()
+    assert job["status"] == "failed"
+
+def test_periodic_task_syncs_every_source(db_session, fake_source, monkeypatch):
+    # Sources from earlier tests point at servers that are gone; fail those fast.
+    monkeypatch.setattr(connectors, "CONNECTOR_MAX_RETRIES", 0)
+    monkeypatch.setattr(connectors, "CONNECTOR_TIMEOUT_SECONDS", 2)
+    fake_source.put("p-1", "Periodic", "x")
+    source = make_source(db_session, "periodic", fake_source.url, rate_limit="1000/second")
+    tasks.sync_connectors.delay()
+    assert "p-1" in synced_items(db_session, source.id)
+
+def test_failed_apply_does_not_abort_other_sources(db_session, fake_source, monkeypatch):
+    fake_source.put("a-1", "Applied", "x")
+    broken = make_source(db_session, "applybroken", fake_source.url, rate_limit="1000/second")
+    healthy = make_source(db_session, "applyhealthy", fake_source.url, rate_limit="1000/second")
+    apply_changes = connectors.apply_changes
+
+    def flaky_apply(db, source, pulled):
+        if source.id == broken.id:
+            db.add(Item(title="half-written", owner_id=source.owner_id, org_id=source.org_id))
+            db.flush()
+            raise ValueError("bad record")
+        return apply_changes(db, source, pulled)
+
+    monkeypatch.setattr(connectors, "apply_changes", flaky_apply)
+    results = connectors.sync_sources(db_session, [broken.id, healthy.id])
+    assert results[broken.id] == {"error": "bad record"}
+    assert len(results[healthy.id]["created"]) == 1
+    assert db_session.query(Item).filter(Item.title == "half-written").count() == 0
+    db_session.refresh(broken)
+    assert broken.cursor is None
+
+def test_sources_are_created_and_listed_per_owner(client, fake_source, auth_header):
+    fake_source.put("api-1", "From the API", "created over HTTP")
+    auth = auth_header("sourcer")
+    resp = client.post("/connectors/", json={
+        "kind": "http_json", "base_url": fake_source.url + "/", "config": {"token": "secret", "rate_limit": "1000/second"}
+    }, headers=auth)
+    assert resp.status_code == 201, resp.text
+    source = resp.json()
+    assert source["base_url"] == fake_source.url and "config" not in source
+
+    job = client.post("/jobs/", json={"job_type": "sync_connector", "related_id": source["id"]}, headers=auth).json()
+    assert job["status"] == "done" and len(job["result"]["created"]) == 1
+    (listed,) = client.get("/connectors/", headers=auth).json()
+    assert listed["id"] == source["id"] and listed["last_synced_at"] is not None
+
+    assert client.get("/connectors/", headers=auth_header("sourcer_other")).json() == []
+    bad = [{"kind": "ftp", "base_url": "http://x"}, {"kind": "http_json", "base_url": "file:///etc"},
+           {"kind": "http_json", "base_url": "http://x", "config": {"rate_limit": "fast"}}]
+    assert [client.post("/connectors/", json=body, headers=auth).status_code for body in bad] == [400, 422, 400]
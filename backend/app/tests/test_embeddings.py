@@ -0,0 +1,55 @@
+import numpy as np
+from app.core import embeddings
+from app.models.item import Item
+
+def test_hashing_embedder_is_deterministic_and_normalized():
+    embedder = embeddings.HashingEmbedder(dimensions=64)
+    first = embedder.embed(["red garden hose", ""])
+    second = embedder.embed(["red garden hose", ""])
+    assert first.shape == (2, 64)
+    np.testing.assert_array_equal(first, second)
+    assert np.isclose(np.linalg.norm(first[0]), 1.0)
+    assert not first[1].any()
+
+def test_top_k_cosine_matches_brute_force():
+    rng = np.random.default_rng(0)
+    matrix = rng.normal(size=(500, 32)).astype(np.float32)
+    query = rng.normal(size=32).astype(np.float32)
+    order, scores = embeddings.top_k_cosine(matrix, query, 10)
+    reference = (matrix @ query) / (np.linalg.norm(matrix, axis=1) * np.linalg.norm(query))
+    assert list(order) == list(np.argsort(-reference)[:10])
+    np.testing.assert_allclose(scores, reference[order], rtol=1e-5)
+    assert len(embeddings.top_k_cosine(matrix[:3], query, 10)[0]) == 3
+
+def test_items_are_embedded_on_create(client, db_session, auth_header):
+    auth = auth_header("embedder")
+    item_id = client.post("/items/", json={"title": "Garden hose", "description": "Green rubber hose"}, headers=auth).json()["id"]
+    resp = client.post("/items/bulk", json=[{"title": "Rake"}, {"title": "Toaster"}], headers=auth)
+    ids = [item_id] + resp.json()["created_ids"]
+    stored = {item.id: item for item in db_session.query(Item).filter(Item.id.in_(ids))}
+    assert all(stored[i].embedding is not None for i in ids)
+    assert stored[item_id].version == 1
+    expected = embeddings.get_embedder().embed(["Garden hose\nGreen rubber hose"])[0]
+    np.testing.assert_allclose(stored[item_id].embedding, expected, rtol=1e-6)
+
+def test_similar_by_text_and_item_scoped_to_owner(client, auth_header):
+    auth = auth_header("similar")
+    hose = client.post("/items/", json={"title": "Garden hose", "description": "green garden hose"}, headers=auth).json()
+    client.post("/items/", json={"title": "Garden sprinkler", "description": "garden water"}, headers=auth)
+    client.post("/items/", json={"title": "Toaster", "description": "kitchen bread"}, headers=auth)
+    other = auth_header("similar_other")
+    foreign = client.post("/items/", json={"title": "Garden hose", "description": "green garden hose"}, headers=other).json()
+
+    resp = client.get("/items/similar", params={"q": "green garden hose", "k": 2}, headers=auth)
+    assert resp.status_code == 200, resp.text
+    hits = resp.json()["items"]
+    assert [hit["id"] for hit in hits][0] == hose["id"]
+    assert len(hits) == 2 and hits[0]["score"] >= hits[1]["score"]
+    assert foreign["id"] not in [hit["id"] for hit in hits]
+
+    resp = client.get("/items/similar", params={"item_id": hose["id"], "k": 5}, headers=auth)
+    titles = [hit["title"] for hit in resp.json()["items"]]
+    assert titles[0] == "Garden sprinkler" and "Garden hose" not in titles
+
+    assert client.get("/items/similar", params={"item_id": foreign["id"]}, headers=auth).status_code == 404
+    assert client.get("/items/similar", headers=auth).status_code == 400
@@ -0,0 +1,37 @@
+from app.services import user_service
+
+def test_item_etag_returns_304(client, auth_header):
+    auth = auth_header("tagger")
+    item_id = client.post("/items/", json={"title": "Vase"}, headers=auth).json()["id"]
+    first = client.get(f"/items/{item_id}", headers=auth)
+    tag = first.headers["ETag"]
+    assert first.json()["version"] == 1
+    resp = client.get(f"/items/{item_id}", headers={**auth, "If-None-Match": tag})
+    assert resp.status_code == 304
+    assert resp.headers["ETag"] == tag
+    assert resp.content == b""
+    resp = client.get(f"/items/{item_id}", headers={**auth, "If-None-Match": '"stale"'})
+    assert resp.status_code == 200
+
+def test_item_list_etag_changes_after_write(client, auth_header):
+    auth = auth_header("lister")
+    client.post("/items/", json={"title": "One"}, headers=auth)
+    tag = client.get("/items/", headers=auth).headers["ETag"]
+    assert client.get("/items/", headers={**auth, "If-None-Match": tag}).status_code == 304
+    assert client.get("/items/", params={"limit": 1}, headers={**auth, "If-None-Match": tag}).status_code == 200
+    client.post("/items/", json={"title": "Two"}, headers=auth)
+    resp = client.get("/items/", headers={**auth, "If-None-Match": tag})
+    assert resp.status_code == 200
+    assert len(resp.json()["items"]) == 2
+
+def test_current_user_etag_tracks_row_version(client, db_session, auth_header):
+    auth = auth_header("profiled")
+    tag = client.get("/users/me", headers=auth).headers["ETag"]
+    assert client.get("/users/me", headers={**auth, "If-None-Match": f"W/{tag}"}).status_code == 304
+    user = user_service.get_user_by_username(db_session, "profiled")
+    user_service.deactivate_user(db_session, user)
+    assert user.version == 2
+    resp = client.get("/users/me", headers={**auth, "If-None-Match": tag})
+    assert resp.status_code == 200
+    assert resp.json()["is_active"] is False
+    assert resp.headers["ETag"] != tag
@@ -0,0 +1,45 @@
+import asyncio
+import pytest
+from passlib.context import CryptContext
+from app.core import hashing, security
+from app.models.organization import Organization
+from app.models.user import User
+from app.services import user_service
+
+def test_hash_and_verify_in_executor():
+    async def run():
+        hashed = await hashing.hash_password("s3cret")
+        assert await hashing.verify_password("s3cret", hashed) is True
+        assert await hashing.verify_password("nope", hashed) is False
+    asyncio.run(run())
+    assert hashing.in_flight() == 0
+
+def test_saturated_queue_rejects(monkeypatch):
+    monkeypatch.setattr(hashing, "PASSWORD_HASH_QUEUE_SIZE", 1)
+    async def run():
+        first = asyncio.ensure_future(hashing.hash_password("one"))
+        await asyncio.sleep(0)
+        with pytest.raises(hashing.HasherBusyError) as exc:
+            await hashing.hash_password("two")
+        assert exc.value.retry_after == hashing.PASSWORD_HASH_RETRY_AFTER_SECONDS
+        assert security.verify_password("one", await first)
+    asyncio.run(run())
+
+def test_login_returns_503_when_hasher_saturated(client, monkeypatch):
+    client.post("/users/", json={"username": "busy", "email": "busy@example.com", "password": "pw"})
+    monkeypatch.setattr(hashing, "PASSWORD_HASH_QUEUE_SIZE", 0)
+    resp = client.post("/token", data={"username": "busy", "password": "pw"})
+    assert resp.status_code == 503
+    assert resp.headers["Retry-After"] == str(hashing.PASSWORD_HASH_RETRY_AFTER_SECONDS)
+
+def test_login_rehashes_when_rounds_change(client, db_session):
+    weak = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash("pw")
+    db_session.add(User(username="legacy", email="legacy@example.com", hashed_password=weak, organization=Organization(name="legacy")))
+    db_session.commit()
+    resp = client.post("/token", data={"username": "legacy", "password": "pw"})
+    assert resp.status_code == 200
+    db_session.expire_all()
+    user = user_service.get_user_by_username(db_session, "legacy")
+    assert user.hashed_password != weak
+    assert not security.pwd_context.needs_update(user.hashed_password)
+    assert security.verify_password("pw", user.hashed_password)
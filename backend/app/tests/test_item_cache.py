@@ -0,0 +1,143 @@
+import asyncio
+import time
+from app.core.cache import MemoryCacheBackend, RedisCacheBackend, SingleFlight
+from app.schemas.item import ItemRead
+from app.services import item_cache
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        value, expires_at = self.data.get(key, (None, None))
+        if expires_at is not None and expires_at <= time.monotonic():
+            self.data.pop(key)
+            return None
+        return value
+
+    def set(self, key, value, px=None):
+        self.data[key] = (value.encode(), time.monotonic() + px / 1000 if px else None)
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def scan_iter(self, match):
+        prefix = match.rstrip("*")
+        return [key for key in list(self.data) if key.startswith(prefix)]
+
+class FakeAsyncRedis:
+    def __init__(self, sync: FakeRedis):
+        self.sync = sync
+
+    async def get(self, key):
+        return self.sync.get(key)
+
+    async def set(self, key, value, px=None):
+        self.sync.set(key, value, px=px)
+
+    async def delete(self, *keys):
+        self.sync.delete(*keys)
+
+def test_item_reads_are_served_from_cache(client, query_budget, auth_header):
+    auth = auth_header("poller")
+    client.get("/users/me", headers=auth)
+    item_id = client.post("/items/", json={"title": "Kettle"}, headers=auth).json()["id"]
+    client.get(f"/items/{item_id}", headers=auth)
+    client.get("/items/", headers=auth)
+    with query_budget(0):
+        assert client.get(f"/items/{item_id}", headers=auth).json()["title"] == "Kettle"
+        assert [item["title"] for item in client.get("/items/", headers=auth).json()["items"]] == ["Kettle"]
+
+def test_writes_invalidate_list_cache(client, auth_header):
+    auth = auth_header("writer")
+    assert client.get("/items/", headers=auth).json()["items"] == []
+    client.post("/items/", json={"title": "First"}, headers=auth)
+    assert len(client.get("/items/", headers=auth).json()["items"]) == 1
+    client.post("/items/bulk", json=[{"title": "Second"}, {"title": "Third"}], headers=auth)
+    assert len(client.get("/items/", headers=auth).json()["items"]) == 3
+
+def test_single_flight_collapses_concurrent_loads():
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "value"
+
+    async def run():
+        flight = SingleFlight()
+        return await asyncio.gather(*(flight.run("key", loader) for _ in range(10)))
+
+    assert asyncio.run(run()) == ["value"] * 10
+    assert calls == 1
+
+def test_owner_version_changes_on_invalidation(monkeypatch):
+    monkeypatch.setattr(item_cache, "backend", MemoryCacheBackend())
+    page_key = lambda: asyncio.run(item_cache.page_key(owner_id=7, limit=10, after_id=None))
+    first = page_key()
+    assert page_key() == first
+    item_cache.invalidate_owner(7)
+    second = page_key()
+    assert second != first
+    asyncio.run(item_cache.invalidate_owner_async(7))
+    assert page_key() != second
+
+def test_owner_version_expires_in_processes_that_missed_the_write(monkeypatch):
+    monkeypatch.setattr(item_cache, "ITEM_CACHE_TTL_SECONDS", 0.05)
+    # Another worker's memory backend: it never sees this process's invalidations.
+    monkeypatch.setattr(item_cache, "backend", MemoryCacheBackend())
+    version = asyncio.run(item_cache.owner_version(7))
+    assert asyncio.run(item_cache.owner_version(7)) == version
+    time.sleep(0.06)
+    assert asyncio.run(item_cache.owner_version(7)) != version
+
+def test_load_racing_an_invalidation_is_not_cached(monkeypatch):
+    monkeypatch.setattr(item_cache, "backend", MemoryCacheBackend())
+    stale = ItemRead(id=5, title="Before", owner_id=1)
+
+    async def loader():
+        # The row is updated and invalidated while this load is in flight.
+        item_cache.invalidate_item(5, owner_id=1)
+        return stale
+
+    async def page_loader():
+        await item_cache.invalidate_owner_async(1)
+        return [stale.model_dump()], None
+
+    async def run():
+        assert (await item_cache.get_or_load_item(5, loader)).title == "Before"
+        assert await item_cache.backend.aget(item_cache.item_key(5)) is None
+        version = await item_cache.owner_version(1)
+        await item_cache.get_or_load_page(1, 10, None, page_loader)
+        assert await item_cache.backend.aget(item_cache._page_key(1, version, 10, None)) is None
+        fresh = ItemRead(id=5, title="After", owner_id=1)
+
+        async def fresh_loader():
+            return fresh
+        assert (await item_cache.get_or_load_item(5, fresh_loader)).title == "After"
+        assert (await item_cache.get_or_load_item(5, loader)).title == "After"
+
+    asyncio.run(run())
+
+def test_redis_backend_against_stand_in():
+    fake = FakeRedis()
+    backend = RedisCacheBackend(client=fake, async_client=FakeAsyncRedis(fake), prefix="t:")
+    backend.set("a", "1", ttl_seconds=0.05)
+    backend.set("b", "2")
+    assert backend.get("a") == "1" and backend.get("b") == "2"
+    backend.delete("b")
+    assert backend.get("b") is None
+    time.sleep(0.06)
+    assert backend.get("a") is None
+    backend.set("c", "3")
+    backend.clear()
+    assert backend.get("c") is None
+
+    async def run():
+        await backend.aset("d", "4")
+        assert await backend.aget("d") == "4" and backend.get("d") == "4"
+        await backend.adelete("d")
+        return await backend.aget("d")
+    assert asyncio.run(run()) is None
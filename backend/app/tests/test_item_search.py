@@ -0,0 +1,44 @@
+from app.services import item_service
+
+def test_search_ranks_and_scopes_to_owner(client, auth_header):
+    auth = auth_header("searcher")
+    client.post("/items/", json={"title": "Garden hose", "description": "Green rubber hose for the garden"}, headers=auth)
+    client.post("/items/", json={"title": "Rake", "description": "Garden rake"}, headers=auth)
+    client.post("/items/", json={"title": "Toaster", "description": "Kitchen"}, headers=auth)
+    other = auth_header("outsider")
+    client.post("/items/", json={"title": "Garden gnome"}, headers=other)
+
+    resp = client.get("/items/search", params={"q": "garden"}, headers=auth)
+    assert resp.status_code == 200, resp.text
+    hits = resp.json()["items"]
+    assert {hit["title"] for hit in hits} == {"Garden hose", "Rake"}
+    assert hits[0]["rank"] >= hits[1]["rank"]
+
+    resp = client.get("/items/search", params={"q": "garden hose"}, headers=auth)
+    assert [hit["title"] for hit in resp.json()["items"]] == ["Garden hose"]
+
+    resp = client.get("/items/search", params={"q": 'kitchen" OR *'}, headers=auth)
+    assert resp.status_code == 200
+
+def test_search_cursor_pagination(client, auth_header):
+    auth = auth_header("pager")
+    for i in range(5):
+        client.post("/items/", json={"title": f"Widget {i}", "description": "widget"}, headers=auth)
+    seen = []
+    params = {"q": "widget", "limit": 2}
+    while True:
+        page = client.get("/items/search", params=params, headers=auth).json()
+        seen.extend(hit["id"] for hit in page["items"])
+        if page["next_cursor"] is None:
+            break
+        params["after"] = page["next_cursor"]
+    assert len(seen) == 5 and len(set(seen)) == 5
+
+    bad = client.get("/items/search", params={"q": "other", "after": params["after"]}, headers=auth)
+    assert bad.status_code == 400
+
+def test_search_on_unsupported_database_is_501(client, monkeypatch, auth_header):
+    auth = auth_header("unsearchable")
+    monkeypatch.setattr(item_service, "_SEARCH_SQL", {})
+    resp = client.get("/items/search", params={"q": "anything"}, headers=auth)
+    assert resp.status_code == 501
@@ -1,14 +1,48 @@
+import asyncio
 from app.services import item_service, user_service
 from app.schemas.item import ItemCreate
 from app.schemas.user import UserCreate
 
 def test_create_and_get_items(db_session):
     user = user_service.create_user(db_session, UserCreate(username="owner", email="owner@test.com", password="pass"))
-    item1 = item_service.create_item(db_session, ItemCreate(title="Item1", description="Desc1"), owner_id=user.id)
-    item2 = item_service.create_item(db_session, ItemCreate(title="Item2", description=None), owner_id=user.id)
+    item1 = item_service.create_item(db_session, ItemCreate(title="Item1", description="Desc1"), owner_id=user.id, org_id=user.org_id)
+    item2 = item_service.create_item(db_session, ItemCreate(title="Item2", description=None), owner_id=user.id, org_id=user.org_id)
     assert item1.id is not None and item2.id is not None
     items = item_service.get_items_by_owner(db_session, owner_id=user.id)
     titles = {item.title for item in items}
     assert "Item1" in titles and "Item2" in titles
     got = item_service.get_item(db_session, item1.id)
-    assert got.title == "Item1" 
\ No newline at end of file
+    assert got.title == "Item1" 
+
+def test_create_items_bulk_isolates_failing_rows(db_session):
+    user = user_service.create_user(db_session, UserCreate(username="bulkowner", email="bulk@test.com", password="pass"))
+    batch = [ItemCreate(title="ok-1"), ItemCreate.model_construct(title=None, description=None), ItemCreate(title="ok-2")]
+    ids, errors = item_service.create_items_bulk(db_session, batch, owner_id=user.id, org_id=user.org_id, chunk_size=2)
+    assert ids[1] is None and ids[0] is not None and ids[2] is not None
+    assert list(errors) == [1]
+    titles = [item.title for item in item_service.get_items_by_owner(db_session, owner_id=user.id)]
+    assert sorted(titles) == ["ok-1", "ok-2"]
+
+
+def test_async_item_service(db_session, async_session_factory):
+    user = user_service.create_user(db_session, UserCreate(username="asyncowner", email="async@test.com", password="pass"))
+
+    async def run():
+        async with async_session_factory() as db:
+            first = await item_service.create_item_async(db, ItemCreate(title="A1"), owner_id=user.id, org_id=user.org_id)
+            await item_service.create_item_async(db, ItemCreate(title="A2"), owner_id=user.id, org_id=user.org_id)
+            page, last_id = await item_service.get_items_page_async(db, owner_id=user.id, limit=1)
+            assert [item.title for item in page] == ["A1"] and last_id == first.id
+            page, last_id = await item_service.get_items_page_async(db, owner_id=user.id, limit=1, after_id=last_id)
+            assert [item.title for item in page] == ["A2"] and last_id is None
+            rows, last_id = await item_service.get_item_rows_page_async(db, owner_id=user.id, limit=1)
+            assert rows == [{"id": first.id, "title": "A1", "description": None, "owner_id": user.id, "org_id": user.org_id, "version": 1}]
+            assert last_id == first.id
+            got = await item_service.get_item_async(db, first.id)
+            assert got.title == "A1"
+            rows = [row async for row in item_service.iter_items_for_export_async(db, owner_id=user.id)]
+            assert [row.title for row in rows] == ["A1", "A2"]
+            authed = await user_service.authenticate_user_async(db, "asyncowner", "pass")
+            assert authed is not None and authed.id == user.id
+
+    asyncio.run(run())
@@ -1,3 +1,7 @@
+import csv
+import io
+import json
+
 def get_auth_header_for_user(client, username, email, password):
     client.post("/users/", json={"username": username, "email": email, "password": password})
     resp = client.post("/token", data={"username": username, "password": password})
@@ -17,11 +21,11 @@ def test_list_items(client):
     auth = get_auth_header_for_user(client, "carol", "carol@example.com", "password123")
     resp = client.get("/items/", headers=auth)
     assert resp.status_code == 200
-    assert resp.json() == []
+    assert resp.json() == {"items": [], "next_cursor": None}
     client.post("/items/", json={"title": "Camera", "description": "DSLR"}, headers=auth)
     client.post("/items/", json={"title": "Tripod", "description": None}, headers=auth)
     resp2 = client.get("/items/", headers=auth)
-    items = resp2.json()
+    items = resp2.json()["items"]
     titles = {item["title"] for item in items}
     assert "Camera" in titles and "Tripod" in titles
     for item in items:
@@ -42,7 +46,74 @@ def test_read_single_item(client):
     assert res.status_code == 200
     assert res.json()["title"] == "Phone"
     auth_carol = get_auth_header_for_user(client, "carol2", "carol2@example.com", "pass")
+    # carol2 is in another organization, so the item is invisible rather than forbidden.
     res2 = client.get(f"/items/{item_id}", headers=auth_carol)
-    assert res2.status_code == 403
+    assert res2.status_code == 404
     res3 = client.get("/items/999999", headers=auth_bob)
-    assert res3.status_code == 404 
\ No newline at end of file
+    assert res3.status_code == 404
+
+def test_list_items_paginates_with_cursor(client):
+    auth = get_auth_header_for_user(client, "dave", "dave@example.com", "pass")
+    created = [client.post("/items/", json={"title": f"Item {i}"}, headers=auth).json()["id"] for i in range(5)]
+    seen = []
+    after = None
+    while True:
+        params = {"limit": 2}
+        if after:
+            params["after"] = after
+        page = client.get("/items/", params=params, headers=auth).json()
+        seen.extend(item["id"] for item in page["items"])
+        after = page["next_cursor"]
+        if after is None:
+            break
+    assert seen == sorted(created)
+
+def test_list_items_rejects_bad_cursor(client):
+    auth = get_auth_header_for_user(client, "erin", "erin@example.com", "pass")
+    assert client.get("/items/", params={"after": "not-a-cursor"}, headers=auth).status_code == 400
+    client.post("/items/", json={"title": "A"}, headers=auth)
+    client.post("/items/", json={"title": "B"}, headers=auth)
+    cursor = client.get("/items/", params={"limit": 1}, headers=auth).json()["next_cursor"]
+    other = get_auth_header_for_user(client, "frank", "frank@example.com", "pass")
+    assert client.get("/items/", params={"after": cursor}, headers=other).status_code == 400
+
+def test_export_items_ndjson_and_csv(client):
+    auth = get_auth_header_for_user(client, "gina", "gina@example.com", "pass")
+    client.post("/items/", json={"title": "Lamp", "description": "Desk, brass"}, headers=auth)
+    client.post("/items/", json={"title": "Rug"}, headers=auth)
+
+    resp = client.get("/items/export", headers=auth)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in resp.text.splitlines()]
+    assert [row["title"] for row in rows] == ["Lamp", "Rug"]
+    assert rows[1]["description"] is None
+
+    resp = client.get("/items/export", params={"format": "csv"}, headers=auth)
+    assert resp.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(resp.text)))
+    assert [row["title"] for row in rows] == ["Lamp", "Rug"]
+    assert rows[0]["description"] == "Desk, brass"
+
+    assert client.get("/items/export", params={"format": "xml"}, headers=auth).status_code == 422
+
+def test_bulk_create_items_json_and_ndjson(client):
+    auth = get_auth_header_for_user(client, "hank", "hank@example.com", "pass")
+    batch = [{"title": "One"}, {"description": "missing title"}, {"title": "Three", "description": "3"}]
+    resp = client.post("/items/bulk", json=batch, headers=auth)
+    assert resp.status_code == 200, resp.text
+    data = resp.json()
+    first, missing, third = data["created_ids"]
+    assert missing is None and first < third
+    assert [error["index"] for error in data["errors"]] == [1]
+
+    ndjson = "\n".join(json.dumps({"title": f"Line {i}"}) for i in range(3))
+    resp = client.post("/items/bulk", content=ndjson, headers={**auth, "Content-Type": "application/x-ndjson"})
+    assert resp.status_code == 200, resp.text
+    assert len(resp.json()["created_ids"]) == 3
+
+    titles = [item["title"] for item in client.get("/items/", headers=auth).json()["items"]]
+    assert titles == ["One", "Three", "Line 0", "Line 1", "Line 2"]
+
+    resp = client.post("/items/bulk", content="{not json", headers={**auth, "Content-Type": "application/json"})
+    assert resp.status_code == 400
@@ -0,0 +1,46 @@
+from app.models import job as job_model
+from app.services import job_service
+from app.workers import tasks
+from app.workers.registry import job_handler
+
+@job_handler("explode")
+def explode(db, job):
+    raise RuntimeError("boom")
+
+def test_create_and_read_job(client, auth_header):
+    auth = auth_header("jobber")
+    resp = client.post("/jobs/", json={"job_type": "echo", "payload": {"hello": "world"}}, headers=auth)
+    assert resp.status_code == 201, resp.text
+    job = resp.json()
+    assert job["status"] == "done"
+    assert job["result"] == {"hello": "world"}
+    assert job["started_at"] and job["finished_at"]
+
+    resp = client.get(f"/jobs/{job['id']}", headers=auth)
+    assert resp.status_code == 200
+    assert resp.json()["status"] == "done"
+
+    other = auth_header("snooper")
+    assert client.get(f"/jobs/{job['id']}", headers=other).status_code == 403
+    assert client.get("/jobs/999999", headers=auth).status_code == 404
+
+def test_unknown_job_type_rejected(client, auth_header):
+    auth = auth_header("jobber2")
+    resp = client.post("/jobs/", json={"job_type": "nope"}, headers=auth)
+    assert resp.status_code == 400
+
+def test_failing_handler_marks_job_failed(client, auth_header):
+    auth = auth_header("jobber3")
+    job = client.post("/jobs/", json={"job_type": "explode"}, headers=auth).json()
+    assert job["status"] == "failed"
+    assert job["error_message"] == "boom"
+
+def test_finished_job_is_not_rerun(db_session):
+    job = job_service.create_job(db_session, "echo", payload={"n": 1})
+    tasks.run_job(job.id)
+    db_session.refresh(job)
+    finished_at = job.finished_at
+    assert job.status == job_model.JOB_DONE
+    tasks.run_job(job.id)
+    db_session.refresh(job)
+    assert job.finished_at == finished_at
@@ -0,0 +1,124 @@
+import time
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from app.core import events, outbox
+from app.main import app
+from app.models.item import Item
+from app.models.outbox import OutboxEvent
+from app.schemas.item import ItemCreate
+from app.schemas.user import UserCreate
+from app.services import item_service, user_service
+from app.workers import subscribers
+
+@pytest.fixture()
+def deferred_relay(monkeypatch):
+    monkeypatch.setattr(outbox, "OUTBOX_RELAY_EAGER", False)
+
+def make_user(db_session, username: str):
+    return user_service.create_user(db_session, UserCreate(username=username, email=f"{username}@example.com", password="pw"))
+
+def events_for(db_session, topic: str) -> list[OutboxEvent]:
+    return list(db_session.scalars(select(OutboxEvent).where(OutboxEvent.topic == topic).order_by(OutboxEvent.id)))
+
+def test_events_commit_with_the_write(db_session, deferred_relay):
+    user = make_user(db_session, "outboxer")
+    assert [event.payload for event in events_for(db_session, "user.created") if event.payload["id"] == user.id] == [
+        {"id": user.id, "username": "outboxer", "org_id": user.org_id}
+    ]
+
+    item = item_service.create_item(db_session, ItemCreate(title="Lamp"), user.id, user.org_id)
+    (event,) = [event for event in events_for(db_session, "item.created") if event.payload["id"] == item.id]
+    assert event.payload["title"] == "Lamp" and event.published_at is None
+
+    outbox.record(db_session, "item.created", {"id": -1, "owner_id": user.id})
+    db_session.rollback()
+    assert not [event for event in events_for(db_session, "item.created") if event.payload["id"] == -1]
+    outbox.drain(db_session)
+
+def test_side_effects_wait_for_the_relay(db_session, deferred_relay, monkeypatch):
+    published = []
+    monkeypatch.setattr(events.bus, "publish", lambda channel, event: published.append((channel, event["event"])))
+    user = make_user(db_session, "relayed")
+    item = item_service.create_item(db_session, ItemCreate(title="Kettle", description="Steel"), user.id, user.org_id)
+    ids, _ = item_service.create_items_bulk(db_session, [ItemCreate(title="Mug"), ItemCreate(title="Tray")], user.id, user.org_id)
+    embedded = lambda: db_session.scalars(
+        select(Item.id).where(Item.id.in_([item.id, *ids]), Item.embedding.is_not(None)).execution_options(populate_existing=True)
+    ).all()
+    assert published == [] and embedded() == []
+
+    assert outbox.drain(db_session) >= 3
+    channel = events.user_channel(user.id)
+    assert published == [(channel, "item_created"), (channel, "items_created")]
+    assert sorted(embedded()) == sorted([item.id, *ids])
+    assert outbox.stats(db_session)["pending"] == 0
+
+def test_failed_delivery_is_retried(db_session, deferred_relay, monkeypatch):
+    monkeypatch.setattr(outbox, "OUTBOX_BACKOFF_SECONDS", 0)
+    delivered = []
+
+    def flaky(payloads):
+        delivered.append([payload["n"] for payload in payloads])
+        if len(delivered) == 1:
+            raise RuntimeError("downstream is down")
+
+    monkeypatch.setitem(outbox.SUBSCRIBERS, "test.flaky", [flaky])
+    for n in range(3):
+        outbox.record(db_session, "test.flaky", {"n": n})
+    db_session.commit()
+
+    outbox.relay(db_session)
+    (first, *_) = events_for(db_session, "test.flaky")
+    assert first.published_at is None and first.attempts == 1 and "downstream is down" in first.last_error
+    assert outbox.stats(db_session)["failing"] == 3
+
+    outbox.relay(db_session)
+    assert delivered == [[0, 1, 2], [0, 1, 2]]
+    assert all(event.published_at is not None for event in events_for(db_session, "test.flaky"))
+    outbox.relay(db_session)
+    assert len(delivered) == 2
+
+def test_backoff_is_capped():
+    assert outbox._backoff(1) == outbox.OUTBOX_BACKOFF_SECONDS
+    assert outbox._backoff(50) == outbox.MAX_BACKOFF_SECONDS
+
+def wait_for_relay(db_session, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while outbox.stats(db_session)["pending"]:
+        assert time.monotonic() < deadline, "outbox was not relayed"
+        db_session.rollback()
+        time.sleep(0.02)
+
+def test_api_relays_when_subscribers_only_reach_it(db_session, deferred_relay, monkeypatch):
+    # The suite's defaults: memory event bus and item cache, eager relay off here.
+    assert subscribers.in_process_backends() == ["EVENT_BUS_BACKEND", "ITEM_CACHE_BACKEND"]
+    with pytest.raises(RuntimeError, match="Refusing to relay"):
+        subscribers.relay_outbox()
+    monkeypatch.setattr(subscribers, "API_RELAY_ENABLED", True)
+    monkeypatch.setattr(outbox, "OUTBOX_RELAY_INTERVAL_SECONDS", 0.02)
+
+    with TestClient(app) as api:
+        api.post("/users/", json={"username": "apirelay", "email": "apirelay@example.com", "password": "pw"})
+        token = api.post("/token", data={"username": "apirelay", "password": "pw"}).json()["access_token"]
+        auth = {"Authorization": f"Bearer {token}"}
+        with api.websocket_connect(f"/ws?token={token}") as ws:
+            assert ws.receive_json()["event"] == "subscribed"
+            item_id = api.post("/items/", json={"title": "Relayed"}, headers=auth).json()["id"]
+            wait_for_relay(db_session)
+            event = ws.receive_json()
+            assert event["event"] == "item_created" and event["item"]["id"] == item_id
+
+        assert api.get(f"/items/{item_id}", headers=auth).json()["title"] == "Relayed"
+        list_etag = api.get("/items/", headers=auth).headers["etag"]
+        # A change committed outside the API, as a connector sync in a worker does.
+        item = db_session.get(Item, item_id)
+        item.title = "Synced"
+        outbox.record(db_session, "items.synced", {"owner_id": item.owner_id, "source_id": 0, "created": [], "updated": [item_id]})
+        db_session.commit()
+        wait_for_relay(db_session)
+        assert api.get(f"/items/{item_id}", headers=auth).json()["title"] == "Synced"
+        assert api.get("/items/", headers={**auth, "If-None-Match": list_etag}).status_code == 200
+
+def test_outbox_metrics(client):
+    client.post("/users/", json={"username": "metered", "email": "metered@example.com", "password": "pw"})
+    assert client.get("/metrics/outbox").json() == {"pending": 0, "failing": 0, "oldest_pending_seconds": 0.0}
@@ -0,0 +1,56 @@
+import json
+import logging
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from app.core import profiling
+from app.models.item import Item
+
+def test_server_timing_header_reports_queries(client, auth_header):
+    auth = auth_header("timed")
+    item_id = client.post("/items/", json={"title": "Clock"}, headers=auth).json()["id"]
+    resp = client.get(f"/items/{item_id}", headers=auth)
+    assert resp.status_code == 200
+    timing = resp.headers["Server-Timing"]
+    assert timing.startswith("db;dur=")
+    assert 'desc="1 queries"' in timing
+    assert "app;dur=" in timing
+
+def test_request_log_flags_repeated_statements(client, async_session_factory, caplog):
+    stats = profiling.QueryStats()
+    for item_id in range(profiling.SQL_N_PLUS_ONE_THRESHOLD):
+        stats.record(f"SELECT * FROM items WHERE id = {item_id}", 0.001)
+    assert stats.repeated_statements() == {"SELECT * FROM items WHERE id = ?": profiling.SQL_N_PLUS_ONE_THRESHOLD}
+
+    with caplog.at_level(logging.INFO, logger="app.sql"):
+        client.get("/")
+    record = json.loads(caplog.records[-1].getMessage())
+    assert record["path"] == "/" and record["query_count"] == 0 and "n_plus_one" not in record
+    assert caplog.records[-1].levelno == logging.INFO
+
+    app = FastAPI()
+    app.add_middleware(profiling.QueryProfilerMiddleware, enabled=True)
+
+    @app.get("/lazy")
+    async def lazy():
+        async with async_session_factory() as db:
+            for item_id in range(profiling.SQL_N_PLUS_ONE_THRESHOLD):
+                await db.execute(select(Item.title).where(Item.id == item_id))
+        return {}
+
+    with caplog.at_level(logging.INFO, logger="app.sql"), TestClient(app) as lazy_client:
+        lazy_client.get("/lazy")
+    (warning,) = [r for r in caplog.records if r.name == "app.sql" and r.levelno == logging.WARNING]
+    record = json.loads(warning.getMessage())
+    assert record["path"] == "/lazy" and record["query_count"] == profiling.SQL_N_PLUS_ONE_THRESHOLD
+    assert list(record["n_plus_one"].values()) == [profiling.SQL_N_PLUS_ONE_THRESHOLD]
+
+def test_item_endpoints_stay_within_query_budget(client, query_budget, auth_header):
+    auth = auth_header("frugal")
+    client.get("/users/me", headers=auth)
+    with query_budget(2):
+        item_id = client.post("/items/", json={"title": "Coin"}, headers=auth).json()["id"]
+    with query_budget(1):
+        client.get(f"/items/{item_id}", headers=auth)
+    with query_budget(1):
+        client.get("/items/", headers=auth)
@@ -0,0 +1,128 @@
+import asyncio
+import json
+import pytest
+from app.cli import provision_users
+from app.core import hashing, rate_limit
+from app.core.config import settings
+from app.services import provisioning_service
+
+async def lines_of(text: str):
+    for line in text.splitlines(keepends=True):
+        yield line
+
+def test_bulk_csv_reports_conflicts_and_errors(client, auth_header):
+    auth = auth_header("provisioner")
+    admin = client.get("/users/me", headers=auth).json()
+    body = (
+        "username,email,password\r\n"
+        "prov_ann,prov_ann@example.com,\"pa,ss\"\r\n"
+        "provisioner,someone@example.com,pw\r\n"
+        "prov_bob,prov_bob@example.com,pw\r\n"
+        "prov_bob,prov_bob2@example.com,pw\r\n"
+        "prov_cat,not-an-email,pw\r\n"
+        "prov_dan,\"prov_dan@example.com\",\"multi\nline\"\r\n"
+        "too,few\r\n"
+    )
+    resp = client.post("/users/bulk", content=body.encode(), headers={**auth, "Content-Type": "text/csv"})
+    assert resp.status_code == 200, resp.text
+    report = resp.json()
+    assert [(c["row"], c["username"]) for c in report["created"]] == [(1, "prov_ann"), (3, "prov_bob"), (6, "prov_dan")]
+    assert [(c["row"], c["username"]) for c in report["conflicts"]] == [(2, "provisioner"), (4, "prov_bob")]
+    assert [e["row"] for e in report["errors"]] == [5, 7]
+    assert "not-an-email" not in json.dumps(report["errors"])
+
+    token = client.post("/token", data={"username": "prov_ann", "password": "pa,ss"}).json()["access_token"]
+    me = client.get("/users/me", headers={"Authorization": f"Bearer {token}"}).json()
+    assert me["org_id"] == admin["org_id"]
+    assert client.post("/token", data={"username": "prov_dan", "password": "multi\nline"}).status_code == 200
+
+def test_bulk_ndjson_and_rejected_bodies(client, auth_header):
+    auth = auth_header("provisioner2")
+    body = '{"username": "prov_eve", "email": "prov_eve@example.com", "password": "pw"}\n{oops\n[1]\n'
+    report = client.post("/users/bulk", content=body, headers={**auth, "Content-Type": "application/x-ndjson"}).json()
+    assert [c["username"] for c in report["created"]] == ["prov_eve"]
+    assert [e["row"] for e in report["errors"]] == [2, 3]
+
+    assert client.post("/users/bulk", content="x", headers={**auth, "Content-Type": "text/plain"}).status_code == 415
+    resp = client.post("/users/bulk", content="name,mail\n", headers={**auth, "Content-Type": "text/csv"})
+    assert resp.status_code == 400
+    assert client.post("/users/bulk", content=body, headers={"Content-Type": "application/x-ndjson"}).status_code == 401
+
+def test_bulk_requires_an_org_admin(client, auth_header):
+    auth = auth_header("provisioner3")
+    assert client.get("/users/me", headers=auth).json()["role"] == "admin"
+    body = '{"username": "prov_member", "email": "prov_member@example.com", "password": "pw"}\n'
+    assert client.post("/users/bulk", content=body, headers={**auth, "Content-Type": "application/x-ndjson"}).status_code == 200
+
+    token = client.post("/token", data={"username": "prov_member", "password": "pw"}).json()["access_token"]
+    member = {"Authorization": f"Bearer {token}"}
+    assert client.get("/users/me", headers=member).json()["role"] == "member"
+    resp = client.post("/users/bulk", content=body, headers={**member, "Content-Type": "application/x-ndjson"})
+    assert resp.status_code == 403
+
+@pytest.fixture()
+def limits_on(monkeypatch):
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_ENABLED", True)
+    rate_limit.backend.clear()
+    yield
+    rate_limit.backend.clear()
+
+def test_bulk_is_rate_limited(client, limits_on, monkeypatch, auth_header):
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_ENABLED", False)
+    auth = auth_header("provisioner4")
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_ENABLED", True)
+    headers = {**auth, "Content-Type": "application/x-ndjson"}
+    capacity = rate_limit.parse_rate(settings.rate_limit_provision_ip).capacity
+    for _ in range(capacity):
+        assert client.post("/users/bulk", content="\n", headers=headers).status_code == 200
+    resp = client.post("/users/bulk", content="\n", headers=headers)
+    assert resp.status_code == 429
+    assert int(resp.headers["Retry-After"]) >= 1
+
+def test_bulk_gets_503_when_the_hasher_is_busy(client, monkeypatch, auth_header):
+    auth = auth_header("provisioner5")
+    monkeypatch.setattr(hashing, "PASSWORD_HASH_QUEUE_SIZE", 0)
+    body = '{"username": "prov_busy", "email": "prov_busy@example.com", "password": "pw"}\n'
+    resp = client.post("/users/bulk", content=body, headers={**auth, "Content-Type": "application/x-ndjson"})
+    assert resp.status_code == 503
+    assert int(resp.headers["Retry-After"]) >= 1
+
+def test_bulk_stops_at_the_row_limit(client, monkeypatch, auth_header):
+    auth = auth_header("provisioner6")
+    monkeypatch.setattr(provisioning_service, "PROVISION_MAX_ROWS", 2)
+    body = "".join(
+        json.dumps({"username": f"prov_cap{n}", "email": f"prov_cap{n}@example.com", "password": "pw"}) + "\n"
+        for n in range(4)
+    )
+    report = client.post("/users/bulk", content=body, headers={**auth, "Content-Type": "application/x-ndjson"}).json()
+    assert [c["username"] for c in report["created"]] == ["prov_cap0", "prov_cap1"]
+    assert [(e["row"], e["detail"]) for e in report["errors"]] == [(3, "Row limit of 2 reached; remaining rows were not imported")]
+
+def test_conflicts_across_chunks(async_session_factory, db_session):
+    from app.models.organization import Organization
+    org = Organization(name="chunked")
+    db_session.add(org)
+    db_session.commit()
+    text = "".join(
+        json.dumps({"username": name, "email": f"{email}@example.com", "password": "pw"}) + "\n"
+        for name, email in [("chunk_a", "a"), ("chunk_b", "b"), ("chunk_c", "a"), ("chunk_a", "z"), ("chunk_d", "d")]
+    )
+
+    async def run():
+        async with async_session_factory() as db:
+            return await provisioning_service.provision_users(db, org.id, lines_of(text), "ndjson", chunk_size=2)
+    report = asyncio.run(run())
+    assert [c["username"] for c in report["created"]] == ["chunk_a", "chunk_b", "chunk_d"]
+    assert [c["row"] for c in report["conflicts"]] == [3, 4]
+    assert report["errors"] == []
+
+def test_cli_provisions_from_file(tmp_path, monkeypatch, async_session_factory, capsys):
+    monkeypatch.setattr(provision_users.database, "AsyncSessionLocal", async_session_factory)
+    source = tmp_path / "users.csv"
+    source.write_text("username,email,password\ncli_user,cli_user@example.com,pw\ncli_bad,nope,pw\n")
+    report_path = tmp_path / "report.json"
+    assert provision_users.main([str(source), "--new-org", "CLI Org", "--report", str(report_path)]) == 1
+    report = json.loads(report_path.read_text())
+    assert [c["username"] for c in report["created"]] == ["cli_user"]
+    assert [e["row"] for e in report["errors"]] == [2]
+    assert "1 created, 0 conflicts, 1 errors" in capsys.readouterr().out
@@ -0,0 +1,89 @@
+import pytest
+from app.core import hashing, rate_limit
+
+@pytest.fixture()
+def limits_on(monkeypatch):
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_ENABLED", True)
+    rate_limit.backend.clear()
+    yield
+    rate_limit.backend.clear()
+
+def test_parse_rate():
+    assert rate_limit.parse_rate("5/minute") == rate_limit.Rate(capacity=5, refill_per_second=5 / 60)
+    assert rate_limit.parse_rate("10/hours").capacity == 10
+    with pytest.raises(ValueError):
+        rate_limit.parse_rate("5/fortnight")
+
+def test_token_bucket_refills():
+    backend = rate_limit.MemoryRateLimitBackend()
+    rate = rate_limit.Rate(capacity=2, refill_per_second=1.0)
+    assert backend.take("k", rate, now=0.0) == 0
+    assert backend.take("k", rate, now=0.0) == 0
+    assert backend.take("k", rate, now=0.0) == pytest.approx(1.0)
+    assert backend.take("k", rate, now=0.5) == pytest.approx(0.5)
+    assert backend.take("k", rate, now=1.5) == 0
+    assert backend.take("other", rate, now=1.5) == 0
+
+def test_login_is_throttled_per_username(client, limits_on, monkeypatch):
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_ENABLED", False)
+    client.post("/users/", json={"username": "throttled", "email": "throttled@example.com", "password": "pw"})
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_ENABLED", True)
+    for _ in range(5):
+        assert client.post("/token", data={"username": "Throttled", "password": "wrong"}).status_code == 401
+    resp = client.post("/token", data={"username": "throttled", "password": "pw"})
+    assert resp.status_code == 429
+    assert int(resp.headers["Retry-After"]) >= 1
+    # Another account from the same address still has its own bucket.
+    assert client.post("/token", data={"username": "someone-else", "password": "pw"}).status_code == 401
+
+def test_auth_routes_are_throttled_per_ip(client, limits_on):
+    # The IP bucket is spent before the form is even validated, so malformed floods are cheap to refuse.
+    statuses = [client.post("/token").status_code for _ in range(31)]
+    assert statuses[:30] == [422] * 30
+    assert statuses[30] == 429
+
+class ScriptOnlyRedis:
+    """Redis stand-in whose token-bucket script is backed by an in-memory bucket."""
+    def __init__(self, script):
+        self.script = script
+
+    def register_script(self, lua):
+        return self.script
+
+    def scan_iter(self, match):
+        return []
+
+def test_redis_backend_runs_the_script_asynchronously(client, limits_on, monkeypatch):
+    buckets = rate_limit.MemoryRateLimitBackend()
+
+    def blocking_script(keys, args):
+        raise AssertionError("blocking EVALSHA on the event loop")
+
+    async def async_script(keys, args):
+        return str(buckets.take(keys[0], rate_limit.Rate(int(args[0]), float(args[1]))))
+
+    monkeypatch.setattr(rate_limit, "backend", rate_limit.RedisRateLimitBackend(
+        client=ScriptOnlyRedis(blocking_script), async_client=ScriptOnlyRedis(async_script)
+    ))
+    statuses = [client.post("/token", data={"username": "redis-limited", "password": "wrong"}).status_code for _ in range(6)]
+    assert statuses == [401] * 5 + [429]
+
+def test_registration_is_throttled_per_ip(client, limits_on):
+    statuses = [
+        client.post("/users/", json={"username": f"signup{i}", "email": f"signup{i}@example.com", "password": "pw"}).status_code
+        for i in range(11)
+    ]
+    assert statuses[:10] == [201] * 10
+    assert statuses[10] == 429
+
+def test_unknown_username_still_runs_bcrypt(client, monkeypatch):
+    verified = []
+    original = hashing.verify_password
+
+    async def spy(plain, hashed):
+        verified.append(hashed)
+        return await original(plain, hashed)
+
+    monkeypatch.setattr(hashing, "verify_password", spy)
+    assert client.post("/token", data={"username": "nobody-here", "password": "pw"}).status_code == 401
+    assert verified and verified[0].startswith("$2b$")
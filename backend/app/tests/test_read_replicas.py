@@ -0,0 +1,96 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, func, select, text
+from sqlalchemy.orm import sessionmaker
+from app.core import routing
+from app.core.cache import MemoryCacheBackend
+from app.models.organization import Organization
+
+@pytest.fixture()
+def engines(tmp_path):
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    for engine in (primary, replica):
+        Organization.__table__.create(engine)
+    yield primary, replica
+    primary.dispose()
+    replica.dispose()
+
+@pytest.fixture()
+def session_factory(engines):
+    primary, replica = engines
+    return sessionmaker(class_=routing.RoutingSession, primary=primary, replicas=[replica])
+
+def org_count(db) -> int:
+    return db.scalar(select(func.count()).select_from(Organization))
+
+def test_reads_go_to_replica_and_writes_to_primary(session_factory):
+    routing.reset_stats()
+    with session_factory() as db:
+        db.add(Organization(name="acme"))
+        db.commit()
+        # The session that wrote keeps reading from the primary.
+        assert org_count(db) == 1
+    assert routing.stats()["replica"] == 0
+
+    with session_factory() as db:
+        assert org_count(db) == 0
+        with routing.use_primary():
+            assert org_count(db) == 1
+    assert routing.stats()["replica"] == 1
+
+def test_locking_reads_use_primary(session_factory):
+    with session_factory() as db:
+        db.add(Organization(name="locked"))
+        db.commit()
+    with session_factory() as db:
+        assert db.scalars(select(Organization).with_for_update()).first() is not None
+
+def test_raw_sql_reads_opt_in_to_replica(session_factory):
+    with session_factory() as db:
+        db.add(Organization(name="raw"))
+        db.commit()
+    count = "SELECT count(*) FROM organizations"
+    with session_factory() as db:
+        assert db.scalar(text(count).execution_options(replica=True)) == 0
+        # Unmarked raw SQL might write, so it goes to the primary and pins the session there.
+        assert db.scalar(text(count)) == 1
+        assert db.scalar(text(count).execution_options(replica=True)) == 1
+
+class AsyncOnlyBackend(MemoryCacheBackend):
+    def set(self, key, value, ttl_seconds=None):
+        raise AssertionError("the sticky pin must not be written synchronously from the commit hook")
+
+    async def aset(self, key, value, ttl_seconds=None):
+        self._cache.set(key, value, ttl_seconds=ttl_seconds)
+
+def test_client_is_pinned_to_primary_after_a_write(session_factory, monkeypatch):
+    monkeypatch.setattr(routing, "REPLICA_STICKY_SECONDS", 60)
+    monkeypatch.setattr(routing, "sticky_backend", AsyncOnlyBackend())
+    app = FastAPI()
+    app.add_middleware(routing.ReadYourWritesMiddleware, enabled=True)
+
+    @app.post("/orgs")
+    def create_org():
+        with session_factory() as db:
+            db.add(Organization(name="sticky"))
+            db.commit()
+        return {}
+
+    @app.get("/orgs/count")
+    def count_orgs():
+        with session_factory() as db:
+            return {"count": org_count(db)}
+
+    writer = {"Authorization": "Bearer writer-token"}
+    other = {"Authorization": "Bearer other-token"}
+    with TestClient(app) as client:
+        assert client.get("/orgs/count", headers=writer).json()["count"] == 0
+        client.post("/orgs", headers=writer)
+        assert client.get("/orgs/count", headers=writer).json()["count"] == 1
+        assert client.get("/orgs/count", headers=other).json()["count"] == 0
+
+    routing.sticky_backend.clear()
+    with TestClient(app) as client:
+        assert client.get("/orgs/count", headers=writer).json()["count"] == 0
@@ -0,0 +1,110 @@
+import asyncio
+import pytest
+from app.core import hashing, revocation
+
+def bearer(tokens):
+    return {"Authorization": f"Bearer {tokens['access_token']}"}
+
+def forbid_bcrypt(monkeypatch):
+    async def forbidden(*args, **kwargs):
+        raise AssertionError("bcrypt must not run on refresh")
+    for name in ("hash_password", "verify_password", "verify_and_update_password"):
+        monkeypatch.setattr(hashing, name, forbidden)
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = revocation.BloomFilter(capacity=1000, error_rate=0.01)
+    added = [f"session-{i}" for i in range(1000)]
+    for item in added:
+        bloom.add(item)
+    assert all(item in bloom for item in added)
+    false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+    assert false_positives < 300
+
+def test_memory_store_rotates_each_generation_once():
+    async def run():
+        store = revocation.MemoryRevocationStore(capacity=10)
+        await store.start("s", ttl_seconds=60)
+        assert await store.rotate("s", 0, ttl_seconds=60)
+        assert not await store.rotate("s", 0, ttl_seconds=60)
+        assert await store.rotate("s", 1, ttl_seconds=60)
+        # A session this process never saw (or saw expire) might have been revoked or rotated elsewhere.
+        assert not await store.rotate("unknown", 3, ttl_seconds=60)
+        await store.start("lapsed", ttl_seconds=-1)
+        assert not await store.rotate("lapsed", 0, ttl_seconds=60)
+    asyncio.run(run())
+
+def test_memory_store_never_evicts_live_sessions():
+    async def run():
+        store = revocation.MemoryRevocationStore(capacity=2)
+        await store.start("expired", ttl_seconds=-1)
+        for n in range(5):
+            await store.start(f"live-{n}", ttl_seconds=60)
+        assert "expired" not in store._sessions
+        # Over capacity, yet the oldest live session still detects reuse.
+        assert await store.rotate("live-0", 0, ttl_seconds=60)
+        assert not await store.rotate("live-0", 0, ttl_seconds=60)
+    asyncio.run(run())
+
+def test_memory_store_rebuilds_filter_without_expired_entries():
+    async def run():
+        store = revocation.MemoryRevocationStore(capacity=2)
+        await store.revoke("old", ttl_seconds=-1)
+        await store.revoke("a", ttl_seconds=60)
+        await store.revoke("b", ttl_seconds=60)
+        assert await store.is_revoked("a") and await store.is_revoked("b")
+        assert not await store.is_revoked("old")
+        assert "old" not in store._revoked
+    asyncio.run(run())
+
+def test_refresh_rotates_without_bcrypt(client, monkeypatch, login):
+    asyncio.run(revocation.reset())
+    tokens = login("refresher")
+    forbid_bcrypt(monkeypatch)
+    resp = client.post("/token/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert resp.status_code == 200, resp.text
+    rotated = resp.json()
+    assert rotated["refresh_token"] != tokens["refresh_token"]
+    assert client.get("/users/me", headers=bearer(rotated)).status_code == 200
+
+    resp = client.post("/token/refresh", json={"refresh_token": rotated["refresh_token"]})
+    assert resp.status_code == 200
+    assert revocation.stats()["bloom_skips"] >= 1
+
+def test_reused_refresh_token_revokes_the_session(client, login):
+    tokens = login("reuser")
+    rotated = client.post("/token/refresh", json={"refresh_token": tokens["refresh_token"]}).json()
+
+    resp = client.post("/token/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert resp.status_code == 401
+    # The legitimate holder's tokens die with the session too.
+    assert client.post("/token/refresh", json={"refresh_token": rotated["refresh_token"]}).status_code == 401
+    assert client.get("/users/me", headers=bearer(rotated)).status_code == 401
+    # Other logins of the same user are separate sessions.
+    again = client.post("/token", data={"username": "reuser", "password": "pw"}).json()
+    assert client.get("/users/me", headers=bearer(again)).status_code == 200
+
+def test_revoke_logs_out_the_session(client, login):
+    tokens = login("leaver")
+    assert client.get("/users/me", headers=bearer(tokens)).status_code == 200
+    assert client.post("/token/revoke", json={"refresh_token": tokens["refresh_token"]}).status_code == 204
+    assert client.get("/users/me", headers=bearer(tokens)).status_code == 401
+    assert client.post("/token/refresh", json={"refresh_token": tokens["refresh_token"]}).status_code == 401
+
+def test_token_types_are_not_interchangeable(client, login):
+    tokens = login("mixer")
+    assert client.get("/users/me", headers={"Authorization": f"Bearer {tokens['refresh_token']}"}).status_code == 401
+    assert client.post("/token/refresh", json={"refresh_token": tokens["access_token"]}).status_code == 401
+
+def test_memory_store_refuses_a_forgotten_session(client, login):
+    tokens = login("forgotten")
+    rotated = client.post("/token/refresh", json={"refresh_token": tokens["refresh_token"]}).json()
+    # As after a restart: neither the old token nor the current one is honoured.
+    revocation.backend._sessions.clear()
+    assert client.post("/token/refresh", json={"refresh_token": tokens["refresh_token"]}).status_code == 401
+    assert client.post("/token/refresh", json={"refresh_token": rotated["refresh_token"]}).status_code == 401
+
+def test_several_workers_need_the_redis_store():
+    revocation.check_deployment(1, "memory")
+    revocation.check_deployment(4, "redis")
+    with pytest.raises(RuntimeError, match="REVOCATION_BACKEND=redis"):
+        revocation.check_deployment(4, "memory")
@@ -0,0 +1,45 @@
+import asyncio
+import os
+import subprocess
+import sys
+from fastapi.testclient import TestClient
+from app.core import database, hashing
+from app.core.config import Settings
+from app.main import create_app
+from benchmarks import startup_time
+
+def test_settings_read_environment(monkeypatch):
+    monkeypatch.setenv("ITEM_CACHE_TTL_SECONDS", "42")
+    monkeypatch.setenv("CELERY_TASK_ALWAYS_EAGER", "true")
+    monkeypatch.setenv("ALLOWED_HOSTS", '["https://app.example.com"]')
+    settings = Settings(_env_file=None)
+    assert settings.item_cache_ttl_seconds == 42
+    assert settings.celery_task_always_eager is True
+    assert settings.allowed_hosts == ["https://app.example.com"]
+
+def test_importing_app_does_not_need_a_database():
+    env = {key: value for key, value in os.environ.items() if key != "DATABASE_URL"}
+    code = "import app.main, app.workers.tasks; from app.core import database; assert not database._engines"
+    subprocess.run([sys.executable, "-c", code], cwd=startup_time.BACKEND_DIR, env=env, check=True)
+
+def test_lifespan_prewarms_pool_and_hasher():
+    app = create_app(Settings(_env_file=None, database_prewarm=True, password_hash_prewarm=True, database_pool_size=2))
+    with TestClient(app) as client:
+        assert database._engines
+        assert hashing._executor is not None
+        assert client.get("/").status_code == 200
+    assert hashing._executor is None
+
+def test_prewarm_pool_opens_connections():
+    asyncio.run(database.prewarm_pool(2))
+
+def test_parse_importtime():
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   json.decoder\n"
+        "import time:       300 |        420 | json\n"
+    )
+    assert startup_time.parse_importtime(stderr) == {
+        "json.decoder": {"self_ms": 0.12, "cumulative_ms": 0.12},
+        "json": {"self_ms": 0.3, "cumulative_ms": 0.42},
+    }
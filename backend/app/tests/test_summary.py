@@ -0,0 +1,107 @@
+import asyncio
+import pytest
+from app.core import cache, llm
+from app.services import summary_service
+
+class RecordingClient:
+    model = "recording"
+
+    def __init__(self):
+        self.prompts = []
+        self.active = 0
+        self.max_active = 0
+
+    async def complete(self, prompt):
+        self.prompts.append(prompt)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        return "summary of " + prompt.split("\n\n", 1)[-1].split()[0]
+
+@pytest.fixture(autouse=True)
+def clear_summary_cache():
+    summary_service.backend.clear()
+    yield
+    summary_service.backend.clear()
+
+def document(sections):
+    return "\n\n".join(f"section{i} " + "word " * 40 for i in range(sections))
+
+def test_split_respects_token_budget():
+    chunks = summary_service.split_into_chunks(document(5) + "\n\n" + "long " * 250, max_tokens=100)
+    assert all(summary_service.count_tokens(chunk) <= 100 for chunk in chunks)
+    assert sum(summary_service.count_tokens(chunk) for chunk in chunks) == 5 * 41 + 250
+    assert summary_service.split_into_chunks("  \n\n ") == []
+
+def test_map_reduce_is_bounded_and_cached():
+    client = RecordingClient()
+    text = document(12)
+    result = asyncio.run(summary_service.summarize_text(text, client=client, max_tokens=50, concurrency=3))
+    assert result["chunks"] == 12
+    assert result["summary"].startswith("summary of")
+    assert client.max_active <= 3
+    map_calls = [p for p in client.prompts if p.startswith(summary_service.MAP_PROMPT)]
+    assert len(map_calls) == 12
+
+    client.prompts.clear()
+    asyncio.run(summary_service.summarize_text(text, client=client, max_tokens=50, concurrency=3))
+    assert client.prompts == []
+
+    edited = text.replace("section3 word", "section3 changed", 1)
+    asyncio.run(summary_service.summarize_text(edited, client=client, max_tokens=50, concurrency=3))
+    assert len([p for p in client.prompts if p.startswith(summary_service.MAP_PROMPT)]) == 1
+
+class LoopBoundRedis:
+    """Mimics a pooled redis.asyncio client: it only works on the loop that first used it."""
+    def __init__(self):
+        self.data = {}
+        self.loop = None
+
+    def _check_loop(self):
+        loop = asyncio.get_running_loop()
+        if self.loop not in (None, loop):
+            raise RuntimeError("attached to a different loop")
+        self.loop = loop
+
+    async def get(self, key):
+        self._check_loop()
+        return self.data.get(key)
+
+    async def set(self, key, value, px=None):
+        self._check_loop()
+        self.data[key] = value
+
+class DictRedis:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, px=None):
+        self.data[key] = value
+
+def test_redis_cache_works_across_job_event_loops(monkeypatch):
+    sync = DictRedis()
+    monkeypatch.setattr(summary_service, "backend", cache.RedisCacheBackend(client=sync, async_client=LoopBoundRedis()))
+    client = RecordingClient()
+    # Each summarize_item job runs under its own asyncio.run().
+    for _ in range(2):
+        asyncio.run(summary_service.summarize_text(document(2), client=client, max_tokens=50))
+    assert len(client.prompts) == 3 and len(sync.data) == 3
+
+def test_stub_client_keeps_first_sentence():
+    stub = llm.StubLLMClient()
+    assert asyncio.run(stub.complete("Instructions.\n\nFirst one. Second one.")) == "First one."
+
+def test_summarize_item_job(client, auth_header):
+    auth = auth_header("summarizer")
+    item = client.post("/items/", json={"title": "Notes", "description": "Big news today. Details follow."}, headers=auth).json()
+    job = client.post("/jobs/", json={"job_type": "summarize_item", "related_id": item["id"]}, headers=auth).json()
+    assert job["status"] == "done", job
+    assert job["result"] == {"summary": "Big news today.", "chunks": 1}
+
+    other = auth_header("summary_thief")
+    job = client.post("/jobs/", json={"job_type": "summarize_item", "related_id": item["id"]}, headers=other).json()
+    assert job["status"] == "failed"
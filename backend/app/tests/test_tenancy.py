@@ -0,0 +1,75 @@
+import asyncio
+import httpx
+from sqlalchemy import select
+from app.core import auth_cache, tenancy
+from app.main import app
+from app.models.item import Item
+from app.models.organization import Organization
+from app.models.user import User
+from app.schemas.item import ItemCreate
+from app.schemas.user import UserCreate
+from app.services import item_service, user_service
+
+def make_user(db, username):
+    return user_service.create_user(db, UserCreate(username=username, email=f"{username}@example.com", password="pw"))
+
+def test_registration_creates_personal_organization(db_session):
+    user = make_user(db_session, "founder")
+    org = db_session.get(Organization, user.org_id)
+    assert org.name == "founder"
+
+def test_orm_reads_are_filtered_to_current_org(db_session):
+    alice = make_user(db_session, "tenant_alice")
+    bob = make_user(db_session, "tenant_bob")
+    item_service.create_item(db_session, ItemCreate(title="Alice's"), owner_id=alice.id, org_id=alice.org_id)
+    item_service.create_item(db_session, ItemCreate(title="Bob's"), owner_id=bob.id, org_id=bob.org_id)
+    alice_org, bob_id = alice.org_id, bob.id
+    db_session.expunge_all()
+
+    with tenancy.scoped_to(alice_org):
+        # Asking for bob's items by owner alone still cannot cross the tenant boundary.
+        assert item_service.get_items_by_owner(db_session, owner_id=bob_id) == []
+        titles = db_session.scalars(select(Item.title).where(Item.title.like("%'s"))).all()
+        assert titles == ["Alice's"]
+        assert db_session.scalars(select(User.username).where(User.username.like("tenant_%"))).all() == ["tenant_alice"]
+        everyone = db_session.scalars(
+            select(Item.title).where(Item.title.like("%'s")).execution_options(all_tenants=True)
+        ).all()
+        assert sorted(everyone) == ["Alice's", "Bob's"]
+
+    assert len(item_service.get_items_by_owner(db_session, owner_id=bob_id)) == 1
+
+def test_async_sessions_are_filtered_too(db_session, async_session_factory):
+    alice = make_user(db_session, "async_tenant_alice")
+    bob = make_user(db_session, "async_tenant_bob")
+    item_service.create_item(db_session, ItemCreate(title="Bob's async"), owner_id=bob.id, org_id=bob.org_id)
+
+    async def run():
+        async with async_session_factory() as db:
+            with tenancy.scoped_to(alice.org_id):
+                page, _ = await item_service.get_items_page_async(db, owner_id=bob.id, limit=10)
+                assert page == []
+                rows, _ = await item_service.get_item_rows_page_async(db, owner_id=bob.id, limit=10)
+                assert rows == []
+            page, _ = await item_service.get_items_page_async(db, owner_id=bob.id, limit=10)
+            assert [item.title for item in page] == ["Bob's async"]
+    asyncio.run(run())
+
+def test_org_scope_does_not_leak_between_requests_on_one_task(client):
+    for name in ("leak_alice", "leak_bob"):
+        client.post("/users/", json={"username": name, "email": f"{name}@example.com", "password": "pw"})
+    tokens = [client.post("/token", data={"username": name, "password": "pw"}).json()["access_token"] for name in ("leak_alice", "leak_bob")]
+
+    async def run():
+        # ASGITransport runs every request inline on this task, as a keep-alive server connection can.
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as http:
+            statuses = []
+            for _ in range(3):
+                for token in tokens:
+                    resp = await http.get("/users/me", headers={"Authorization": f"Bearer {token}"})
+                    statuses.append(resp.status_code)
+            assert tenancy.current_org_id() is None
+            return statuses
+
+    auth_cache.reset()
+    assert asyncio.run(run()) == [200] * 6
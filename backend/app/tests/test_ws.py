@@ -0,0 +1,35 @@
+import pytest
+from starlette.websockets import WebSocketDisconnect
+from app.core import events
+
+def test_websocket_rejects_missing_or_bad_token(client):
+    for url in ("/ws", "/ws?token=garbage"):
+        with pytest.raises(WebSocketDisconnect) as exc:
+            with client.websocket_connect(url) as ws:
+                ws.receive_json()
+        assert exc.value.code == 1008
+
+def test_item_and_job_events_reach_owner_only(client, login):
+    token = login("listener")["access_token"]
+    other_token = login("bystander")["access_token"]
+    auth = {"Authorization": f"Bearer {token}"}
+    with client.websocket_connect(f"/ws?token={token}") as ws, \
+            client.websocket_connect(f"/ws?token={other_token}") as other_ws:
+        assert ws.receive_json()["event"] == "subscribed"
+        assert other_ws.receive_json()["event"] == "subscribed"
+
+        item_id = client.post("/items/", json={"title": "Bell"}, headers=auth).json()["id"]
+        event = ws.receive_json()
+        assert event["event"] == "item_created"
+        assert event["item"]["id"] == item_id
+
+        job_id = client.post("/jobs/", json={"job_type": "echo", "payload": {"x": 1}}, headers=auth).json()["id"]
+        updates = [ws.receive_json()["job"] for _ in range(2)]
+        assert [update["status"] for update in updates] == ["running", "done"]
+        assert {update["id"] for update in updates} == {job_id}
+
+        events.publish_to_user(None, {"event": "ignored"})
+        events.bus.publish(events.user_channel(-1), {"event": "elsewhere"})
+        other_ws.send_text("ping")
+        client.post("/items/bulk", json=[{"title": "Mine"}], headers={"Authorization": f"Bearer {other_token}"})
+        assert other_ws.receive_json()["event"] == "items_created"
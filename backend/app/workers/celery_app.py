@@ -0,0 +1,36 @@
+from celery import Celery
+from app.core.config import settings
+
+CELERY_BROKER_URL = settings.celery_broker_url or settings.redis_url or "memory://"
+CELERY_TASK_ALWAYS_EAGER = settings.celery_task_always_eager
+CONNECTOR_SYNC_INTERVAL_SECONDS = settings.connector_sync_interval_seconds
+OUTBOX_RELAY_INTERVAL_SECONDS = settings.outbox_relay_interval_seconds
+# With a memory event bus or item cache the API relays the outbox itself, since only
+# its own clients would see what subscribers publish (see app.workers.subscribers).
+OUTBOX_RELAY_IN_WORKER = "memory" not in (settings.event_bus_backend, settings.item_cache_backend)
+
+celery_app = Celery("app", broker=CELERY_BROKER_URL, include=["app.workers.tasks", "app.workers.subscribers"])
+
+# Job state lives in the jobs table, so Celery's own result backend is not used.
+celery_app.conf.update(
+    task_ignore_result=True,
+    task_acks_late=True,
+    worker_prefetch_multiplier=1,
+    task_always_eager=CELERY_TASK_ALWAYS_EAGER,
+    broker_connection_retry_on_startup=True,
+)
+
+# Run `celery beat` alongside the workers: it drives the outbox relay and, for
+# sources without webhooks, periodic delta sync.
+celery_app.conf.beat_schedule = {}
+if OUTBOX_RELAY_IN_WORKER:
+    celery_app.conf.beat_schedule["relay-outbox"] = {
+        "task": "app.workers.tasks.relay_outbox",
+        "schedule": OUTBOX_RELAY_INTERVAL_SECONDS,
+        # A relay that missed its slot is superseded by the next one.
+        "options": {"expires": OUTBOX_RELAY_INTERVAL_SECONDS},
+    }
+if CONNECTOR_SYNC_INTERVAL_SECONDS > 0:
+    celery_app.conf.beat_schedule["sync-connectors"] = {
+        "task": "app.workers.tasks.sync_connectors", "schedule": CONNECTOR_SYNC_INTERVAL_SECONDS
+    }
@@ -0,0 +1,13 @@
+JOB_HANDLERS = {}
+
+def job_handler(job_type: str):
+    def register(fn):
+        JOB_HANDLERS[job_type] = fn
+        return fn
+    return register
+
+def get_handler(job_type: str):
+    return JOB_HANDLERS.get(job_type)
+
+def is_registered(job_type: str) -> bool:
+    return job_type in JOB_HANDLERS
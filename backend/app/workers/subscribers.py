@@ -0,0 +1,113 @@
+"""Outbox subscribers, and where the relay that runs them may live.
+
+Importing this module registers the subscribers; the API (app.main) and the
+Celery worker (celery_app's include list) both do so at startup.
+
+Subscribers publish to the event bus and invalidate the item cache. With the
+memory backend for either, only clients of the process that runs the relay see
+the effect, so the relay must run in the API process: the API then relays on
+its own loop (outbox.relay_forever), beat does not schedule relay_outbox, and
+workers neither relay eagerly nor accept a relay_outbox task. With both on
+redis, beat drives relay_outbox in a worker. Either way a single API process
+is assumed unless both backends are redis.
+"""
+import logging
+from celery import signals
+from app.core import events, outbox, profiling
+from app.services import item_cache
+from app.workers import tasks
+from app.workers.celery_app import celery_app
+from app.workers.tasks import embed_items
+
+logger = logging.getLogger(__name__)
+
+# Lets the API run its relay loop; tests switch it off and relay eagerly or by hand.
+API_RELAY_ENABLED = True
+
+def in_process_backends() -> list[str]:
+    """Settings whose backend keeps subscriber effects inside the relaying process."""
+    backends = {"EVENT_BUS_BACKEND": events.EVENT_BUS_BACKEND, "ITEM_CACHE_BACKEND": item_cache.ITEM_CACHE_BACKEND}
+    return [name for name, backend in backends.items() if backend == "memory"]
+
+def relays_in_api() -> bool:
+    return API_RELAY_ENABLED and bool(in_process_backends())
+
+def check_worker_relay():
+    names = in_process_backends()
+    if names:
+        raise RuntimeError(
+            f"Refusing to relay the outbox outside the API with {', '.join(f'{name}=memory' for name in names)}: "
+            "notifications and cache invalidations would never reach API clients. Use redis, or let the API relay."
+        )
+
+def check_deployment(web_concurrency: int):
+    """Refuse to serve from several API processes when subscribers only reach one of them."""
+    names = in_process_backends()
+    if web_concurrency > 1 and names:
+        raise RuntimeError(f"WEB_CONCURRENCY={web_concurrency} needs redis for {', '.join(names)}")
+
+@signals.worker_init.connect
+def _leave_relaying_to_the_api(**kwargs):
+    # Commits made by tasks (connector syncs) then wait for the API's relay loop.
+    if outbox.OUTBOX_RELAY_EAGER and in_process_backends():
+        logger.warning("Eager outbox relay is off in workers while %s use memory", ", ".join(in_process_backends()))
+        outbox.OUTBOX_RELAY_EAGER = False
+
+# Delivery is at least once and a failing subscriber gets its whole batch
+# redelivered to every subscriber of the topic, so each of these must be safe
+# to repeat; they let errors propagate so the relay retries.
+
+@outbox.subscriber("item.created")
+def invalidate_created_item(payloads: list[dict]):
+    for item in payloads:
+        item_cache.invalidate_item(item["id"], item["owner_id"])
+
+@outbox.subscriber("item.created")
+def notify_created_item(payloads: list[dict]):
+    for item in payloads:
+        events.bus.publish(events.user_channel(item["owner_id"]), {"event": "item_created", "item": item})
+
+@outbox.subscriber("item.created")
+def embed_created_item(payloads: list[dict]):
+    embed_items.delay([item["id"] for item in payloads])
+
+@outbox.subscriber("items.created")
+def invalidate_created_items(payloads: list[dict]):
+    for owner_id in {payload["owner_id"] for payload in payloads}:
+        item_cache.invalidate_owner(owner_id)
+
+@outbox.subscriber("items.created")
+def notify_created_items(payloads: list[dict]):
+    for payload in payloads:
+        events.bus.publish(events.user_channel(payload["owner_id"]), {"event": "items_created", "ids": payload["ids"]})
+
+@outbox.subscriber("items.created")
+def embed_created_items(payloads: list[dict]):
+    embed_items.delay([item_id for payload in payloads for item_id in payload["ids"]])
+
+@outbox.subscriber("items.synced")
+def invalidate_synced_items(payloads: list[dict]):
+    for payload in payloads:
+        for item_id in payload["updated"]:
+            item_cache.invalidate_item(item_id, payload["owner_id"])
+        item_cache.invalidate_owner(payload["owner_id"])
+
+@outbox.subscriber("items.synced")
+def notify_synced_items(payloads: list[dict]):
+    for payload in payloads:
+        events.bus.publish(events.user_channel(payload["owner_id"]), {
+            "event": "items_synced", "source_id": payload["source_id"],
+            "created": payload["created"], "updated": payload["updated"]
+        })
+
+@outbox.subscriber("items.synced")
+def embed_synced_items(payloads: list[dict]):
+    embed_items.delay([item_id for payload in payloads for item_id in payload["created"] + payload["updated"]])
+
+@celery_app.task(name="app.workers.tasks.relay_outbox")
+def relay_outbox():
+    """Deliver every due outbox event, then drop old delivered ones; beat runs this continuously."""
+    check_worker_relay()
+    with profiling.detached(), tasks.session_factory() as db:
+        outbox.drain(db)
+        outbox.purge(db)
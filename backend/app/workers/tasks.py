@@ -0,0 +1,75 @@
+import asyncio
+import logging
+from app.core import profiling
+from app.core.database import SessionLocal
+from sqlalchemy import select
+from app.models import job as job_model, item as item_model
+from app.models.connector import ConnectorSource
+from app.services import job_service, embedding_service, summary_service
+from app.workers import connectors
+from app.workers.celery_app import celery_app
+from app.workers.registry import job_handler, get_handler
+
+logger = logging.getLogger(__name__)
+
+# Swapped by tests so eager tasks use the test database.
+session_factory = SessionLocal
+
+@job_handler("echo")
+def echo(db, job):
+    return job.payload
+
+@job_handler("summarize_item")
+def summarize_item(db, job):
+    item = db.get(item_model.Item, job.related_id) if job.related_id is not None else None
+    if item is None or item.owner_id != job.user_id:
+        raise LookupError(f"Item {job.related_id} not found")
+    return asyncio.run(summary_service.summarize_text(item.description or item.title))
+
+@job_handler("sync_connector")
+def sync_connector(db, job):
+    source = db.get(ConnectorSource, job.related_id) if job.related_id is not None else None
+    if source is None or source.owner_id != job.user_id:
+        raise LookupError(f"Connector source {job.related_id} not found")
+    result = connectors.sync_sources(db, [source.id])[source.id]
+    if "error" in result:
+        raise RuntimeError(result["error"])
+    return result
+
+@celery_app.task(name="app.workers.tasks.sync_connectors")
+def sync_connectors(source_ids: list[int] | None = None):
+    """Sync the given sources, or every source, sharing one connection pool."""
+    with profiling.detached(), session_factory() as db:
+        if source_ids is None:
+            source_ids = list(db.scalars(select(ConnectorSource.id)))
+        results = connectors.sync_sources(db, source_ids)
+    failed = [source_id for source_id, result in results.items() if "error" in result]
+    if failed:
+        logger.warning("Connector sync failed for sources %s", failed)
+
+@celery_app.task(name="app.workers.tasks.run_job")
+def run_job(job_id: int):
+    with session_factory() as db:
+        job = job_service.get_job(db, job_id)
+        # A redelivered message for a finished job is a no-op.
+        if job is None or job.status in (job_model.JOB_DONE, job_model.JOB_FAILED):
+            return
+        job_service.mark_running(db, job)
+        handler = get_handler(job.job_type)
+        try:
+            if handler is None:
+                raise LookupError(f"No handler registered for job type {job.job_type!r}")
+            result = handler(db, job)
+        except Exception as exc:
+            db.rollback()
+            job_service.mark_failed(db, job, str(exc))
+            return
+        job_service.mark_done(db, job, result)
+
+def enqueue_job(job: job_model.Job):
+    run_job.apply_async(args=[job.id], task_id=job.celery_task_id)
+
+@celery_app.task(name="app.workers.tasks.embed_items")
+def embed_items(item_ids: list[int]):
+    with profiling.detached(), session_factory() as db:
+        embedding_service.embed_items(db, item_ids)
@@ -0,0 +1,236 @@
+"""HTTP latency and throughput benchmark for the API.
+
+Seeds users and items, drives the ASGI app in-process with httpx.AsyncClient
+and reports requests/second and p50/p95/p99 per endpoint.
+
+    DATABASE_URL=sqlite:///./bench.db python -m benchmarks.http_bench --output bench.json
+    python -m benchmarks.http_bench --compare bench.json --threshold 0.15
+
+The target database is dropped and recreated, so never point it at real data.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+
+import httpx
+from sqlalchemy import insert
+
+SEED_CHUNK_SIZE = 1000
+BENCH_PASSWORD = "bench-password"
+
+def username(index: int) -> str:
+    return f"bench_user_{index}"
+
+def seed(engine, users: int, items_per_user: int) -> list[dict]:
+    """Insert users with personal orgs and their items; returns [{"username", "item_ids"}]."""
+    from app.core import security
+    from app.models.item import Item
+    from app.models.organization import Organization
+    from app.models.user import User
+
+    # One bcrypt hash for everyone keeps seeding fast; logins still pay the full verify cost.
+    hashed = security.hash_password(BENCH_PASSWORD)
+    seeded = []
+    with engine.begin() as conn:
+        for index in range(users):
+            name = username(index)
+            org_id = conn.execute(insert(Organization).values(name=name).returning(Organization.id)).scalar_one()
+            user_id = conn.execute(
+                insert(User).values(
+                    username=name, email=f"{name}@example.com", hashed_password=hashed, is_active=True, org_id=org_id
+                ).returning(User.id)
+            ).scalar_one()
+            rows = [
+                {"title": f"Item {n} of {name}", "description": f"Benchmark item {n}", "owner_id": user_id, "org_id": org_id}
+                for n in range(items_per_user)
+            ]
+            item_ids = []
+            for start in range(0, len(rows), SEED_CHUNK_SIZE):
+                item_ids.extend(conn.scalars(
+                    insert(Item).returning(Item.id, sort_by_parameter_order=True),
+                    rows[start:start + SEED_CHUNK_SIZE]
+                ))
+            seeded.append({"username": name, "item_ids": item_ids})
+    return seeded
+
+def summarize(latencies: list[float], errors: int, wall_seconds: float, error_statuses: dict | None = None) -> dict:
+    """Latencies are successful (2xx) requests only; failures are counted, not timed."""
+    ms = sorted(latency * 1000 for latency in latencies)
+    if len(ms) > 1:
+        cuts = statistics.quantiles(ms, n=100, method="inclusive")
+        p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+    else:
+        p50 = p95 = p99 = ms[0] if ms else 0.0
+    return {
+        "requests": len(ms),
+        "errors": errors,
+        "rps": round(len(ms) / wall_seconds, 2) if wall_seconds else 0.0,
+        "mean_ms": round(statistics.fmean(ms), 3) if ms else 0.0,
+        "p50_ms": round(p50, 3),
+        "p95_ms": round(p95, 3),
+        "p99_ms": round(p99, 3),
+        "error_statuses": dict(error_statuses or {}),
+    }
+
+async def drive(client: httpx.AsyncClient, make_request, total: int, concurrency: int) -> dict:
+    latencies: list[float] = []
+    error_statuses: Counter = Counter()
+    remaining = total
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            resp = await make_request(client)
+            elapsed = time.perf_counter() - started
+            # A fast 404 or 429 would flatter the percentiles, so failures are kept out of them.
+            if 200 <= resp.status_code < 300:
+                latencies.append(elapsed)
+            else:
+                error_statuses[str(resp.status_code)] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, sum(error_statuses.values()), time.perf_counter() - started, error_statuses)
+
+async def run_benchmark(app, seeded: list[dict], requests: int, concurrency: int, login_requests: int) -> dict:
+    from app.core import rate_limit
+
+    # Every request comes from one client address, so the login limiter would
+    # otherwise turn most /token samples into 429s instead of bcrypt verifies.
+    limiting, rate_limit.RATE_LIMIT_ENABLED = rate_limit.RATE_LIMIT_ENABLED, False
+    try:
+        return await _run_benchmark(app, seeded, requests, concurrency, login_requests)
+    finally:
+        rate_limit.RATE_LIMIT_ENABLED = limiting
+
+async def _run_benchmark(app, seeded: list[dict], requests: int, concurrency: int, login_requests: int) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        tokens = {}
+        for user in seeded:
+            resp = await client.post("/token", data={"username": user["username"], "password": BENCH_PASSWORD})
+            resp.raise_for_status()
+            tokens[user["username"]] = {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+        def pick():
+            user = random.choice(seeded)
+            return user, tokens[user["username"]]
+
+        async def login(client):
+            user = random.choice(seeded)
+            return await client.post("/token", data={"username": user["username"], "password": BENCH_PASSWORD})
+
+        async def list_items(client):
+            _, headers = pick()
+            return await client.get("/items/", headers=headers)
+
+        async def read_item(client):
+            user, headers = pick()
+            item_id = random.choice(user["item_ids"])
+            return await client.get(f"/items/{item_id}", headers=headers)
+
+        results = {"POST /token": await drive(client, login, login_requests, concurrency)}
+        results["GET /items/"] = await drive(client, list_items, requests, concurrency)
+        if all(user["item_ids"] for user in seeded):
+            results["GET /items/{id}"] = await drive(client, read_item, requests, concurrency)
+        return results
+
+# Lower is better for latency, higher for throughput.
+METRICS = {"p50_ms": 1, "p95_ms": 1, "p99_ms": 1, "rps": -1}
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[dict]:
+    """Every metric that moved more than threshold (a fraction) in the wrong direction."""
+    regressions = []
+    for endpoint, result in current["results"].items():
+        before = baseline["results"].get(endpoint)
+        if before is None:
+            continue
+        for metric, direction in METRICS.items():
+            old, new = before.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if change * direction > threshold:
+                regressions.append({"endpoint": endpoint, "metric": metric, "baseline": old, "current": new, "change": round(change, 4)})
+    return regressions
+
+def print_results(report: dict):
+    print(f"{'endpoint':<18}{'req':>7}{'err':>6}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for endpoint, r in report["results"].items():
+        print(f"{endpoint:<18}{r['requests']:>7}{r['errors']:>6}{r['rps']:>10.1f}{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}{r['p99_ms']:>10.2f}")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--items-per-user", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=2000, help="requests per read endpoint")
+    parser.add_argument("--login-requests", type=int, default=100, help="bcrypt makes /token much slower")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--seed", type=int, default=0, help="random seed for request selection")
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--compare", metavar="BASELINE", help="JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed relative regression")
+    return parser.parse_args(argv)
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    random.seed(args.seed)
+
+    from app.core import database, hashing
+    from app.main import app
+
+    database.Base.metadata.drop_all(bind=database.engine)
+    database.Base.metadata.create_all(bind=database.engine)
+    seeded = seed(database.engine, args.users, args.items_per_user)
+    try:
+        results = asyncio.run(run_benchmark(app, seeded, args.requests, args.concurrency, args.login_requests))
+    finally:
+        hashing.shutdown()
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "database": database.engine.dialect.name,
+            "python": platform.python_version(),
+            "users": args.users,
+            "items_per_user": args.items_per_user,
+            "concurrency": args.concurrency,
+        },
+        "results": results,
+    }
+    print_results(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    failed = {endpoint: r["error_statuses"] for endpoint, r in results.items() if r["errors"]}
+    if failed:
+        for endpoint, statuses in failed.items():
+            print(f"ERRORS {endpoint}: {statuses}")
+        return 1
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        for r in regressions:
+            print(f"REGRESSION {r['endpoint']} {r['metric']}: {r['baseline']} -> {r['current']} ({r['change']:+.1%})")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
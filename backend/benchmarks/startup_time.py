@@ -0,0 +1,105 @@
+"""Process cold-start and import-time report.
+
+Each measurement runs in a fresh interpreter so nothing is already imported.
+
+    python -m benchmarks.startup_time --runs 5 --output startup.json
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+# Entry points that every web worker, Celery worker and Alembic run pays for.
+MODULES = ["app.core.config", "app.core.database", "app.main", "app.workers.tasks"]
+
+COLD_START = """
+import asyncio, json, time
+started = time.perf_counter()
+from app.main import create_app
+imported = time.perf_counter()
+app = create_app()
+created = time.perf_counter()
+
+async def serve():
+    import httpx
+    async with app.router.lifespan_context(app):
+        ready = time.perf_counter()
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://startup") as client:
+            await client.get("/")
+        return ready, time.perf_counter()
+
+ready, first_response = asyncio.run(serve())
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "create_app_ms": (created - imported) * 1000,
+    "lifespan_ms": (ready - created) * 1000,
+    "first_response_ms": (first_response - ready) * 1000,
+    "total_ms": (first_response - started) * 1000,
+}))
+"""
+
+_IMPORTTIME = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+def _run(args: list[str], env: dict) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *args], cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True)
+
+def parse_importtime(stderr: str) -> dict[str, dict]:
+    """{module: {"self_ms", "cumulative_ms"}} from `python -X importtime` output."""
+    modules = {}
+    for self_us, cumulative_us, _indent, name in _IMPORTTIME.findall(stderr):
+        modules[name] = {"self_ms": int(self_us) / 1000, "cumulative_ms": int(cumulative_us) / 1000}
+    return modules
+
+def measure_import(module: str, runs: int, env: dict, top: int) -> dict:
+    totals, slowest = [], {}
+    for _ in range(runs):
+        result = _run(["-X", "importtime", "-c", f"import {module}"], env)
+        modules = parse_importtime(result.stderr)
+        totals.append(modules[module]["cumulative_ms"])
+        for name, timing in modules.items():
+            slowest[name] = min(slowest.get(name, float("inf")), timing["cumulative_ms"])
+    # Only top-level packages, so a slow dependency is not listed once per submodule.
+    roots = sorted(((name, ms) for name, ms in slowest.items() if "." not in name), key=lambda entry: -entry[1])
+    return {
+        "median_ms": round(statistics.median(totals), 2),
+        "min_ms": round(min(totals), 2),
+        "slowest_packages": [{"module": name, "cumulative_ms": round(ms, 2)} for name, ms in roots[:top]],
+    }
+
+def measure_cold_start(runs: int, env: dict) -> dict:
+    samples = [json.loads(_run(["-c", COLD_START], env).stdout.strip().splitlines()[-1]) for _ in range(runs)]
+    return {key: round(statistics.median(sample[key] for sample in samples), 2) for key in samples[0]}
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="slowest packages to list per module")
+    parser.add_argument("--output", help="write the JSON report here")
+    args = parser.parse_args(argv)
+
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", "sqlite:///./startup.db")
+    report = {
+        "python": sys.version.split()[0],
+        "imports": {module: measure_import(module, args.runs, env, args.top) for module in MODULES},
+        "cold_start": measure_cold_start(args.runs, env),
+    }
+
+    for module, result in report["imports"].items():
+        slowest = ", ".join(f"{p['module']} {p['cumulative_ms']:.0f}ms" for p in result["slowest_packages"][:5])
+        print(f"import {module:<22} {result['median_ms']:>8.1f} ms   ({slowest})")
+    for key, value in report["cold_start"].items():
+        print(f"cold start {key:<18} {value:>8.1f} ms")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())